@@ -0,0 +1,330 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 21:34:39.176540
+
+지금까지 시작 시 create_all로 만들던 스키마 + 조회 경로 인덱스.
+create_all로 이미 만들어진 DB에도 그대로 적용할 수 있도록
+- 없는 테이블만 생성, 인덱스는 IF NOT EXISTS
+- create_all이 추가하지 못한 character_settings.design_hash 컬럼 추가 후 기존 행의 지문 계산
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 지문 계산 중 한 번에 읽는 행 수
+BACKFILL_BATCH_SIZE = 500
+
+
+def _create_table(name: str, *columns, **kwargs) -> None:
+    # --sql(오프라인)로 스크립트를 뽑을 때는 DB를 볼 수 없으므로 빈 DB 기준
+    if context.is_offline_mode() or not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns, **kwargs)
+
+
+def _has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return column in {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _design_fingerprint(character_design) -> str | None:
+    """app.models.game.design_fingerprint와 같은 계산 (마이그레이션 시점의 정의로 고정)"""
+    if not character_design:
+        return None
+    canonical = json.dumps(character_design, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _backfill_design_hashes() -> None:
+    bind = op.get_bind()
+    settings = sa.table(
+        "character_settings",
+        sa.column("id", sa.UUID()),
+        sa.column("character_design", sa.JSON()),
+        sa.column("design_hash", sa.String(64)),
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(settings.c.id, settings.c.character_design)
+            .where(settings.c.design_hash.is_(None), settings.c.character_design.isnot(None))
+            .order_by(settings.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(settings.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        for setting_id, character_design in rows:
+            design_hash = _design_fingerprint(character_design)
+            if design_hash:
+                bind.execute(
+                    settings.update().where(settings.c.id == setting_id).values(design_hash=design_hash)
+                )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    _create_table('characters',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('personality', sa.Text(), nullable=False),
+    sa.Column('base_affection_min', sa.Integer(), nullable=False),
+    sa.Column('base_affection_max', sa.Integer(), nullable=False),
+    sa.Column('avatar_prompt', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table('image_assets',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.Column('variants', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url')
+    )
+    _create_table('media_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('unreferenced_since', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('sha256'),
+    sa.UniqueConstraint('url')
+    )
+    _create_table('pooled_characters',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('gender', sa.String(length=10), nullable=False),
+    sa.Column('style', sa.String(length=50), nullable=False),
+    sa.Column('art_style', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('character_design', sa.JSON(), nullable=False),
+    sa.Column('expression_urls', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pooled_characters_lookup', 'pooled_characters', ['gender', 'style', 'art_style', 'status', 'created_at'], unique=False, if_not_exists=True)
+    _create_table('special_event_catalog',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('design_hash', sa.String(length=64), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('image_url', sa.Text(), nullable=False),
+    sa.Column('video_url', sa.Text(), nullable=True),
+    sa.Column('is_nsfw', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('design_hash', 'event_type', name='uq_special_event_catalog_design_event')
+    )
+    _create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('google_id', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('mbti', sa.String(length=4), nullable=True),
+    sa.Column('is_premium', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('google_id')
+    )
+    _create_table('ai_generated_content',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('character_id', sa.Integer(), nullable=True),
+    sa.Column('prompt_hash', sa.String(length=64), nullable=False),
+    sa.Column('content_type', sa.String(length=20), nullable=False),
+    sa.Column('content_data', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['character_id'], ['characters.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('prompt_hash')
+    )
+    _create_table('choice_templates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('character_id', sa.Integer(), nullable=False),
+    sa.Column('affection_min', sa.Integer(), nullable=False),
+    sa.Column('affection_max', sa.Integer(), nullable=False),
+    sa.Column('choice_text', sa.Text(), nullable=False),
+    sa.Column('affection_delta', sa.Integer(), nullable=False),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['character_id'], ['characters.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table('game_sessions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('character_id', sa.Integer(), nullable=True),
+    sa.Column('affection', sa.Integer(), nullable=False),
+    sa.Column('current_scene', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('save_slot', sa.Integer(), nullable=False),
+    sa.Column('is_stolen', sa.Boolean(), nullable=False),
+    sa.Column('original_owner_id', sa.UUID(), nullable=True),
+    sa.Column('stolen_from_session_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('affection >= 0 AND affection <= 100', name='affection_range'),
+    sa.ForeignKeyConstraint(['character_id'], ['characters.id'], ),
+    sa.ForeignKeyConstraint(['original_owner_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['stolen_from_session_id'], ['game_sessions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_game_sessions_user_updated', 'game_sessions', ['user_id', 'updated_at'], unique=False, if_not_exists=True)
+    _create_table('user_gallery',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('image_url', sa.Text(), nullable=False),
+    sa.Column('image_type', sa.String(length=20), nullable=False),
+    sa.Column('expression_type', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_gallery_user_id'), 'user_gallery', ['user_id'], unique=False, if_not_exists=True)
+    _create_table('character_settings',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('gender', sa.String(length=10), nullable=False),
+    sa.Column('style', sa.String(length=50), nullable=False),
+    sa.Column('mbti', sa.String(length=4), nullable=False),
+    sa.Column('art_style', sa.String(length=50), nullable=False),
+    sa.Column('character_design', sa.JSON(), nullable=True),
+    sa.Column('design_hash', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['game_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    # create_all로 만들어진 DB에는 없는 컬럼
+    if not _has_column('character_settings', 'design_hash'):
+        op.add_column('character_settings', sa.Column('design_hash', sa.String(length=64), nullable=True))
+        _backfill_design_hashes()
+    op.create_index(op.f('ix_character_settings_design_hash'), 'character_settings', ['design_hash'], unique=False, if_not_exists=True)
+    op.create_index('ix_character_settings_reuse', 'character_settings', ['gender', 'style', 'mbti', 'art_style', 'design_hash'], unique=False, if_not_exists=True)
+    _create_table('minigame_results',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('scene_number', sa.Integer(), nullable=False),
+    sa.Column('result', sa.String(length=10), nullable=False),
+    sa.Column('bonus_affection', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['game_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table('pvp_matches',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('player1_session_id', sa.UUID(), nullable=False),
+    sa.Column('player2_session_id', sa.UUID(), nullable=False),
+    sa.Column('player1_bet', sa.Integer(), nullable=False),
+    sa.Column('player2_bet', sa.Integer(), nullable=False),
+    sa.Column('final_bet', sa.Integer(), nullable=False),
+    sa.Column('winner_user_id', sa.UUID(), nullable=True),
+    sa.Column('loser_character_stolen', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player1_session_id'], ['game_sessions.id'], ),
+    sa.ForeignKeyConstraint(['player2_session_id'], ['game_sessions.id'], ),
+    sa.ForeignKeyConstraint(['winner_user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_table('scenes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('scene_number', sa.Integer(), nullable=False),
+    sa.Column('image_url', sa.Text(), nullable=True),
+    sa.Column('dialogue_text', sa.Text(), nullable=True),
+    sa.Column('choices_offered', sa.JSON(), nullable=True),
+    sa.Column('selected_choice_index', sa.Integer(), nullable=True),
+    sa.Column('affection_delta', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['game_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scenes_session_scene', 'scenes', ['session_id', 'scene_number'], unique=False, if_not_exists=True)
+    _create_table('special_event_images',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('image_url', sa.Text(), nullable=False),
+    sa.Column('video_url', sa.Text(), nullable=True),
+    sa.Column('is_nsfw', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['game_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_special_event_images_session_event', 'special_event_images', ['session_id', 'event_type'], unique=False, if_not_exists=True)
+    _create_table('character_expressions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('setting_id', sa.UUID(), nullable=False),
+    sa.Column('expression_type', sa.String(length=20), nullable=False),
+    sa.Column('image_url', sa.Text(), nullable=False),
+    sa.Column('video_url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['setting_id'], ['character_settings.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_character_expressions_setting_type', 'character_expressions', ['setting_id', 'expression_type'], unique=False, if_not_exists=True)
+    _create_table('video_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('expression_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('prompt', sa.Text(), nullable=False),
+    sa.Column('model_name', sa.String(length=50), nullable=True),
+    sa.Column('operation_name', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_poll_at', sa.DateTime(), nullable=False),
+    sa.Column('video_url', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['expression_id'], ['character_expressions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_video_jobs_status_next_poll', 'video_jobs', ['status', 'next_poll_at'], unique=False, if_not_exists=True)
+    # create_all 시절 단일 컬럼 인덱스 (위 복합 인덱스의 선두 컬럼이라 중복)
+    op.drop_index('ix_game_sessions_user_id', table_name='game_sessions', if_exists=True)
+    op.drop_index('ix_character_expressions_setting_id', table_name='character_expressions', if_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_video_jobs_status_next_poll', table_name='video_jobs')
+    op.drop_table('video_jobs')
+    op.drop_index('ix_character_expressions_setting_type', table_name='character_expressions')
+    op.drop_table('character_expressions')
+    op.drop_index('ix_special_event_images_session_event', table_name='special_event_images')
+    op.drop_table('special_event_images')
+    op.drop_index('ix_scenes_session_scene', table_name='scenes')
+    op.drop_table('scenes')
+    op.drop_table('pvp_matches')
+    op.drop_table('minigame_results')
+    op.drop_index('ix_character_settings_reuse', table_name='character_settings')
+    op.drop_index(op.f('ix_character_settings_design_hash'), table_name='character_settings')
+    op.drop_table('character_settings')
+    op.drop_index(op.f('ix_user_gallery_user_id'), table_name='user_gallery')
+    op.drop_table('user_gallery')
+    op.drop_index('ix_game_sessions_user_updated', table_name='game_sessions')
+    op.drop_table('game_sessions')
+    op.drop_table('choice_templates')
+    op.drop_table('ai_generated_content')
+    op.drop_table('users')
+    op.drop_table('special_event_catalog')
+    op.drop_index('ix_pooled_characters_lookup', table_name='pooled_characters')
+    op.drop_table('pooled_characters')
+    op.drop_table('media_blobs')
+    op.drop_table('image_assets')
+    op.drop_table('characters')
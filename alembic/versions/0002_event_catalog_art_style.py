@@ -0,0 +1,80 @@
+"""special_event_catalog per art style
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 23:12:05.418220
+
+디자인 지문(design_hash)에는 화풍이 없어서 같은 디자인의 다른 화풍 캐릭터가 카탈로그 이미지를 공유하던 문제
+- art_style 컬럼 추가, 유일 제약을 (design_hash, art_style, event_type)으로
+- 기존 항목의 화풍은 그 이미지를 처음 기록한 세션의 캐릭터 설정에서 가져옴
+- 화풍을 알 수 없는 항목(원래 세션이 삭제됨)은 삭제하고 이미지 참조 해제 (다음 이벤트에서 다시 생성/등록됨)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _delete_releasing_images(condition: str) -> None:
+    # 카탈로그 항목이 잡고 있던 이미지 참조도 같이 해제 (BlobStore.release와 같은 규칙)
+    op.execute(f"""
+        WITH removed AS (
+            DELETE FROM special_event_catalog WHERE {condition} RETURNING image_url
+        ), counts AS (
+            SELECT image_url, count(*) AS n FROM removed GROUP BY image_url
+        )
+        UPDATE media_blobs
+        SET ref_count = greatest(media_blobs.ref_count - counts.n, 0),
+            unreferenced_since = CASE
+                WHEN media_blobs.ref_count - counts.n <= 0 THEN now()
+                ELSE media_blobs.unreferenced_since
+            END
+        FROM counts
+        WHERE media_blobs.url = counts.image_url
+    """)
+
+
+def upgrade() -> None:
+    op.add_column('special_event_catalog', sa.Column('art_style', sa.String(length=50), nullable=True))
+    op.execute("""
+        UPDATE special_event_catalog
+        SET art_style = origin.art_style
+        FROM (
+            SELECT DISTINCT ON (special_event_images.image_url)
+                special_event_images.image_url,
+                character_settings.design_hash,
+                coalesce(character_settings.art_style, 'anime') AS art_style
+            FROM special_event_images
+            JOIN character_settings ON character_settings.session_id = special_event_images.session_id
+            ORDER BY special_event_images.image_url, special_event_images.created_at
+        ) AS origin
+        WHERE origin.image_url = special_event_catalog.image_url
+          AND origin.design_hash = special_event_catalog.design_hash
+    """)
+    _delete_releasing_images("art_style IS NULL")
+    op.alter_column('special_event_catalog', 'art_style', nullable=False)
+    op.drop_constraint('uq_special_event_catalog_design_event', 'special_event_catalog', type_='unique')
+    op.create_unique_constraint(
+        'uq_special_event_catalog_design_event', 'special_event_catalog', ['design_hash', 'art_style', 'event_type']
+    )
+
+
+def downgrade() -> None:
+    # 화풍별로 나뉜 항목 중 (디자인, 이벤트)마다 가장 먼저 만들어진 것만 남김
+    _delete_releasing_images("""id NOT IN (
+        SELECT DISTINCT ON (design_hash, event_type) id
+        FROM special_event_catalog
+        ORDER BY design_hash, event_type, created_at
+    )""")
+    op.drop_constraint('uq_special_event_catalog_design_event', 'special_event_catalog', type_='unique')
+    op.create_unique_constraint(
+        'uq_special_event_catalog_design_event', 'special_event_catalog', ['design_hash', 'event_type']
+    )
+    op.drop_column('special_event_catalog', 'art_style')
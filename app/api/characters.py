@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import Character
 from app.schemas.character import CharacterResponse
 
@@ -10,7 +10,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=list[CharacterResponse])
-async def get_characters(db: AsyncSession = Depends(get_db)):
+async def get_characters(db: AsyncSession = Depends(get_read_db)):
     """캐릭터 목록 조회"""
     result = await db.execute(select(Character))
     characters = result.scalars().all()
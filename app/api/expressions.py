@@ -1,24 +1,38 @@
 """
 Character Expressions API
 TASK-007: 표정 이미지 7종 사전 생성
-Note: 비디오 생성은 API 부하로 인해 비활성화됨
+비디오 생성: 백그라운드 작업(VideoJob)으로 등록하고 job id를 바로 반환
 캐릭터 재사용: 같은 설정(gender, style, mbti, art_style)의 기존 캐릭터가 있으면 재사용
+캐릭터 풀: 재사용할 캐릭터가 없으면 미리 생성해 둔 캐릭터를 꺼내 씀 (없을 때만 새로 생성)
 """
 
 import logging
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
-
-from app.core.database import get_db
-from app.models.game import GameSession, CharacterSetting, CharacterExpression
-from app.schemas.character import CharacterExpressionResponse, ExpressionsGeneratedResponse
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import aliased, selectinload
+
+from app.core.database import get_db, get_read_db
+from app.models.game import GameSession, CharacterSetting, CharacterExpression, VideoJob
+from app.schemas.character import (
+    CharacterExpressionResponse,
+    ExpressionsGeneratedResponse,
+    VideoJobResponse,
+    VideoJobsResponse,
+)
+from app.services.blob_store import blob_store
+from app.services.character_pool import character_pool
+from app.services.expression_urls import expression_urls
 from app.services.gemini_service import (
+    build_video_prompt,
     generate_character_image,
+    generate_character_images,
     get_character_design,
 )
+from app.services.image_pipeline import get_image_variants
+from app.services.storage import storage
+from app.services.video_job_service import ACTIVE_STATUSES, create_video_jobs, video_job_poller
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,6 +41,26 @@ logger = logging.getLogger(__name__)
 EXPRESSION_TYPES = ["neutral", "happy", "sad", "jealous", "shy", "excited", "disgusted"]
 
 
+async def _expressions_response(
+    db: AsyncSession,
+    expressions: list[CharacterExpression],
+) -> ExpressionsGeneratedResponse:
+    """표정 목록 응답 (이미지마다 WebP/AVIF 크기 변형 URL 포함)"""
+    variants = await get_image_variants(db, [expr.image_url for expr in expressions])
+    return ExpressionsGeneratedResponse(
+        expressions=[
+            CharacterExpressionResponse(
+                id=expr.id,
+                expression_type=expr.expression_type,
+                image_url=storage.sign_url(expr.image_url),
+                video_url=storage.sign_url(expr.video_url),
+                image_variants=storage.sign_variants(variants.get(expr.image_url)),
+            )
+            for expr in expressions
+        ]
+    )
+
+
 async def find_reusable_character(
     db: AsyncSession,
     user_id: UUID,
@@ -38,59 +72,46 @@ async def find_reusable_character(
     """
     같은 설정(gender, style, mbti, art_style)의 기존 캐릭터를 찾아 재사용.
     단, 현재 사용자가 이미 사용한 캐릭터(playing/ended 포함, stolen 제외)는 제외.
+
+    한 번의 쿼리로 조회 (캐릭터 수가 늘어도 인덱스 조회 비용만 듦):
+    - 표정 7종이 모두 있는 설정만 (GROUP BY + HAVING count)
+    - 사용자가 쓴 디자인은 NOT EXISTS로 제외 (design_hash 비교)
     """
-    # 1. 현재 사용자가 사용한 캐릭터의 character_design 목록 조회
-    # (뺏긴 캐릭터 is_stolen=True는 제외 - 원래 주인의 세션)
-    user_sessions_result = await db.execute(
-        select(GameSession)
-        .options(selectinload(GameSession.character_setting))
+    # 현재 사용자가 같은 디자인을 쓴 적이 있는지
+    # (뺏어온 캐릭터 is_stolen=True도 사용자의 세션이므로 포함,
+    #  원래 주인에게서 뺏긴 것은 character_stolen 로직에서 처리됨)
+    used_setting = aliased(CharacterSetting)
+    used_by_user = (
+        select(used_setting.id)
+        .join(GameSession, used_setting.session_id == GameSession.id)
         .where(
             GameSession.user_id == user_id,
-            # 뺏긴 캐릭터는 제외 (is_stolen이 True인 경우는 뺏어온 캐릭터이므로 포함해야 함)
-            # 원래 주인에게서 뺏긴 것은 character_stolen 로직에서 처리됨
+            used_setting.design_hash == CharacterSetting.design_hash,
         )
     )
-    user_sessions = user_sessions_result.scalars().all()
-
-    # 사용자가 사용한 character_design 목록 (JSON 비교를 위해 문자열로 변환)
-    used_designs = set()
-    for session in user_sessions:
-        if session.character_setting and session.character_setting.character_design:
-            # JSON을 정렬된 문자열로 변환하여 비교
-            import json
-            design_str = json.dumps(session.character_setting.character_design, sort_keys=True)
-            used_designs.add(design_str)
-
-    logger.info(f"[CharacterReuse] User {user_id} has used {len(used_designs)} character designs")
 
-    # 2. 같은 설정의 기존 캐릭터 조회 (표정이 있는 것만)
-    existing_chars_result = await db.execute(
+    result = await db.execute(
         select(CharacterSetting)
-        .options(selectinload(CharacterSetting.expressions))
+        .join(CharacterExpression, CharacterExpression.setting_id == CharacterSetting.id)
         .where(
             CharacterSetting.gender == gender,
             CharacterSetting.style == style,
             CharacterSetting.mbti == mbti,
             CharacterSetting.art_style == art_style,
-            CharacterSetting.character_design.isnot(None),
+            CharacterSetting.design_hash.isnot(None),
+            ~used_by_user.exists(),
         )
+        .group_by(CharacterSetting.id)
+        .having(func.count(distinct(CharacterExpression.expression_type)) >= len(EXPRESSION_TYPES))
+        # 어느 캐릭터든 상관없으므로 정렬하지 않음 (첫 번째로 찾은 행에서 멈춤)
+        .limit(1)
+        .options(selectinload(CharacterSetting.expressions))
     )
-    existing_chars = existing_chars_result.scalars().all()
-
-    logger.info(f"[CharacterReuse] Found {len(existing_chars)} existing characters with same settings")
-
-    # 3. 사용자가 사용하지 않은 캐릭터 찾기
-    import json
-    for char in existing_chars:
-        # 표정이 있어야 재사용 가능
-        if not char.expressions or len(char.expressions) < len(EXPRESSION_TYPES):
-            continue
+    char = result.scalars().first()
 
-        if char.character_design:
-            design_str = json.dumps(char.character_design, sort_keys=True)
-            if design_str not in used_designs:
-                logger.info(f"[CharacterReuse] Found reusable character: {char.id}")
-                return char
+    if char:
+        logger.info(f"[CharacterReuse] Found reusable character: {char.id}")
+        return char
 
     logger.info(f"[CharacterReuse] No reusable character found, will generate new one")
     return None
@@ -112,10 +133,11 @@ async def generate_expressions(
     1. Validates that the game session exists
     2. Validates that the session has character settings
     3. 먼저 같은 설정의 기존 캐릭터가 있으면 재사용 (Gemini API 호출 최소화)
-    4. 없으면 새로 생성 (7 expression images)
-    5. Returns the generated expressions
+    4. 없으면 미리 생성해 둔 캐릭터 풀에서 꺼냄
+    5. 풀도 비었으면 새로 생성 (7 expression images)
+    6. Returns the generated expressions
 
-    Note: Video generation is disabled due to API load constraints.
+    Note: Videos are generated separately via POST /{session_id}/generate-videos.
     """
     # Check if game session exists
     result = await db.execute(
@@ -143,14 +165,17 @@ async def generate_expressions(
 
     # ============ 캐릭터 재사용 체크 ============
     # 같은 설정(gender, style, mbti, art_style)의 기존 캐릭터가 있으면 재사용
-    reusable_char = await find_reusable_character(
-        db=db,
-        user_id=session.user_id,
-        gender=character_setting.gender,
-        style=character_setting.style,
-        mbti=character_setting.mbti,
-        art_style=character_setting.art_style or "anime",
-    )
+    # 디자인이 이미 있으면 이전 요청이 생성하다 끊긴 것 - 다른 캐릭터를 섞지 않고 아래에서 이어서 생성
+    reusable_char = None
+    if not character_setting.character_design:
+        reusable_char = await find_reusable_character(
+            db=db,
+            user_id=session.user_id,
+            gender=character_setting.gender,
+            style=character_setting.style,
+            mbti=character_setting.mbti,
+            art_style=character_setting.art_style or "anime",
+        )
 
     if reusable_char:
         logger.info(f"[CharacterReuse] Reusing character {reusable_char.id} for session {session_id}")
@@ -169,23 +194,47 @@ async def generate_expressions(
             db.add(new_expr)
             expressions.append(new_expr)
 
+        # 같은 파일을 가리키는 행이 늘었으므로 참조 수 증가
+        await blob_store.acquire(db, [expr.image_url for expr in expressions])
         await db.commit()
+        await expression_urls.invalidate(character_setting.id)
 
         # Refresh to get IDs
         for expr in expressions:
             await db.refresh(expr)
 
-        return ExpressionsGeneratedResponse(
-            expressions=[
-                CharacterExpressionResponse(
-                    id=expr.id,
-                    expression_type=expr.expression_type,
-                    image_url=expr.image_url,
-                    video_url=expr.video_url,
-                )
-                for expr in expressions
-            ]
+        return await _expressions_response(db, expressions)
+
+    # ============ 캐릭터 풀 ============
+    # 디자인이 아직 없을 때만 (디자인이 있으면 이전 요청이 생성하다 끊긴 것 - 이어서 생성)
+    if not character_setting.character_design:
+        pooled = await character_pool.claim(
+            db,
+            gender=character_setting.gender,
+            style=character_setting.style,
+            art_style=character_setting.art_style or "anime",
         )
+        if pooled:
+            character_design, pooled_urls = pooled
+            character_setting.character_design = character_design
+            for expression_type in EXPRESSION_TYPES:
+                expression = CharacterExpression(
+                    setting_id=character_setting.id,
+                    expression_type=expression_type,
+                    image_url=pooled_urls[expression_type],
+                    video_url=None,
+                )
+                db.add(expression)
+                expressions.append(expression)
+
+            # 풀이 잡고 있던 이미지 참조를 새 표정 행이 그대로 넘겨받음 (참조 수 변화 없음)
+            await db.commit()
+            await expression_urls.invalidate(character_setting.id)
+            for expr in expressions:
+                await db.refresh(expr)
+
+            logger.info(f"[CharacterPool] Session {session_id} got a pooled character")
+            return await _expressions_response(db, expressions)
 
     # ============ 새 캐릭터 생성 ============
     logger.info(f"[CharacterReuse] Generating new character for session {session_id}")
@@ -202,44 +251,43 @@ async def generate_expressions(
         # 생성된 디자인을 CharacterSetting에 저장
         character_setting.character_design = character_design
 
-    # Generate expression images using Gemini API (동일 캐릭터 디자인 사용)
-    # 비디오 생성은 API 부하로 인해 비활성화
-    for expression_type in EXPRESSION_TYPES:
-        # 이미지 생성 (Imagen 4.0)
-        image_url = await generate_character_image(
-            gender=character_setting.gender,
-            style=character_setting.style,
-            art_style=character_setting.art_style or "anime",
-            expression=expression_type,
-            character_design=character_design,
-        )
+    # 디자인을 먼저 저장 (표정이 하나씩 저장되므로 디자인과 어긋나지 않도록)
+    await db.commit()
 
+    # 이미 저장된 표정은 건너뜀 (이전 요청이 중간에 끊긴 경우 나머지만 생성)
+    existing_result = await db.execute(
+        select(CharacterExpression)
+        .where(CharacterExpression.setting_id == character_setting.id)
+    )
+    expressions = list(existing_result.scalars().all())
+    saved_types = {expr.expression_type for expr in expressions}
+    pending_types = [t for t in EXPRESSION_TYPES if t not in saved_types]
+
+    # Generate expression images using Gemini API (동일 캐릭터 디자인 사용)
+    # 동시에 여러 표정을 생성하고, 끝나는 대로 하나씩 저장 (부분 실패 시에도 완료된 이미지 보존)
+    async for expression_type, image_url in generate_character_images(
+        gender=character_setting.gender,
+        style=character_setting.style,
+        art_style=character_setting.art_style or "anime",
+        expressions=pending_types,
+        character_design=character_design,
+        generate_image=generate_character_image,
+    ):
         expression = CharacterExpression(
             setting_id=character_setting.id,
             expression_type=expression_type,
             image_url=image_url,
-            video_url=None,  # 비디오 비활성화
+            video_url=None,  # 비디오는 generate-videos 작업으로 생성
         )
         db.add(expression)
+        await blob_store.acquire(db, [image_url])
+        await db.commit()
+        await expression_urls.invalidate(character_setting.id)
         expressions.append(expression)
 
-    await db.commit()
-
-    # Refresh to get IDs
-    for expr in expressions:
-        await db.refresh(expr)
+    expressions.sort(key=lambda expr: EXPRESSION_TYPES.index(expr.expression_type))
 
-    return ExpressionsGeneratedResponse(
-        expressions=[
-            CharacterExpressionResponse(
-                id=expr.id,
-                expression_type=expr.expression_type,
-                image_url=expr.image_url,
-                video_url=expr.video_url,
-            )
-            for expr in expressions
-        ]
-    )
+    return await _expressions_response(db, expressions)
 
 
 @router.get(
@@ -248,7 +296,7 @@ async def generate_expressions(
 )
 async def get_expressions(
     session_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get all expression images and videos for a game session's character.
@@ -281,14 +329,141 @@ async def get_expressions(
     )
     expressions = result.scalars().all()
 
-    return ExpressionsGeneratedResponse(
-        expressions=[
-            CharacterExpressionResponse(
-                id=expr.id,
-                expression_type=expr.expression_type,
-                image_url=expr.image_url,
-                video_url=expr.video_url,
-            )
-            for expr in expressions
+    return await _expressions_response(db, expressions)
+
+
+async def _get_session_with_setting(db: AsyncSession, session_id: UUID) -> GameSession:
+    """게임 세션 + 캐릭터 설정 조회 (없으면 404/400)"""
+    result = await db.execute(
+        select(GameSession)
+        .options(selectinload(GameSession.character_setting))
+        .where(GameSession.id == session_id)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Game session not found"
+        )
+
+    if not session.character_setting:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Character settings not found for this session"
+        )
+
+    return session
+
+
+def _video_job_response(job: VideoJob, expression_type: str) -> VideoJobResponse:
+    return VideoJobResponse(
+        id=job.id,
+        expression_type=expression_type,
+        status=job.status,
+        video_url=storage.sign_url(job.video_url),
+        error=job.error,
+    )
+
+
+@router.post(
+    "/{session_id}/generate-videos",
+    response_model=VideoJobsResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_videos(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue Veo video generation for the character's expressions.
+
+    Returns job ids immediately; the background poller fills in
+    CharacterExpression.video_url when each video finishes.
+    Expressions that already have a video or an active job are skipped.
+    """
+    session = await _get_session_with_setting(db, session_id)
+    character_setting = session.character_setting
+
+    expr_result = await db.execute(
+        select(CharacterExpression)
+        .where(CharacterExpression.setting_id == character_setting.id)
+    )
+    expressions = expr_result.scalars().all()
+
+    if not expressions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expressions must be generated before videos"
+        )
+
+    # 이미 진행 중인 작업이 있는 표정은 제외
+    active_result = await db.execute(
+        select(VideoJob.expression_id).where(
+            VideoJob.expression_id.in_([expr.id for expr in expressions]),
+            VideoJob.status.in_(ACTIVE_STATUSES),
+        )
+    )
+    active_expression_ids = {row[0] for row in active_result.fetchall()}
+
+    pending = [
+        expr for expr in expressions
+        if not expr.video_url and expr.id not in active_expression_ids
+    ]
+
+    prompts = {
+        expr.expression_type: build_video_prompt(
+            gender=character_setting.gender,
+            style=character_setting.style,
+            art_style=character_setting.art_style or "anime",
+            expression=expr.expression_type,
+            character_design=character_setting.character_design,
+        )
+        for expr in pending
+    }
+    jobs = await create_video_jobs(db, pending, prompts)
+    await db.commit()
+
+    video_job_poller.notify()
+    logger.info(f"[VideoJob] Queued {len(jobs)} video jobs for session {session_id}")
+
+    return VideoJobsResponse(
+        jobs=[
+            _video_job_response(job, expr.expression_type)
+            for job, expr in zip(jobs, pending)
         ]
     )
+
+
+@router.get(
+    "/{session_id}/video-jobs/{job_id}",
+    response_model=VideoJobResponse,
+)
+async def get_video_job(
+    session_id: UUID,
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the status of a video generation job.
+    """
+    session = await _get_session_with_setting(db, session_id)
+
+    result = await db.execute(
+        select(VideoJob, CharacterExpression.expression_type)
+        .join(CharacterExpression, VideoJob.expression_id == CharacterExpression.id)
+        .where(
+            VideoJob.id == job_id,
+            CharacterExpression.setting_id == session.character_setting.id,
+        )
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video job not found"
+        )
+
+    job, expression_type = row
+    return _video_job_response(job, expression_type)
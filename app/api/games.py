@@ -2,11 +2,12 @@ import random
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
-from app.models import GameSession, Character, ChoiceTemplate, CharacterExpression
+from app.core.database import get_db, get_read_db
+from app.models import GameSession, Character, ChoiceTemplate, Scene
+from app.models.game import SpecialEventImage
 from app.schemas.game import (
     GameSessionCreate,
     GameSessionResponse,
@@ -17,12 +18,18 @@ from app.schemas.game import (
     EndingEventResponse,
 )
 from app.schemas.character import CharacterSettingResponse
+from app.services.blob_store import blob_store
+from app.services.expression_urls import expression_urls
+from app.services.placeholder_service import ending_placeholder, placeholder_url
+from app.services.scene_prefetch import scene_prefetcher
+from app.services.session_state import session_state
+from app.services.storage import storage
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[GameSessionResponse])
-async def get_games(user_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_games(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """사용자의 게임 목록 조회"""
     result = await db.execute(
         select(GameSession)
@@ -108,7 +115,7 @@ async def create_game(
 
 
 @router.get("/{session_id}", response_model=GameSessionWithSettingsResponse)
-async def get_game(session_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_game(session_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """게임 세션 조회 (캐릭터 설정 포함)"""
     result = await db.execute(
         select(GameSession)
@@ -186,6 +193,56 @@ async def get_choices(session_id: UUID, db: AsyncSession = Depends(get_db)):
     ]
 
 
+def _infer_choice_index(choices_offered: list[dict], choice: ChoiceSelect) -> int | None:
+    """choice_index 없이 호출된 경우 delta/expression이 유일하게 일치하는 선택지"""
+    matches = [
+        i for i, c in enumerate(choices_offered)
+        if c.get("delta") == choice.affection_delta
+        and (choice.expression_type is None or c.get("expression", "neutral") == choice.expression_type)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+async def _record_choice(db: AsyncSession, session_id: UUID, scene_number: int, choice: ChoiceSelect) -> int | None:
+    """
+    씬에 선택한 선택지 번호 기록
+
+    Returns:
+        기록한 선택지 번호 또는 None (씬/선택지 없음, 범위 밖, 추정 불가)
+    """
+    if choice.choice_index is not None:
+        # 번호가 있으면 범위 확인까지 UPDATE 한 번으로 (씬 조회 생략)
+        if choice.choice_index < 0:
+            return None
+        result = await db.execute(
+            update(Scene)
+            .where(
+                Scene.session_id == session_id,
+                Scene.scene_number == scene_number,
+                func.json_array_length(Scene.choices_offered) > choice.choice_index,
+            )
+            .values(selected_choice_index=choice.choice_index)
+            .returning(Scene.id)
+            .execution_options(synchronize_session=False)
+        )
+        return choice.choice_index if result.first() else None
+
+    scene_result = await db.execute(
+        select(Scene)
+        .where(Scene.session_id == session_id, Scene.scene_number == scene_number)
+        .order_by(Scene.created_at.desc())
+        .limit(1)
+    )
+    scene = scene_result.scalar_one_or_none()
+    if not scene or not scene.choices_offered:
+        return None
+    choice_index = _infer_choice_index(scene.choices_offered, choice)
+    if choice_index is None:
+        return None
+    scene.selected_choice_index = choice_index
+    return choice_index
+
+
 @router.post("/{session_id}/select", response_model=SelectChoiceResponse)
 async def select_choice(
     session_id: UUID,
@@ -193,51 +250,48 @@ async def select_choice(
     db: AsyncSession = Depends(get_db),
 ):
     """선택지 선택 및 게임 진행 - 감정 이미지 반환"""
-    # 게임 세션 조회 (character_setting 포함)
-    result = await db.execute(
-        select(GameSession)
-        .options(selectinload(GameSession.character_setting))
-        .where(GameSession.id == session_id)
-    )
-    session = result.scalar_one_or_none()
+    # 게임 세션 상태 (Redis hot state)
+    session = await session_state.get(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
-    # 호감도 계산
-    new_affection = max(0, min(100, session.affection + choice.affection_delta))
-    session.affection = new_affection
-    session.current_scene += 1  # 턴 카운트 증가
+    scene_number = session.current_scene
 
-    # 엔딩 체크 (호감도 0 또는 100 도달 시)
-    if new_affection <= 0:
-        session.status = "sad_ending"
-    elif new_affection >= 100:
-        session.status = "happy_ending"
+    # 턴 적용 (UPDATE ... RETURNING 한 번 - 동시에 들어온 같은 턴의 클릭은 하나만 반영)
+    advanced = await session_state.advance_turn(db, session, choice.affection_delta)
+    if advanced is None:
+        await db.rollback()
+        # 복사본이 오래된 것일 수 있으므로 지워서 다음 요청은 DB에서 읽음
+        await session_state.invalidate(session_id)
+        raise HTTPException(status_code=409, detail="Turn already advanced")
+    session = advanced
 
-    await db.commit()
+    # 현재 씬에 선택한 선택지 기록 (다음 씬 대화 맥락 + 미리 생성된 분기 선택)
+    choice_index = await _record_choice(db, session_id, scene_number, choice)
+
+    await session_state.commit(db, session_id, session)
+
+    # 선택되지 않은 분기의 미리 생성 취소 (엔딩이면 모두 취소)
+    await scene_prefetcher.resolve(
+        session_id,
+        scene_number + 1,
+        choice_index if session.status == "playing" else None,
+    )
 
     # 감정 타입 결정 (없으면 neutral)
     expression_type = choice.expression_type or "neutral"
 
-    # 해당 감정의 이미지 조회
+    # 해당 감정의 이미지 (캐시된 표정 URL 맵)
     expression_image_url = None
-    if session.character_setting:
-        expr_result = await db.execute(
-            select(CharacterExpression).where(
-                CharacterExpression.setting_id == session.character_setting.id,
-                CharacterExpression.expression_type == expression_type
-            )
-        )
-        expression = expr_result.scalar_one_or_none()
-        if expression:
-            expression_image_url = expression.image_url
+    if session.setting_id:
+        expression_image_url = await expression_urls.get(db, session.setting_id, expression_type)
 
     return SelectChoiceResponse(
-        new_affection=new_affection,
+        new_affection=session.affection,
         next_scene=session.current_scene,
         status=session.status,
         expression_type=expression_type,
-        expression_image_url=expression_image_url,
+        expression_image_url=storage.sign_url(expression_image_url),
     )
 
 
@@ -276,11 +330,10 @@ async def trigger_ending_event(
 
     # 게임 상태 업데이트
     session.status = ending_type
-    await db.commit()
+    await session_state.commit(db, session_id)
 
     # 엔딩 이미지 생성 (TODO: 실제 Gemini API 연동)
-    mood = "romantic" if is_positive else "melancholic"
-    ending_image_url = f"https://placehold.co/1024x768/{'FF69B4' if is_positive else '808080'}/FFFFFF?text={ending_type.replace('_', '+')}+{mood}"
+    ending_image_url = placeholder_url(ending_placeholder(is_positive))
 
     return EndingEventResponse(
         ending_type=ending_type,
@@ -300,6 +353,15 @@ async def delete_game(session_id: UUID, db: AsyncSession = Depends(get_db)):
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
+    # 세션의 특별 이벤트 이미지 기록 삭제 + 파일 참조 해제 (참조가 없어진 파일은 GC가 정리)
+    # 표정은 캐릭터 설정과 함께 남아 다른 세션의 캐릭터 재사용에 쓰이므로 유지
+    event_result = await db.execute(
+        delete(SpecialEventImage)
+        .where(SpecialEventImage.session_id == session_id)
+        .returning(SpecialEventImage.image_url)
+    )
+    await blob_store.release(db, [row[0] for row in event_result.all()])
+
     await db.delete(session)
-    await db.commit()
+    await session_state.commit(db, session_id)
     return {"success": True}
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from app.core.database import get_db
 from app.models.game import GameSession, MinigameResult
 from app.schemas.minigame import MinigameResultCreate, MinigameResultResponse
+from app.services.session_state import session_state
 
 router = APIRouter()
 
@@ -68,7 +69,7 @@ async def save_minigame_result(
     )
     db.add(minigame_result)
 
-    await db.commit()
+    await session_state.commit(db, session_id)
     await db.refresh(minigame_result)
 
     return MinigameResultResponse(
@@ -1,12 +1,15 @@
+import json
 import random
+from dataclasses import dataclass
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import async_session_maker, get_db
 from app.models import GameSession, Scene
 from app.models.game import CharacterExpression, SpecialEventImage, CharacterSetting
 import logging
@@ -14,11 +17,20 @@ import logging
 logger = logging.getLogger(__name__)
 from app.models.user import User
 from app.schemas.game import SceneResponse, ChoiceResponse
+from app.services.blob_store import blob_store
+from app.services.event_catalog import event_catalog
+from app.services.expression_urls import expression_urls
+from app.services.image_pipeline import blurred_url, get_image_variants
+from app.services.placeholder_service import event_placeholder, placeholder_url
+from app.services.storage import storage
 from app.services.gemini_service import (
     generate_scene_content,
     generate_special_event_image,
     get_character_design,
+    stream_scene_content,
 )
+from app.services.scene_prefetch import scene_prefetcher
+from app.services.session_state import SessionState, session_state
 
 router = APIRouter()
 
@@ -56,22 +68,45 @@ class MinigameResultResponse(BaseModel):
 class SpecialImageResponse(BaseModel):
     image_url: str
     is_blurred: bool
+    is_preblurred: bool = False  # image_url이 서버에서 이미 blur 처리한 저해상도 이미지인지
 
 
-@router.post("/{session_id}/generate", response_model=SceneResponse)
-async def generate_scene(session_id: UUID, db: AsyncSession = Depends(get_db)):
-    """씬 생성 (이미지 + 대화 + 선택지) - MBTI 및 캐릭터 설정 반영"""
-    # 게임 세션 조회 (character_setting, user 포함)
-    result = await db.execute(
-        select(GameSession)
-        .options(
-            selectinload(GameSession.character),
-            selectinload(GameSession.character_setting),
-            selectinload(GameSession.user),
-        )
-        .where(GameSession.id == session_id)
+def _scene_response(session: SessionState, scene_number: int, image_url: str, dialogue: str, choices: list) -> SceneResponse:
+    return SceneResponse(
+        scene_number=scene_number,
+        image_url=storage.sign_url(image_url),
+        dialogue=dialogue,
+        choices=[
+            ChoiceResponse(
+                id=i,
+                text=c["text"],
+                delta=c["delta"],
+                expression=c.get("expression", "neutral"),
+            )
+            for i, c in enumerate(choices or [])
+        ],
+        affection=session.affection,
+        status=session.status,
     )
-    session = result.scalar_one_or_none()
+
+
+@dataclass
+class SceneContext:
+    """씬 생성에 필요한 정보 (existing_scene이 있으면 나머지 맥락은 조회하지 않음)"""
+    session: SessionState
+    existing_scene: Scene | None = None
+    character_setting: CharacterSetting | None = None
+    user_mbti: str | None = None
+    previous_choice: str | None = None
+    previous_choice_index: int | None = None
+    previous_dialogue: str | None = None
+    neutral_image_url: str | None = None
+
+
+async def _load_scene_context(db: AsyncSession, session_id: UUID) -> SceneContext:
+    """씬 생성에 필요한 정보 조회"""
+    # 게임 세션 상태 (Redis hot state)
+    session = await session_state.get(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
@@ -90,27 +125,10 @@ async def generate_scene(session_id: UUID, db: AsyncSession = Depends(get_db)):
     )
     existing_scene = existing_scene_result.scalar_one_or_none()
     if existing_scene:
-        # 이미 존재하면 기존 씬 반환
-        return SceneResponse(
-            scene_number=existing_scene.scene_number,
-            image_url=existing_scene.image_url,
-            dialogue=existing_scene.dialogue_text,
-            choices=[
-                ChoiceResponse(
-                    id=i,
-                    text=c["text"],
-                    delta=c["delta"],
-                    expression=c.get("expression", "neutral"),
-                )
-                for i, c in enumerate(existing_scene.choices_offered or [])
-            ],
-            affection=session.affection,
-            status=session.status,
-        )
+        return SceneContext(session=session, existing_scene=existing_scene)
 
     # 이전 씬 조회 (대화 맥락을 위해) - .first() 사용으로 중복 에러 방지
-    previous_choice = None
-    previous_dialogue = None
+    context = SceneContext(session=session)
     if session.current_scene > 1:
         prev_scene_result = await db.execute(
             select(Scene)
@@ -123,35 +141,84 @@ async def generate_scene(session_id: UUID, db: AsyncSession = Depends(get_db)):
         )
         prev_scene = prev_scene_result.scalar_one_or_none()
         if prev_scene:
-            previous_dialogue = prev_scene.dialogue_text
+            context.previous_dialogue = prev_scene.dialogue_text
             # 선택한 선택지 가져오기
             if prev_scene.selected_choice_index is not None and prev_scene.choices_offered:
                 choices = prev_scene.choices_offered
                 if 0 <= prev_scene.selected_choice_index < len(choices):
-                    previous_choice = choices[prev_scene.selected_choice_index].get("text", "")
-
-    # AI 콘텐츠 생성 (MBTI 및 캐릭터 설정 반영, 이전 대화 맥락 포함)
-    content = await generate_scene_content(
-        character_setting=session.character_setting,
-        user_mbti=session.user.mbti if session.user else None,
-        scene_number=session.current_scene,
-        affection=session.affection,
-        previous_choice=previous_choice,
-        previous_dialogue=previous_dialogue,
+                    context.previous_choice = choices[prev_scene.selected_choice_index].get("text", "")
+                    context.previous_choice_index = prev_scene.selected_choice_index
+
+    # 사용자 MBTI
+    user_result = await db.execute(select(User.mbti).where(User.id == session.user_id))
+    context.user_mbti = user_result.scalar_one_or_none()
+
+    if session.setting_id:
+        # 캐릭터 설정 + 표정 이미지 가져오기 (neutral 기본)
+        context.character_setting = await db.get(CharacterSetting, session.setting_id)
+        context.neutral_image_url = await expression_urls.get(db, session.setting_id, "neutral")
+
+    return context
+
+
+async def _take_prefetched_content(context: SceneContext) -> dict | None:
+    """이전 씬에서 고른 선택지에 대해 미리 생성된 씬 콘텐츠"""
+    if context.previous_choice_index is None:
+        return None
+    return await scene_prefetcher.take(
+        context.session.id,
+        context.session.current_scene,
+        context.previous_choice_index,
+        affection=context.session.affection,
     )
 
-    # 캐릭터 표정 이미지 가져오기 (neutral 기본)
-    image_url = content["image_url"]  # 기본 placeholder
-    if session.character_setting:
-        expr_result = await db.execute(
-            select(CharacterExpression).where(
-                CharacterExpression.setting_id == session.character_setting.id,
-                CharacterExpression.expression_type == "neutral"
-            )
+
+async def _schedule_prefetch(context: SceneContext, content: dict) -> None:
+    """방금 제시한 선택지별 다음 씬 미리 생성 시작"""
+    session = context.session
+    try:
+        await scene_prefetcher.schedule(
+            session_id=session.id,
+            scene_number=session.current_scene,
+            character_setting=context.character_setting,
+            user_mbti=context.user_mbti,
+            affection=session.affection,
+            dialogue=content["dialogue"],
+            choices=content["choices"],
+        )
+    except Exception as e:
+        logger.warning(f"[Prefetch] Failed to schedule: {e}")
+
+
+@router.post("/{session_id}/generate", response_model=SceneResponse)
+async def generate_scene(session_id: UUID, db: AsyncSession = Depends(get_db)):
+    """씬 생성 (이미지 + 대화 + 선택지) - MBTI 및 캐릭터 설정 반영"""
+    context = await _load_scene_context(db, session_id)
+    session = context.session
+    existing_scene = context.existing_scene
+    if existing_scene:
+        # 이미 존재하면 기존 씬 반환
+        return _scene_response(
+            session,
+            existing_scene.scene_number,
+            existing_scene.image_url,
+            existing_scene.dialogue_text,
+            existing_scene.choices_offered,
+        )
+
+    # 선택 전에 미리 생성해 둔 씬이 있으면 바로 사용
+    content = await _take_prefetched_content(context)
+    if content is None:
+        # AI 콘텐츠 생성 (MBTI 및 캐릭터 설정 반영, 이전 대화 맥락 포함)
+        content = await generate_scene_content(
+            character_setting=context.character_setting,
+            user_mbti=context.user_mbti,
+            scene_number=session.current_scene,
+            affection=session.affection,
+            previous_choice=context.previous_choice,
+            previous_dialogue=context.previous_dialogue,
         )
-        neutral_expression = expr_result.scalar_one_or_none()
-        if neutral_expression:
-            image_url = neutral_expression.image_url
+    image_url = context.neutral_image_url or content["image_url"]  # 기본 placeholder
 
     # 씬 저장
     scene = Scene(
@@ -164,22 +231,104 @@ async def generate_scene(session_id: UUID, db: AsyncSession = Depends(get_db)):
     db.add(scene)
     await db.commit()
 
-    return SceneResponse(
-        scene_number=session.current_scene,
-        image_url=image_url,
-        dialogue=content["dialogue"],
-        choices=[
-            ChoiceResponse(
-                id=i,
-                text=c["text"],
-                delta=c["delta"],
-                expression=c.get("expression", "neutral"),
-            )
-            for i, c in enumerate(content["choices"])
-        ],
-        affection=session.affection,
-        status=session.status,
-    )
+    await _schedule_prefetch(context, content)
+
+    return _scene_response(session, session.current_scene, image_url, content["dialogue"], content["choices"])
+
+
+def _sse(event: str, data) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# SSE 응답 헤더 (프록시 버퍼링 비활성화)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+@router.post("/{session_id}/generate/stream")
+async def generate_scene_stream(session_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    씬 생성 스트리밍 (Server-Sent Events)
+
+    이벤트 순서:
+        dialogue: {"text": 대사 조각} - 생성되는 대로 여러 번
+        reset: {} - 생성 실패로 폴백 대사를 다시 보냄 (이미 받은 대사 폐기)
+        choices: {"choices": [...]} - 선택지 3개
+        scene: SceneResponse - 씬 저장 완료 (마지막 이벤트)
+        error: {"detail": 오류 메시지} - 씬 저장/응답 생성 실패 (scene 대신 마지막 이벤트, 다시 요청하면 새로 생성)
+    이미 생성된 씬이면 scene 이벤트 하나만 보냄
+    """
+    context = await _load_scene_context(db, session_id)
+    session = context.session
+    existing_scene = context.existing_scene
+
+    if existing_scene:
+        response = _scene_response(
+            session,
+            existing_scene.scene_number,
+            existing_scene.image_url,
+            existing_scene.dialogue_text,
+            existing_scene.choices_offered,
+        )
+
+        async def replay():
+            yield _sse("scene", response.model_dump())
+
+        return StreamingResponse(replay(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    # 스트리밍이 시작되면 요청 DB 세션은 이미 닫히므로 필요한 값은 미리 꺼내둠
+    scene_number = session.current_scene
+
+    async def event_stream():
+        # 미리 생성된 씬이 있으면 스트리밍 없이 바로 전송
+        content = await _take_prefetched_content(context)
+        if content is not None:
+            yield _sse("dialogue", {"text": content["dialogue"]})
+            yield _sse("choices", {"choices": content["choices"]})
+        else:
+            async for event in stream_scene_content(
+                character_setting=context.character_setting,
+                user_mbti=context.user_mbti,
+                scene_number=scene_number,
+                affection=session.affection,
+                previous_choice=context.previous_choice,
+                previous_dialogue=context.previous_dialogue,
+            ):
+                event_type = event.pop("type")
+                if event_type == "done":
+                    content = event["content"]
+                else:
+                    yield _sse(event_type, event)
+
+        image_url = context.neutral_image_url or content["image_url"]
+
+        # 스트림이 끝난 뒤 씬 저장 (별도 DB 세션)
+        # 응답 헤더는 이미 나갔으므로 실패는 HTTP 상태 대신 error 이벤트로 알림
+        try:
+            async with async_session_maker() as write_db:
+                write_db.add(Scene(
+                    session_id=session_id,
+                    scene_number=scene_number,
+                    image_url=image_url,
+                    dialogue_text=content["dialogue"],
+                    choices_offered=content["choices"],
+                ))
+                await write_db.commit()
+
+            response = _scene_response(session, scene_number, image_url, content["dialogue"], content["choices"])
+        except Exception as e:
+            logger.error(f"[SceneStream] Failed to save scene {scene_number} for session {session_id}: {e}")
+            yield _sse("error", {"detail": "Failed to save scene"})
+            return
+
+        await _schedule_prefetch(context, content)
+
+        yield _sse("scene", response.model_dump())
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @router.post("/{session_id}/check-event", response_model=SpecialEventResponse)
@@ -193,13 +342,8 @@ async def check_special_event(session_id: UUID, db: AsyncSession = Depends(get_d
         event_description: 이벤트 설명
         show_minigame: 미니게임 표시 여부
     """
-    # 게임 세션 조회
-    result = await db.execute(
-        select(GameSession)
-        .options(selectinload(GameSession.character_setting))
-        .where(GameSession.id == session_id)
-    )
-    session = result.scalar_one_or_none()
+    # 게임 세션 상태 (Redis hot state - 이벤트 턴이 아니면 DB 조회 없음)
+    session = await session_state.get(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
@@ -209,7 +353,7 @@ async def check_special_event(session_id: UUID, db: AsyncSession = Depends(get_d
     # 5턴마다 특별 이벤트 발생 (5, 10, 15, 20...)
     if session.current_scene > 0 and session.current_scene % SPECIAL_EVENT_INTERVAL == 0:
         # 캐릭터 설정 가져오기
-        char_setting = session.character_setting
+        char_setting = await db.get(CharacterSetting, session.setting_id) if session.setting_id else None
         if char_setting:
             # 저장된 캐릭터 디자인 사용 (일관성 유지)
             # 저장된 디자인이 없으면 새로 생성하고 저장
@@ -263,92 +407,51 @@ async def check_special_event(session_id: UUID, db: AsyncSession = Depends(get_d
                         is_nsfw=reuse_image.is_nsfw,
                     )
                     db.add(new_event_image)
+                    await blob_store.acquire(db, [reuse_image.image_url])
                     await db.commit()
 
                     return SpecialEventResponse(
                         is_special_event=True,
-                        special_image_url=reuse_image.image_url,
+                        special_image_url=storage.sign_url(reuse_image.image_url),
                         event_description=f"뺏은 캐릭터의 추억... ({reuse_image.event_type})",
                         show_minigame=True,
                     )
                 else:
                     logger.info(f"[SpecialEvent] All original images shown, checking other users")
 
-            # ========== 다른 사용자의 같은 캐릭터 설정에서 이벤트 이미지 재사용 ==========
-            # Gemini API 호출 최소화를 위해 기존 이미지 재사용
-            import json
-            current_design_str = json.dumps(char_setting.character_design, sort_keys=True) if char_setting.character_design else None
-
-            if current_design_str:
-                # 같은 캐릭터 디자인을 가진 다른 세션들의 이벤트 이미지 조회
-                other_sessions_result = await db.execute(
-                    select(CharacterSetting.session_id)
-                    .where(
-                        CharacterSetting.gender == char_setting.gender,
-                        CharacterSetting.style == char_setting.style,
-                        CharacterSetting.mbti == char_setting.mbti,
-                        CharacterSetting.art_style == char_setting.art_style,
-                        CharacterSetting.session_id != session_id,
-                    )
+            # ========== 같은 캐릭터 디자인 + 화풍의 카탈로그 이미지 재사용 ==========
+            # Gemini API 호출 최소화를 위해 기존 이미지 재사용 (design_hash + art_style + 보지 않은 이벤트 인덱스 조회)
+            if char_setting.design_hash:
+                reuse_image = await event_catalog.next_unseen(
+                    db, char_setting.design_hash, char_setting.art_style or "anime", session_id
                 )
-                other_session_ids = [row[0] for row in other_sessions_result.fetchall()]
+                if reuse_image:
+                    logger.info(f"[SpecialEvent] Reusing catalog image: {reuse_image.event_type}")
 
-                logger.info(f"[SpecialEvent] Found {len(other_session_ids)} other sessions with same settings")
+                    # 현재 세션에 이미지 기록 복사
+                    new_event_image = SpecialEventImage(
+                        session_id=session_id,
+                        event_type=reuse_image.event_type,
+                        image_url=reuse_image.image_url,
+                        video_url=reuse_image.video_url,
+                        is_nsfw=reuse_image.is_nsfw,
+                    )
+                    db.add(new_event_image)
+                    await blob_store.acquire(db, [reuse_image.image_url])
+                    await db.commit()
 
-                if other_session_ids:
-                    # 다른 세션들의 이벤트 이미지 조회
-                    reusable_images_result = await db.execute(
-                        select(SpecialEventImage).where(
-                            SpecialEventImage.session_id.in_(other_session_ids)
-                        )
+                    return SpecialEventResponse(
+                        is_special_event=True,
+                        special_image_url=storage.sign_url(reuse_image.image_url),
+                        event_description=f"특별한 순간... ({reuse_image.event_type})",
+                        show_minigame=True,
                     )
-                    reusable_images = reusable_images_result.scalars().all()
-
-                    # 현재 사용자가 보지 않은 이벤트 타입 찾기
-                    unseen_reusable = [
-                        img for img in reusable_images
-                        if img.event_type not in shown_event_types
-                    ]
-
-                    logger.info(f"[SpecialEvent] Found {len(unseen_reusable)} unseen reusable images")
-
-                    if unseen_reusable:
-                        # 재사용할 이미지 선택 (첫 번째 것)
-                        reuse_image = unseen_reusable[0]
-                        logger.info(f"[SpecialEvent] Reusing image from other user: {reuse_image.event_type}")
-
-                        # 현재 세션에 이미지 기록 복사
-                        new_event_image = SpecialEventImage(
-                            session_id=session_id,
-                            event_type=reuse_image.event_type,
-                            image_url=reuse_image.image_url,
-                            video_url=reuse_image.video_url,
-                            is_nsfw=reuse_image.is_nsfw,
-                        )
-                        db.add(new_event_image)
-                        await db.commit()
-
-                        return SpecialEventResponse(
-                            is_special_event=True,
-                            special_image_url=reuse_image.image_url,
-                            event_description=f"특별한 순간... ({reuse_image.event_type})",
-                            show_minigame=True,
-                        )
 
             logger.info(f"[SpecialEvent] No reusable images found, generating new one")
 
             # ========== 새 이미지 생성 (Gemini API) ==========
             # neutral 표정 이미지 가져오기 (캐릭터 참조용)
-            neutral_image_url = None
-            expr_result = await db.execute(
-                select(CharacterExpression).where(
-                    CharacterExpression.setting_id == char_setting.id,
-                    CharacterExpression.expression_type == "neutral"
-                )
-            )
-            neutral_expr = expr_result.scalar_one_or_none()
-            if neutral_expr:
-                neutral_image_url = neutral_expr.image_url
+            neutral_image_url = await expression_urls.get(db, char_setting.id, "neutral")
 
             # 전신 이벤트 씬 이미지 생성 (Gemini API로 동적 생성, 이전 이벤트 제외)
             special_image_url, event_description, event_name = await generate_special_event_image(
@@ -368,16 +471,21 @@ async def check_special_event(session_id: UUID, db: AsyncSession = Depends(get_d
                 is_nsfw=False,
             )
             db.add(new_event_image)
+            await blob_store.acquire(db, [special_image_url])
+            # 같은 디자인의 다른 세션이 재사용할 수 있도록 카탈로그에도 등록
+            await event_catalog.add(
+                db, char_setting.design_hash, char_setting.art_style or "anime", event_name, special_image_url
+            )
             await db.commit()
             logger.info(f"[SpecialEvent] Saved new event: {event_name}")
         else:
             # 캐릭터 설정이 없는 경우 placeholder
-            special_image_url = f"https://placehold.co/1024x768/FF69B4/FFFFFF?text=Special+Event+Scene+{session.current_scene}"
+            special_image_url = placeholder_url(event_placeholder())
             event_description = "특별 이벤트"
 
         return SpecialEventResponse(
             is_special_event=True,
-            special_image_url=special_image_url,
+            special_image_url=storage.sign_url(special_image_url),
             event_description=event_description,
             show_minigame=True,
         )
@@ -395,8 +503,9 @@ async def get_special_image(
     결제 상태에 따라 이미지 blur 처리 여부 결정
 
     Returns:
-        image_url: 이미지 URL
+        image_url: 이미지 URL (비프리미엄은 blur 변형이 있으면 그 URL)
         is_blurred: blur 처리 여부 (프리미엄 사용자는 False)
+        is_preblurred: image_url이 이미 blur 처리된 이미지인지 (클라이언트 blur 불필요)
     """
     # 게임 세션 조회 (user 포함)
     result = await db.execute(
@@ -410,10 +519,16 @@ async def get_special_image(
 
     # 프리미엄 사용자인 경우 blur 없음
     is_premium = session.user.is_premium if session.user else False
+    if is_premium:
+        return SpecialImageResponse(image_url=storage.sign_url(image_url), is_blurred=False)
 
+    # 비프리미엄: 원본 대신 생성 시 만들어 둔 작은 blur 이미지 (없으면 원본 + 클라이언트 blur)
+    variants = await get_image_variants(db, [image_url])
+    preblurred_url = blurred_url(variants.get(image_url))
     return SpecialImageResponse(
-        image_url=image_url,
-        is_blurred=not is_premium
+        image_url=storage.sign_url(preblurred_url or image_url),
+        is_blurred=True,
+        is_preblurred=preblurred_url is not None,
     )
 
 
@@ -434,12 +549,8 @@ async def submit_minigame_result(
         new_affection: 변경 후 호감도
         message: 결과 메시지
     """
-    # 게임 세션 조회
-    result = await db.execute(
-        select(GameSession)
-        .where(GameSession.id == session_id)
-    )
-    session = result.scalar_one_or_none()
+    # 게임 세션 상태 (Redis hot state)
+    session = await session_state.get(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Game session not found")
 
@@ -469,7 +580,7 @@ async def submit_minigame_result(
     # 호감도 적용 (0~100 범위 유지)
     old_affection = session.affection
     new_affection = max(0, min(100, session.affection + affection_change))
-    session.affection = new_affection
+    new_status = session.status
     logger.info(f"[Minigame] Affection change: {old_affection} + {affection_change} = {new_affection} (is_pvp={request.is_pvp})")
 
     # 엔딩 조건 체크
@@ -477,11 +588,12 @@ async def submit_minigame_result(
     ending_type = None
     character_stolen = False
     stolen_character_id = None
+    stolen_setting_id = None
 
     if new_affection <= 0:
         logger.info(f"[Minigame] Triggering SAD ENDING (new_affection={new_affection})")
         # Sad Ending
-        session.status = "sad_ending"
+        new_status = "sad_ending"
         game_ended = True
         ending_type = "sad_ending"
         message = "호감도가 0이 되었습니다... 💔 Sad Ending"
@@ -498,18 +610,12 @@ async def submit_minigame_result(
                 opponent_uuid = None
 
             if opponent_uuid:
-                opponent_result = await db.execute(
-                    select(GameSession).where(GameSession.id == opponent_uuid)
-                )
-                opponent_session = opponent_result.scalar_one_or_none()
+                opponent_session = await session_state.get(db, opponent_uuid)
                 logger.info(f"[CharacterSteal] Opponent session found: {opponent_session is not None}")
 
                 if opponent_session:
                     # 현재 세션(패자)의 캐릭터 설정 조회
-                    char_result = await db.execute(
-                        select(CharacterSetting).where(CharacterSetting.session_id == session_id)
-                    )
-                    original_char = char_result.scalar_one_or_none()
+                    original_char = await db.get(CharacterSetting, session.setting_id) if session.setting_id else None
                     logger.info(f"[CharacterSteal] Original character setting found: {original_char is not None}")
 
                     if original_char:
@@ -556,6 +662,8 @@ async def submit_minigame_result(
                                 video_url=orig_expr.video_url,
                             )
                             db.add(new_expr)
+                        await blob_store.acquire(db, [expr.image_url for expr in original_expressions])
+                        stolen_setting_id = new_char.id
 
                         character_stolen = True
                         stolen_character_id = str(new_session.id)
@@ -569,7 +677,7 @@ async def submit_minigame_result(
     elif new_affection >= 100:
         # Happy Ending
         logger.info(f"[Minigame] Triggering HAPPY ENDING (new_affection={new_affection})")
-        session.status = "happy_ending"
+        new_status = "happy_ending"
         game_ended = True
         ending_type = "happy_ending"
         message = "호감도가 MAX! 💕🎉 Happy Ending!"
@@ -597,8 +705,10 @@ async def submit_minigame_result(
         except Exception as e:
             logger.error(f"[CharacterSteal] Error checking stolen character: {e}")
 
-    await db.commit()
-    await db.refresh(session)
+    session = await session_state.save(db, session, affection=new_affection, status=new_status)
+    await session_state.commit(db, session_id, session)
+    if stolen_setting_id:
+        await expression_urls.invalidate(stolen_setting_id)
 
     logger.info(f"[Minigame] Returning: game_ended={game_ended}, ending_type={ending_type}, new_affection={new_affection}, character_stolen={character_stolen}")
 
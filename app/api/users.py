@@ -5,9 +5,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import User, UserGallery
 from app.schemas.user import UserResponse, MBTIUpdate, VALID_MBTI_TYPES
+from app.services.blob_store import blob_store
+from app.services.image_pipeline import blurred_url, get_image_variants
+from app.services.storage import storage
 
 
 class GalleryImageResponse(BaseModel):
@@ -16,6 +19,7 @@ class GalleryImageResponse(BaseModel):
     image_type: str
     expression_type: str | None = None
     is_blurred: bool
+    is_preblurred: bool = False  # image_url이 서버에서 이미 blur 처리한 저해상도 이미지인지
 
 
 class GalleryResponse(BaseModel):
@@ -29,11 +33,35 @@ class GalleryImageCreate(BaseModel):
 
 router = APIRouter()
 
+# 비프리미엄 사용자에게 blur 처리되는 이미지 타입
+BLURRED_IMAGE_TYPES = ["special", "ending"]
+
+
+def _gallery_image_response(
+    gallery_item: UserGallery,
+    is_premium: bool,
+    variants: dict[str, dict],
+) -> GalleryImageResponse:
+    """
+    프리미엄 사용자는 모든 이미지 blur 없음, 비프리미엄 사용자는 expression만 blur 없음
+    blur 대상은 생성 시 만들어 둔 작은 blur 이미지가 있으면 원본 대신 그 URL을 내려줌
+    """
+    is_blurred = not is_premium and gallery_item.image_type in BLURRED_IMAGE_TYPES
+    preblurred_url = blurred_url(variants.get(gallery_item.image_url)) if is_blurred else None
+    return GalleryImageResponse(
+        id=gallery_item.id,
+        image_url=storage.sign_url(preblurred_url or gallery_item.image_url),
+        image_type=gallery_item.image_type,
+        expression_type=gallery_item.expression_type,
+        is_blurred=is_blurred,
+        is_preblurred=preblurred_url is not None,
+    )
+
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """사용자 정보 조회"""
     result = await db.execute(select(User).where(User.id == user_id))
@@ -74,7 +102,7 @@ async def update_user_mbti(
 @router.get("/{user_id}/gallery", response_model=GalleryResponse)
 async def get_user_gallery(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     사용자 갤러리 조회
@@ -95,24 +123,16 @@ async def get_user_gallery(
             detail="User not found",
         )
 
-    images = []
-    for gallery_item in user.gallery_images:
-        # 프리미엄 사용자는 모든 이미지 blur 없음
-        # 비프리미엄 사용자는 expression만 blur 없음
-        if user.is_premium:
-            is_blurred = False
-        else:
-            is_blurred = gallery_item.image_type in ["special", "ending"]
-
-        images.append(GalleryImageResponse(
-            id=gallery_item.id,
-            image_url=gallery_item.image_url,
-            image_type=gallery_item.image_type,
-            expression_type=gallery_item.expression_type,
-            is_blurred=is_blurred,
-        ))
+    variants = {}
+    if not user.is_premium:
+        variants = await get_image_variants(db, [
+            item.image_url for item in user.gallery_images if item.image_type in BLURRED_IMAGE_TYPES
+        ])
 
-    return GalleryResponse(images=images)
+    return GalleryResponse(images=[
+        _gallery_image_response(gallery_item, user.is_premium, variants)
+        for gallery_item in user.gallery_images
+    ])
 
 
 @router.post("/{user_id}/gallery", response_model=GalleryImageResponse, status_code=status.HTTP_201_CREATED)
@@ -140,19 +160,12 @@ async def save_to_gallery(
         expression_type=image_data.expression_type,
     )
     db.add(gallery_item)
+    # 갤러리는 세션 삭제와 무관하게 보관되므로 파일 참조를 따로 유지
+    await blob_store.acquire(db, [gallery_item.image_url])
     await db.commit()
     await db.refresh(gallery_item)
 
-    # 프리미엄 여부에 따라 blur 결정
-    if user.is_premium:
-        is_blurred = False
-    else:
-        is_blurred = gallery_item.image_type in ["special", "ending"]
-
-    return GalleryImageResponse(
-        id=gallery_item.id,
-        image_url=gallery_item.image_url,
-        image_type=gallery_item.image_type,
-        expression_type=gallery_item.expression_type,
-        is_blurred=is_blurred,
-    )
+    variants = {}
+    if not user.is_premium and gallery_item.image_type in BLURRED_IMAGE_TYPES:
+        variants = await get_image_variants(db, [gallery_item.image_url])
+    return _gallery_image_response(gallery_item, user.is_premium, variants)
@@ -1,9 +1,40 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.engine import make_url
+from starlette.requests import HTTPConnection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.db_pool import InstrumentedQueuePool, instrument
+from app.core.metrics import metrics
+from app.core.recent_writes import committed_keys, recent_writes, request_keys
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+
+def engine_options(url: str) -> dict:
+    """create_async_engine 인자 (풀/드라이버 설정은 설정값에서)"""
+    options = {"echo": settings.DATABASE_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite(테스트/로컬)는 드라이버 기본 풀 사용
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def build_engine(url: str, label: str = "primary") -> AsyncEngine:
+    return instrument(create_async_engine(url, **engine_options(url)), label)
+
+
+engine = build_engine(settings.DATABASE_URL)
 
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -12,13 +43,43 @@ async_session_maker = async_sessionmaker(
 # Alias for WebSocket handlers
 async_session = async_session_maker
 
+# 읽기 전용 복제본 (설정이 없으면 primary와 같은 엔진)
+read_engine = build_engine(settings.DATABASE_REPLICA_URL, "replica") if settings.DATABASE_REPLICA_URL else engine
+
+read_session_maker = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+def has_replica() -> bool:
+    return read_engine is not engine
+
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db():
+async def get_db(connection: HTTPConnection):
     async with async_session_maker() as session:
+        try:
+            yield session
+            # 이 요청이 커밋한 세션/사용자는 잠시 복제본 대신 primary에서 읽도록 기록 (응답 전에 실행됨)
+            if has_replica():
+                await recent_writes.mark(committed_keys(session, connection))
+        finally:
+            await session.close()
+
+
+async def get_read_db(connection: HTTPConnection):
+    """
+    읽기 전용 엔드포인트용 세션 (복제본)
+    요청의 session_id/user_id가 방금 쓰인 것이면 복제 지연을 피해 primary 사용 (read-your-writes)
+    """
+    maker = read_session_maker
+    if has_replica() and await recent_writes.any_recent(request_keys(connection)):
+        maker = async_session_maker
+    metrics.increment("db_read_routing", target="replica" if has_replica() and maker is read_session_maker else "primary")
+    async with maker() as session:
         try:
             yield session
         finally:
@@ -0,0 +1,74 @@
+"""
+DB 커넥션 풀 계측
+- 연결을 꺼낼 때의 대기 시간, 풀 대기 타임아웃, 풀 크기를 넘어 새로 맺은(overflow) 연결을 메트릭 카운터로 집계
+- 현재 꺼내져 있는 연결 수 등 순간 값은 pool_stats()로 조회 (/health/db-pool)
+- 메트릭 라벨 pool로 엔진 구분 (primary 등)
+"""
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """연결 대기/overflow를 메트릭으로 남기는 async 큐 풀"""
+
+    # 메트릭 라벨 (엔진 생성 후 instrument()가 설정)
+    label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.increment("db_pool_timeouts", pool=self.label)
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            metrics.increment("db_pool_wait_seconds", waited, pool=self.label)
+            if waited >= settings.DATABASE_POOL_SLOW_WAIT:
+                metrics.increment("db_pool_slow_waits", pool=self.label)
+        metrics.increment("db_pool_checkouts", pool=self.label)
+        return connection
+
+    def _create_connection(self):
+        # _do_get이 overflow 카운트를 먼저 올린 뒤 호출 -> 0보다 크면 풀 크기를 넘어선 연결
+        if self.overflow() > 0:
+            metrics.increment("db_pool_overflow_connections", pool=self.label)
+        return super()._create_connection()
+
+
+def instrument(engine: AsyncEngine, label: str) -> AsyncEngine:
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.label = label
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """풀 순간 상태 + 누적 대기 통계"""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+
+    label = getattr(pool, "label", "primary")
+    checkouts = metrics.get("db_pool_checkouts", pool=label)
+    wait_seconds = metrics.get("db_pool_wait_seconds", pool=label)
+    return {
+        "pool": label,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "avg_wait_ms": round(wait_seconds / checkouts * 1000, 3) if checkouts else 0.0,
+        "slow_waits": metrics.get("db_pool_slow_waits", pool=label),
+        "timeouts": metrics.get("db_pool_timeouts", pool=label),
+        "overflow_connections": metrics.get("db_pool_overflow_connections", pool=label),
+    }
@@ -0,0 +1,40 @@
+"""
+프로세스 내 메트릭 (카운터)
+/metrics 엔드포인트에서 JSON으로 조회 (워커별 값)
+"""
+
+from collections import defaultdict
+
+
+class Metrics:
+    """이름 + 라벨별 카운터"""
+
+    def __init__(self):
+        self._counters: dict[tuple[str, tuple], float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def ratio(self, numerator: str, denominator: str, **labels: str) -> float:
+        """numerator / denominator (denominator가 0이면 0)"""
+        total = self.get(denominator, **labels)
+        return self.get(numerator, **labels) / total if total else 0.0
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """
+        Returns:
+            {name: [{"labels": {...}, "value": float}, ...]}
+        """
+        result: dict[str, list[dict]] = {}
+        for (name, labels), value in sorted(self._counters.items()):
+            result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def reset(self) -> None:
+        self._counters.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,149 @@
+"""
+Read-your-writes 추적 (읽기 전용 복제본 라우팅용)
+- 쓰기 세션이 커밋한 행에서 게임 세션/사용자 키를 모아 Redis에 짧게 기록 (READ_YOUR_WRITES_SECONDS)
+  예: select_choice가 씬/세션을 갱신하면 session:{id}, user:{user_id}가 기록됨
+  (ORM 객체 변경은 flush에서 모으고, bulk update()로 쓰는 쪽은 record_written()으로 직접 기록)
+- 읽기 요청의 경로/쿼리 파라미터(session_id, user_id)가 최근 기록된 키면 복제본 대신 primary에서 읽음
+  → 방금 쓴 내용을 복제 지연 때문에 못 보는 일이 없음
+- 같은 워커의 기록은 메모리에서 바로 확인, Redis 장애 시에는 primary에서 읽음 (일관성 우선)
+"""
+
+import logging
+import time
+from typing import Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+RECENT_WRITE_KEY_PREFIX = "db:recent_write:"
+
+# session.info 키
+_PENDING_KEYS = "recent_write_pending_keys"
+_WRITTEN_KEYS = "recent_write_keys"
+_PENDING_BULK = "recent_write_pending_bulk"
+_WROTE_BULK = "recent_write_bulk"
+
+# 읽기 라우팅에 쓰는 요청 파라미터 -> 키 종류
+REQUEST_KEY_PARAMS = {"session_id": "session", "user_id": "user"}
+
+
+def _keys_for_instance(instance) -> set[str]:
+    keys = set()
+    table = getattr(instance, "__tablename__", None)
+    if table == "game_sessions":
+        keys.add(f"session:{instance.id}")
+    elif table == "users":
+        keys.add(f"user:{instance.id}")
+    for attr, kind in REQUEST_KEY_PARAMS.items():
+        value = getattr(instance, attr, None)
+        if value is not None:
+            keys.add(f"{kind}:{value}")
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context) -> None:
+    keys = session.info.setdefault(_PENDING_KEYS, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        keys |= _keys_for_instance(instance)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(orm_execute_state) -> None:
+    # update()/delete()/insert() 문장은 flush를 거치지 않으므로 요청 파라미터 키로 대신함
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info[_PENDING_BULK] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_collected(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEYS, None)
+    if pending:
+        session.info.setdefault(_WRITTEN_KEYS, set()).update(pending)
+    if session.info.pop(_PENDING_BULK, False):
+        session.info[_WROTE_BULK] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_collected(session: Session) -> None:
+    session.info.pop(_PENDING_KEYS, None)
+    session.info.pop(_PENDING_BULK, None)
+
+
+def record_written(session, keys: Iterable[str]) -> None:
+    """bulk update()로 쓴 행의 키 (flush를 거치지 않으므로 쓰는 쪽이 기록 - 커밋되면 함께 반영)"""
+    session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+
+def request_keys(connection: HTTPConnection) -> set[str]:
+    """요청의 경로/쿼리 파라미터에서 session_id, user_id 키"""
+    keys = set()
+    for param, kind in REQUEST_KEY_PARAMS.items():
+        value = connection.path_params.get(param) or connection.query_params.get(param)
+        if value:
+            keys.add(f"{kind}:{value}")
+    return keys
+
+
+def committed_keys(session, connection: HTTPConnection | None = None) -> set[str]:
+    """세션이 커밋한 쓰기의 키 (bulk 문장을 실행했으면 요청 파라미터 키 포함)"""
+    keys = set(session.info.get(_WRITTEN_KEYS, ()))
+    if connection is not None and session.info.get(_WROTE_BULK):
+        keys |= request_keys(connection)
+    return keys
+
+
+class RecentWrites:
+    """최근 쓰기 키 기록/조회 (Redis + 워커 로컬)"""
+
+    def __init__(self, redis: Redis, ttl: float | None = None):
+        self.redis = redis
+        self.ttl = settings.READ_YOUR_WRITES_SECONDS if ttl is None else ttl
+        # key -> 만료 시각 (monotonic)
+        self._local: dict[str, float] = {}
+
+    async def mark(self, keys: Iterable[str]) -> None:
+        keys = set(keys)
+        if not keys or self.ttl <= 0:
+            return
+        expires = time.monotonic() + self.ttl
+        for key in keys:
+            self._local[key] = expires
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(f"{RECENT_WRITE_KEY_PREFIX}{key}", 1, px=int(self.ttl * 1000))
+            await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[RecentWrites] Failed to record writes: {e}")
+
+    async def any_recent(self, keys: Iterable[str]) -> bool:
+        """키 중 하나라도 최근에 쓰였는지 (Redis 장애 시 True - primary에서 읽음)"""
+        keys = set(keys)
+        if not keys or self.ttl <= 0:
+            return False
+
+        now = time.monotonic()
+        # 만료된 로컬 기록 정리
+        for key, expires in list(self._local.items()):
+            if expires <= now:
+                del self._local[key]
+        if any(key in self._local for key in keys):
+            return True
+
+        try:
+            return bool(await self.redis.exists(*(f"{RECENT_WRITE_KEY_PREFIX}{key}" for key in keys)))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[RecentWrites] Redis unavailable, reading from primary: {e}")
+            return True
+
+
+recent_writes = RecentWrites(redis_client)
@@ -0,0 +1,19 @@
+"""
+Redis 클라이언트
+워커 간 공유 상태(모델 상태, 캐시 등)에 사용
+"""
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# 연결은 첫 명령 실행 시 생성됨
+redis_client = Redis.from_url(
+    settings.REDIS_URL,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
+
+
+def get_redis() -> Redis:
+    return redis_client
@@ -1,15 +1,28 @@
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api import api_router
 from app.api.pvp_websocket import router as pvp_ws_router
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine
+from app.core.db_pool import pool_stats
+from app.core.metrics import metrics
 from app.models import user, game  # Import models to register them
+from app.services.blob_store import blob_store
+from app.services.character_pool import character_pool
+from app.services.event_catalog import event_catalog
+from app.services.expression_urls import expression_urls
+from app.services.generation_cache import generation_cache
+from app.services.gemini_service import IMAGE_MODELS, TEXT_MODEL, VIDEO_MODELS
+from app.services.image_pipeline import image_pipeline
+from app.services.model_health_service import model_health
+from app.services.placeholder_service import default_placeholders, placeholder_renderer
+from app.services.storage import MediaStaticFiles
+from app.services.video_job_service import video_job_poller
 
 # Static files directory
 STATIC_DIR = Path(__file__).parent.parent / "static"
@@ -18,11 +31,27 @@ STATIC_DIR.mkdir(parents=True, exist_ok=True)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup: 스키마는 alembic 마이그레이션으로 관리 (배포 시 `alembic upgrade head` 먼저 실행)
+    # 카탈로그 도입 전 이벤트 이미지를 디자인별 카탈로그로 옮김 (카탈로그가 비어 있을 때만)
+    await event_catalog.seed_from_history()
+    # 보관 기간이 지난 생성 캐시 정리
+    await generation_cache.evict_expired()
+    # 참조가 없어진 지 오래된 이미지 파일 정리
+    await blob_store.collect_garbage()
+    # 생성 실패 시 쓰는 placeholder 이미지를 미리 그려둠 (요청 경로에서 그리지 않도록)
+    await asyncio.to_thread(placeholder_renderer.prerender, default_placeholders())
+    # Veo 비디오 작업 폴러 시작 (DB에 남아있는 작업도 이어서 처리)
+    video_job_poller.start()
+    # 캐릭터 풀 채우기 (이미지 할당량에 여유가 있을 때만)
+    character_pool.start()
+    # 다른 워커의 표정 URL 무효화 알림 구독
+    expression_urls.start()
     yield
     # Shutdown
+    await expression_urls.stop()
+    await character_pool.stop()
+    await video_job_poller.stop()
+    image_pipeline.shutdown()
     await engine.dispose()
 
 
@@ -53,8 +82,8 @@ app.include_router(api_router, prefix="/api")
 # WebSocket 라우터 등록 (PvP 매칭)
 app.include_router(pvp_ws_router, prefix="/ws/pvp", tags=["PvP WebSocket"])
 
-# Static files (이미지 서빙)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# Static files (이미지 서빙) - 생성 미디어는 immutable 캐시 헤더 (S3 백엔드는 버킷/CDN에서 서빙)
+app.mount("/static", MediaStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 @app.get("/")
@@ -69,3 +98,53 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/models")
+async def model_health_check():
+    """Gemini/Imagen/Veo 모델별 circuit 상태"""
+    return {
+        "models": await model_health.get_states([TEXT_MODEL, *IMAGE_MODELS, *VIDEO_MODELS])
+    }
+
+
+@app.get("/health/generation-cache")
+async def generation_cache_stats():
+    """AI 생성 캐시 콘텐츠 타입별 적중률"""
+    return {"content_types": await generation_cache.get_stats()}
+
+
+@app.get("/health/media")
+async def media_store_stats():
+    """콘텐츠 주소 미디어 저장소 사용량 (blob 수/용량, 참조 수)"""
+    return await blob_store.get_stats()
+
+
+@app.get("/health/character-pool")
+async def character_pool_stats():
+    """미리 생성해 둔 캐릭터 수"""
+    return await character_pool.get_stats()
+
+
+@app.get("/health/expression-urls")
+async def expression_url_stats():
+    """이 워커의 표정 URL 맵 (캐릭터 수, 적중률, 무효화 구독 여부)"""
+    return expression_urls.get_stats()
+
+
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    """DB 커넥션 풀 사용량 (꺼낸 연결 수, 평균 대기 시간, overflow)"""
+    return pool_stats(engine)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """이 워커의 메트릭 (Gemini JSON 파싱 실패율 등)"""
+    return {
+        "counters": metrics.snapshot(),
+        "gemini_json_parse_failure_rate": {
+            kind: round(metrics.ratio("gemini_json_parse_failures", "gemini_json_parse_total", kind=kind), 4)
+            for kind in ("scene", "event")
+        },
+    }
@@ -1,6 +1,6 @@
 from app.models.user import User
 from app.models.character import Character
-from app.models.game import GameSession, Scene, ChoiceTemplate, AIGeneratedContent, CharacterSetting, CharacterExpression, MinigameResult
+from app.models.game import GameSession, Scene, ChoiceTemplate, AIGeneratedContent, CharacterSetting, CharacterExpression, MinigameResult, VideoJob, ImageAsset, MediaBlob, PooledCharacter, SpecialEventImage, SpecialEventCatalog
 from app.models.gallery import UserGallery
 from app.models.pvp import PvPMatch
 
@@ -14,6 +14,12 @@ __all__ = [
     "CharacterSetting",
     "CharacterExpression",
     "MinigameResult",
+    "VideoJob",
+    "ImageAsset",
+    "MediaBlob",
+    "PooledCharacter",
+    "SpecialEventImage",
+    "SpecialEventCatalog",
     "UserGallery",
     "PvPMatch",
 ]
@@ -22,7 +22,7 @@ class UserGallery(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id")
+        UUID(as_uuid=True), ForeignKey("users.id"), index=True
     )
     image_url: Mapped[str] = mapped_column(Text)
     image_type: Mapped[str] = mapped_column(String(20))  # 'expression', 'special', 'ending'
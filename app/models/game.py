@@ -1,6 +1,8 @@
+import hashlib
+import json
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, CheckConstraint, JSON, Boolean
+from sqlalchemy import event, BigInteger, String, Integer, Text, DateTime, ForeignKey, CheckConstraint, Index, JSON, Boolean, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -39,6 +41,7 @@ class GameSession(Base):
 
     __table_args__ = (
         CheckConstraint("affection >= 0 AND affection <= 100", name="affection_range"),
+        Index("ix_game_sessions_user_updated", "user_id", "updated_at"),  # 사용자별 세션 목록 (최근 순)
     )
 
     # Relationships
@@ -69,6 +72,10 @@ class Scene(Base):
     affection_delta: Mapped[int] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_scenes_session_scene", "session_id", "scene_number"),
+    )
+
     # Relationships
     session = relationship("GameSession", back_populates="scenes")
 
@@ -121,13 +128,33 @@ class CharacterSetting(Base):
     mbti: Mapped[str] = mapped_column(String(4))  # 'INTJ', 'ENFP', etc.
     art_style: Mapped[str] = mapped_column(String(50))  # 'anime', 'realistic', 'watercolor'
     character_design: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # 캐릭터 외모 정보 (hair, eyes, outfit, features)
+    design_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )  # character_design 지문 (재사용 조회용, character_design을 쓸 때 자동 계산)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_character_settings_reuse", "gender", "style", "mbti", "art_style", "design_hash"),
+    )
+
     # Relationships
     session = relationship("GameSession", back_populates="character_setting")
     expressions = relationship("CharacterExpression", back_populates="setting")
 
 
+def design_fingerprint(character_design: dict | None) -> str | None:
+    """캐릭터 디자인 지문 (키 순서와 무관한 sha256)"""
+    if not character_design:
+        return None
+    canonical = json.dumps(character_design, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@event.listens_for(CharacterSetting.character_design, "set")
+def _set_design_hash(target: CharacterSetting, value, oldvalue, initiator) -> None:
+    target.design_hash = design_fingerprint(value)
+
+
 class CharacterExpression(Base):
     """Expression images and videos for a character setting (7 types)."""
     __tablename__ = "character_expressions"
@@ -143,10 +170,93 @@ class CharacterExpression(Base):
     video_url: Mapped[str | None] = mapped_column(Text, nullable=True)  # 애니메이션 비디오 URL
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_character_expressions_setting_type", "setting_id", "expression_type"),
+    )
+
     # Relationships
     setting = relationship("CharacterSetting", back_populates="expressions")
 
 
+class PooledCharacter(Base):
+    """Pre-generated character (design + all expression images) waiting to be handed to a new session."""
+    __tablename__ = "pooled_characters"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    gender: Mapped[str] = mapped_column(String(10))
+    style: Mapped[str] = mapped_column(String(50))
+    art_style: Mapped[str] = mapped_column(String(50))
+    status: Mapped[str] = mapped_column(String(20), default="filling")  # 'filling', 'ready'
+    character_design: Mapped[dict] = mapped_column(JSON)
+    expression_urls: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # {expression_type: image_url}
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_pooled_characters_lookup", "gender", "style", "art_style", "status", "created_at"),
+    )
+
+
+class MediaBlob(Base):
+    """Content-addressed media file (named by sha256 of its bytes) with a reference count."""
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    url: Mapped[str] = mapped_column(Text, unique=True)
+    size: Mapped[int] = mapped_column(BigInteger)  # bytes
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)  # 이 URL을 가진 표정/이벤트/갤러리 행 수
+    unreferenced_since: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )  # 참조 수가 0이 된 시각 (GC 유예 기간 기준)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ImageAsset(Base):
+    """WebP/AVIF size variants of a generated image, keyed by the original URL."""
+    __tablename__ = "image_assets"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    url: Mapped[str] = mapped_column(Text, unique=True)  # 원본 PNG URL
+    variants: Mapped[dict] = mapped_column(JSON)  # {"webp": {"256": url, ...}, "avif": {...}}
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class VideoJob(Base):
+    """Veo video generation job for an expression, polled in the background."""
+    __tablename__ = "video_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    expression_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("character_expressions.id")
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), default="queued"
+    )  # 'queued', 'running', 'succeeded', 'failed'
+    prompt: Mapped[str] = mapped_column(Text)
+    model_name: Mapped[str | None] = mapped_column(String(50), nullable=True)  # 현재 시도 중인 Veo 모델
+    operation_name: Mapped[str | None] = mapped_column(Text, nullable=True)  # Veo long-running operation 이름
+    attempts: Mapped[int] = mapped_column(Integer, default=0)  # 폴링 횟수 (백오프 계산용)
+    next_poll_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    video_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        Index("ix_video_jobs_status_next_poll", "status", "next_poll_at"),  # 폴링할 작업 조회
+    )
+
+    # Relationships
+    expression = relationship("CharacterExpression")
+
+
 class MinigameResult(Base):
     """Minigame results for bonus affection."""
     __tablename__ = "minigame_results"
@@ -182,5 +292,29 @@ class SpecialEventImage(Base):
     is_nsfw: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_special_event_images_session_event", "session_id", "event_type"),
+    )
+
     # Relationships
     session = relationship("GameSession", back_populates="special_event_images")
+
+
+class SpecialEventCatalog(Base):
+    """Deduplicated special-event images per character design and art style, reusable by any session with both."""
+    __tablename__ = "special_event_catalog"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    design_hash: Mapped[str] = mapped_column(String(64))  # CharacterSetting.design_hash
+    art_style: Mapped[str] = mapped_column(String(50))  # 디자인 지문에 화풍이 없으므로 따로 구분
+    event_type: Mapped[str] = mapped_column(String(50))
+    image_url: Mapped[str] = mapped_column(Text)
+    video_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    is_nsfw: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("design_hash", "art_style", "event_type", name="uq_special_event_catalog_design_event"),
+    )
@@ -39,6 +39,8 @@ class CharacterExpressionResponse(BaseModel):
     expression_type: str
     image_url: str
     video_url: str | None = None  # 애니메이션 비디오 URL
+    # 크기별 변형 URL, 예: {"webp": {"256": url, "512": url, "1024": url}, "avif": {...}}
+    image_variants: dict[str, dict[str, str]] | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -46,3 +48,17 @@ class CharacterExpressionResponse(BaseModel):
 class ExpressionsGeneratedResponse(BaseModel):
     """Response schema for generated expressions."""
     expressions: list[CharacterExpressionResponse]
+
+
+class VideoJobResponse(BaseModel):
+    """Response schema for a background video generation job."""
+    id: UUID
+    expression_type: str
+    status: str  # 'queued', 'running', 'succeeded', 'failed'
+    video_url: str | None = None
+    error: str | None = None
+
+
+class VideoJobsResponse(BaseModel):
+    """Response schema for video generation jobs of a session."""
+    jobs: list[VideoJobResponse]
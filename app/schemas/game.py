@@ -62,6 +62,7 @@ class SceneResponse(BaseModel):
 class ChoiceSelect(BaseModel):
     affection_delta: int
     expression_type: str | None = None  # 'neutral', 'happy', 'sad', 'jealous', 'shy', 'excited'
+    choice_index: int | None = None  # 선택한 선택지 (ChoiceResponse.id), 없으면 delta/expression으로 추정
 
 
 class ChoiceResult(BaseModel):
@@ -0,0 +1,32 @@
+"""
+Gemini 구조화 출력(response_schema) 스키마
+프롬프트의 "출력 형식 (JSON)"과 같은 구조를 모델에 강제하고, 응답 검증에도 사용
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+# 선택지 감정 타입 (gemini_service.EXPRESSION_TYPES와 동일)
+Expression = Literal["neutral", "happy", "sad", "jealous", "shy", "excited", "disgusted"]
+
+
+class SceneChoice(BaseModel):
+    text: str = Field(description="선택지 텍스트")
+    delta: int = Field(description="호감도 변화량 (-6 ~ +2)")
+    expression: Expression = Field(description="이 선택지를 골랐을 때 캐릭터의 감정")
+
+
+class SceneContent(BaseModel):
+    """generate_scene_content 응답"""
+    dialogue: str = Field(description="캐릭터의 대사 (1-2문장)")
+    choices: list[SceneChoice] = Field(description="선택지 3개")
+
+
+class DynamicEvent(BaseModel):
+    """generate_dynamic_event_scene 응답"""
+    name: str = Field(description="영문 이벤트 이름 (snake_case)")
+    description: str = Field(description="한글 짧은 설명 (10자 이내)")
+    scene: str = Field(description="영문 상세 장면 묘사")
+    mood: str = Field(description="영문 분위기 키워드 (comma separated)")
+    outfit: str = Field(description="영문 의상 상세 묘사")
@@ -0,0 +1,164 @@
+"""
+콘텐츠 주소 기반 미디어 저장소 (media_blobs)
+- 생성 이미지는 바이트의 sha256으로 파일 이름을 정하므로 같은 이미지는 한 번만 저장됨
+- 표정/이벤트/갤러리 행이 image_url을 복사할 때마다 참조 수 증가 (acquire), 행을 지울 때 감소 (release)
+- 참조 수가 0이 된 뒤 유예 기간이 지난 파일만 GC에서 삭제
+  (생성 캐시가 방금 내준 URL이 행으로 저장되기 전에 지워지지 않도록)
+- acquire/release는 호출자의 트랜잭션 안에서 실행 → 행 저장과 참조 수가 같이 커밋됨
+- GC로 지운 파일을 내주던 생성 캐시 항목(DB + Redis)도 같이 삭제 → 죽은 URL이 새 캐릭터에 재사용되지 않음
+- media_blobs에 없는 URL (placeholder, 외부 URL, 이전 uuid 파일)은 무시
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.game import ImageAsset, MediaBlob
+from app.services.generation_cache import GenerationCache, generation_cache
+from app.services.storage import StorageBackend, storage
+
+logger = logging.getLogger(__name__)
+
+
+def _group_by_count(urls: Iterable[Optional[str]]) -> dict[int, list[str]]:
+    """같은 URL이 여러 번 들어오면 그 수만큼 증감 → 증감량별로 묶어 UPDATE 수를 줄임"""
+    groups: dict[int, list[str]] = {}
+    for url, count in Counter(url for url in urls if url).items():
+        groups.setdefault(count, []).append(url)
+    return groups
+
+
+class BlobStore:
+    """media_blobs 참조 수 관리 + GC"""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        backend: StorageBackend = storage,
+        cache: GenerationCache = generation_cache,
+    ):
+        self.session_maker = session_maker
+        self.storage = backend
+        self.cache = cache
+
+    async def register(self, sha256: str, url: str, size: int) -> None:
+        """
+        새로 쓴(또는 이미 있던) 파일 기록
+        이미 있는 blob이면 미참조 시각만 갱신해서 GC 유예 기간을 다시 시작
+        """
+        try:
+            async with self.session_maker() as db:
+                statement = insert(MediaBlob).values(
+                    sha256=sha256, url=url, size=size, ref_count=0, unreferenced_since=datetime.utcnow()
+                )
+                await db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=["sha256"],
+                        set_={"unreferenced_since": statement.excluded.unreferenced_since},
+                        where=MediaBlob.ref_count <= 0,
+                    )
+                )
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[BlobStore] Failed to register {url}: {e}")
+
+    async def acquire(self, db: AsyncSession, urls: Iterable[Optional[str]]) -> None:
+        """URL을 참조하는 행이 생길 때 (호출자가 커밋)"""
+        for count, group in _group_by_count(urls).items():
+            await db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.url.in_(group))
+                .values(ref_count=MediaBlob.ref_count + count, unreferenced_since=None)
+            )
+
+    async def release(self, db: AsyncSession, urls: Iterable[Optional[str]]) -> None:
+        """URL을 참조하던 행을 지울 때 (호출자가 커밋)"""
+        for count, group in _group_by_count(urls).items():
+            await db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.url.in_(group))
+                .values(
+                    ref_count=func.greatest(MediaBlob.ref_count - count, 0),
+                    unreferenced_since=case(
+                        (MediaBlob.ref_count - count <= 0, func.now()),
+                        else_=MediaBlob.unreferenced_since,
+                    ),
+                )
+            )
+
+    async def collect_garbage(self, grace: Optional[timedelta] = None) -> int:
+        """
+        참조 수 0인 상태로 유예 기간이 지난 blob과 그 WebP/AVIF 변형 파일 삭제
+
+        Returns:
+            삭제한 blob 수
+        """
+        grace = grace or timedelta(hours=settings.MEDIA_GC_GRACE_HOURS)
+        cutoff = datetime.utcnow() - grace
+        try:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    delete(MediaBlob)
+                    .where(MediaBlob.ref_count <= 0, MediaBlob.unreferenced_since < cutoff)
+                    .returning(MediaBlob.url)
+                )
+                urls = [row[0] for row in result.all()]
+                variants = {}
+                cached = []
+                if urls:
+                    assets = await db.execute(
+                        delete(ImageAsset)
+                        .where(ImageAsset.url.in_(urls))
+                        .returning(ImageAsset.url, ImageAsset.variants)
+                    )
+                    variants = dict(assets.all())
+                    cached = await self.cache.forget_urls(db, urls)
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[BlobStore] Garbage collection failed: {e}")
+            return 0
+        await self.cache.forget_redis(cached)
+
+        files = []
+        for url in urls:
+            files.append(url)
+            for by_size in (variants.get(url) or {}).values():
+                files.extend(by_size.values())
+        keys = [key for key in map(self.storage.key_for_url, files) if key is not None]
+        try:
+            await self.storage.delete(keys)
+        except OSError as e:
+            # DB 기록은 이미 지워짐 - 남은 파일은 같은 이미지가 다시 생성되면 그대로 재사용됨
+            logger.warning(f"[BlobStore] Failed to delete {len(keys)} files: {e}")
+
+        if urls:
+            logger.info(f"[BlobStore] Collected {len(urls)} unreferenced blobs")
+        return len(urls)
+
+    async def get_stats(self) -> dict:
+        """저장된 blob 수/용량과 참조 수 합계 (중복 제거 효과 확인용)"""
+        try:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    select(
+                        func.count(MediaBlob.sha256),
+                        func.coalesce(func.sum(MediaBlob.size), 0),
+                        func.coalesce(func.sum(MediaBlob.ref_count), 0),
+                    )
+                )
+                blobs, total_bytes, references = result.one()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[BlobStore] Failed to read stats: {e}")
+            return {}
+        return {"blobs": blobs, "bytes": int(total_bytes), "references": int(references)}
+
+
+blob_store = BlobStore()
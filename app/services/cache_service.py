@@ -23,10 +23,12 @@ class CacheService:
     def __init__(self, redis_client):
         self.redis = redis_client
 
-    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Set a value in cache with TTL"""
+    async def set(self, key: str, value: Any, ttl: int = 3600, only_if_absent: bool = False) -> bool:
+        """Set a value in cache with TTL (only_if_absent: 이미 있으면 덮어쓰지 않음)"""
         if isinstance(value, dict):
             value = json.dumps(value)
+        if only_if_absent:
+            return bool(await self.redis.set(key, value, ex=ttl, nx=True))
         await self.redis.set(key, value, ex=ttl)
         return True
 
@@ -48,10 +50,10 @@ class CacheService:
         return result > 0
 
     # Session caching methods
-    async def cache_session(self, session_id: str, session_data: dict) -> bool:
+    async def cache_session(self, session_id: str, session_data: dict, only_if_absent: bool = False) -> bool:
         """Cache game session with 1 hour TTL"""
         key = f"session:{session_id}"
-        return await self.set(key, session_data, ttl=SESSION_TTL)
+        return await self.set(key, session_data, ttl=SESSION_TTL, only_if_absent=only_if_absent)
 
     async def get_session(self, session_id: str) -> Optional[dict]:
         """Get cached game session"""
@@ -0,0 +1,274 @@
+"""
+미리 생성한 캐릭터 풀 (Warm Pool)
+- (gender, style, art_style) 조합마다 디자인 + 표정 7종을 모두 생성해 둔 캐릭터를 CHARACTER_POOL_SIZE개 유지
+- 새 캐릭터가 필요하면 풀에서 하나를 원자적으로 꺼냄 (DELETE ... FOR UPDATE SKIP LOCKED ... RETURNING)
+  → 여러 워커가 동시에 꺼내도 같은 캐릭터를 두 번 주지 않음
+- 채우기는 워커마다 하나의 백그라운드 태스크가 이미지 할당량에 여유가 있을 때만 (가장 낮은 우선순위 레인)
+- 채우는 중인 행(status='filling')도 개수에 포함하여 다른 워커가 같은 자리를 다시 채우지 않음
+  (같은 순간에 확인한 워커끼리는 하나씩 더 채울 수 있지만 다음 꺼내기에서 소진됨)
+- 표정이 하나라도 placeholder(생성 실패)면 버림 - 풀에는 완성된 캐릭터만 들어감
+- 이미지 참조 수: ready가 될 때 풀이 참조를 잡고, 꺼낼 때 새 표정 행으로 그대로 넘김 (증감 없음)
+"""
+
+import asyncio
+import functools
+import logging
+from contextlib import aclosing
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.game import PooledCharacter
+from app.services import gemini_service
+from app.services.blob_store import blob_store
+from app.services.placeholder_service import is_placeholder_url
+from app.services.rate_limiter import Priority, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# 풀을 유지하는 설정 조합
+POOL_GENDERS = ("female", "male")
+POOL_STYLES = ("tsundere", "cool", "cute", "sexy", "pure")
+POOL_ART_STYLES = ("anime", "realistic", "watercolor")
+
+# 풀 확인 주기 (초)
+POOL_TICK_SECONDS = 60.0
+
+# 이 시간이 지나도 filling인 행은 채우던 워커가 죽은 것으로 보고 삭제
+FILLING_TIMEOUT = timedelta(minutes=30)
+
+
+def pool_combinations() -> list[tuple[str, str, str]]:
+    return [
+        (gender, style, art_style)
+        for gender in POOL_GENDERS
+        for style in POOL_STYLES
+        for art_style in POOL_ART_STYLES
+    ]
+
+
+class CharacterPool:
+    """캐릭터 풀 관리 (꺼내기 + 백그라운드 채우기)"""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        size: int | None = None,
+        min_headroom: float | None = None,
+        tick: float = POOL_TICK_SECONDS,
+    ):
+        self.session_maker = session_maker
+        self.size = settings.CHARACTER_POOL_SIZE if size is None else size
+        self.min_headroom = settings.CHARACTER_POOL_MIN_HEADROOM if min_headroom is None else min_headroom
+        self.tick = tick
+        self._task: asyncio.Task | None = None
+
+    # ============ 꺼내기 ============
+
+    async def claim(
+        self,
+        db: AsyncSession,
+        gender: str,
+        style: str,
+        art_style: str,
+    ) -> tuple[dict, dict[str, str]] | None:
+        """
+        준비된 캐릭터 하나를 풀에서 꺼냄 (호출자의 트랜잭션 안에서 - commit은 호출자가 수행)
+
+        Returns:
+            (character_design, {expression_type: image_url}) 또는 None (풀이 비었거나 DB 오류)
+        """
+        if self.size <= 0:
+            return None
+
+        candidate = (
+            select(PooledCharacter.id)
+            .where(
+                PooledCharacter.gender == gender,
+                PooledCharacter.style == style,
+                PooledCharacter.art_style == art_style,
+                PooledCharacter.status == "ready",
+            )
+            .order_by(PooledCharacter.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        try:
+            # 세이브포인트 안에서 실행 - 실패해도 호출자의 트랜잭션은 그대로 이어서 쓸 수 있음
+            async with db.begin_nested():
+                result = await db.execute(
+                    delete(PooledCharacter)
+                    .where(PooledCharacter.id == candidate)
+                    .returning(PooledCharacter.character_design, PooledCharacter.expression_urls)
+                )
+                row = result.first()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[CharacterPool] Claim failed, generating instead: {e}")
+            return None
+
+        if row is None:
+            return None
+        logger.info(f"[CharacterPool] Claimed pooled character ({gender}, {style}, {art_style})")
+        return row[0], row[1]
+
+    # ============ 채우기 ============
+
+    def start(self) -> None:
+        if self.size <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # 한 번에 하나씩 채우고, 할당량 여유가 남아 있으면 바로 다음 것
+                while await self.fill_once():
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[CharacterPool] Fill cycle failed")
+            await asyncio.sleep(self.tick)
+
+    async def has_headroom(self) -> bool:
+        """한가한지 (사용 가능한 이미지 모델 중 하나라도 할당량이 충분히 남아 있음)"""
+        # 상태만 확인 (half-open 모델의 시험 호출은 실제 생성 요청이 맡음)
+        models = await gemini_service.model_health.available_models(gemini_service.IMAGE_MODELS, probe=False)
+        for model in models:
+            if await rate_limiter.headroom(model) >= self.min_headroom:
+                return True
+        return False
+
+    async def fill_once(self) -> bool:
+        """
+        가장 부족한 조합에 캐릭터 하나를 채움
+
+        Returns:
+            채우기를 시도했는지 (False면 풀이 가득 찼거나 할당량 여유 없음)
+        """
+        if not await self.has_headroom():
+            return False
+
+        slot = await self._reserve_slot()
+        if slot is None:
+            return False
+
+        pooled_id, (gender, style, art_style), design = slot
+        try:
+            expression_urls = await self._generate(gender, style, art_style, design)
+        except Exception:
+            await self._discard(pooled_id)
+            raise
+
+        if expression_urls is None:
+            await self._discard(pooled_id)
+            return True
+
+        async with self.session_maker() as db:
+            pooled = await db.get(PooledCharacter, pooled_id)
+            if pooled is None:
+                return True
+            pooled.expression_urls = expression_urls
+            pooled.status = "ready"
+            await blob_store.acquire(db, list(expression_urls.values()))
+            await db.commit()
+        logger.info(f"[CharacterPool] Filled ({gender}, {style}, {art_style})")
+        return True
+
+    async def _reserve_slot(self) -> tuple | None:
+        """오래된 filling 행 정리 후, 가장 부족한 조합에 filling 행을 만들어 자리를 잡음"""
+        async with self.session_maker() as db:
+            await db.execute(
+                delete(PooledCharacter).where(
+                    PooledCharacter.status == "filling",
+                    PooledCharacter.created_at < datetime.utcnow() - FILLING_TIMEOUT,
+                )
+            )
+            result = await db.execute(
+                select(
+                    PooledCharacter.gender,
+                    PooledCharacter.style,
+                    PooledCharacter.art_style,
+                    func.count(),
+                ).group_by(PooledCharacter.gender, PooledCharacter.style, PooledCharacter.art_style)
+            )
+            counts = {(gender, style, art_style): count for gender, style, art_style, count in result.all()}
+
+            deficits = [
+                (counts.get(combination, 0), combination)
+                for combination in pool_combinations()
+                if counts.get(combination, 0) < self.size
+            ]
+            if not deficits:
+                await db.commit()
+                return None
+
+            _, (gender, style, art_style) = min(deficits)
+            design = gemini_service.get_character_design(gender=gender, style=style)
+            pooled = PooledCharacter(
+                gender=gender,
+                style=style,
+                art_style=art_style,
+                status="filling",
+                character_design=design,
+            )
+            db.add(pooled)
+            await db.commit()
+            return pooled.id, (gender, style, art_style), design
+
+    async def _generate(self, gender: str, style: str, art_style: str, design: dict) -> dict[str, str] | None:
+        """표정 7종 생성 (하나라도 실패하면 None)"""
+        expression_urls = {}
+        images = gemini_service.generate_character_images(
+            gender=gender,
+            style=style,
+            art_style=art_style,
+            expressions=gemini_service.EXPRESSION_TYPES,
+            character_design=design,
+            generate_image=functools.partial(gemini_service.generate_character_image, priority=Priority.POOL),
+        )
+        # 중간에 포기하면 남은 생성도 취소되도록 닫음
+        async with aclosing(images):
+            async for expression_type, image_url in images:
+                if is_placeholder_url(image_url):
+                    logger.info(f"[CharacterPool] {expression_type} failed, discarding ({gender}, {style}, {art_style})")
+                    return None
+                expression_urls[expression_type] = image_url
+        return expression_urls
+
+    async def _discard(self, pooled_id) -> None:
+        async with self.session_maker() as db:
+            await db.execute(delete(PooledCharacter).where(PooledCharacter.id == pooled_id))
+            await db.commit()
+
+    async def get_stats(self) -> dict:
+        """조합별 준비된 캐릭터 수"""
+        async with self.session_maker() as db:
+            result = await db.execute(
+                select(PooledCharacter.status, func.count()).group_by(PooledCharacter.status)
+            )
+            by_status = dict(result.all())
+        return {
+            "target_per_combination": self.size,
+            "combinations": len(pool_combinations()),
+            "ready": by_status.get("ready", 0),
+            "filling": by_status.get("filling", 0),
+        }
+
+
+character_pool = CharacterPool()
@@ -0,0 +1,156 @@
+"""
+특별 이벤트 이미지 카탈로그
+- (design_hash, art_style, event_type)마다 이미지 하나만 기록 → 같은 디자인 + 화풍의 캐릭터를 가진 모든 세션이 재사용
+  (디자인 지문에는 화풍이 없으므로 art_style로 따로 구분 - 실사 캐릭터에 애니메이션 이미지가 나오지 않도록)
+- "이 세션이 아직 보지 않은 다음 이벤트"를 인덱스 조회 한 번으로 찾음
+  (디자인을 공유하는 세션 수와 무관한 비용)
+- 카탈로그가 이미지 참조를 하나 잡고 있으므로 세션이 삭제되어도 재사용 가능
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session_maker
+from app.models.game import CharacterSetting, SpecialEventCatalog, SpecialEventImage
+from app.services.blob_store import blob_store
+from app.services.placeholder_service import PLACEHOLDER_URL_PREFIXES, is_placeholder_url
+
+logger = logging.getLogger(__name__)
+
+# art_style이 비어 있는 예전 캐릭터 설정 (생성 시 기본값과 같음)
+DEFAULT_ART_STYLE = "anime"
+
+
+class EventCatalog:
+    """디자인별 특별 이벤트 이미지 카탈로그"""
+
+    async def next_unseen(
+        self,
+        db: AsyncSession,
+        design_hash: str,
+        art_style: str,
+        session_id,
+    ) -> Optional[SpecialEventCatalog]:
+        """이 디자인 + 화풍의 카탈로그 이미지 중 세션에 아직 기록되지 않은 이벤트 하나 (먼저 만들어진 순)"""
+        seen = (
+            select(SpecialEventImage.id)
+            .where(
+                SpecialEventImage.session_id == session_id,
+                SpecialEventImage.event_type == SpecialEventCatalog.event_type,
+            )
+        )
+        result = await db.execute(
+            select(SpecialEventCatalog)
+            .where(
+                SpecialEventCatalog.design_hash == design_hash,
+                SpecialEventCatalog.art_style == art_style,
+                ~seen.exists(),
+            )
+            .order_by(SpecialEventCatalog.created_at)
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def add(
+        self,
+        db: AsyncSession,
+        design_hash: Optional[str],
+        art_style: str,
+        event_type: str,
+        image_url: str,
+        video_url: Optional[str] = None,
+        is_nsfw: bool = False,
+    ) -> bool:
+        """
+        새로 생성한 이벤트 이미지를 카탈로그에 등록 (호출자의 트랜잭션 안에서)
+        이미 같은 (디자인, 화풍, 이벤트)가 있거나 placeholder면 등록하지 않음
+
+        Returns:
+            새로 등록했는지
+        """
+        if not design_hash or is_placeholder_url(image_url):
+            return False
+
+        result = await db.execute(
+            insert(SpecialEventCatalog)
+            .values(
+                design_hash=design_hash,
+                art_style=art_style,
+                event_type=event_type,
+                image_url=image_url,
+                video_url=video_url,
+                is_nsfw=is_nsfw,
+            )
+            .on_conflict_do_nothing(constraint="uq_special_event_catalog_design_event")
+            .returning(SpecialEventCatalog.id)
+        )
+        if result.first() is None:
+            return False
+        await blob_store.acquire(db, [image_url])
+        return True
+
+    async def seed_from_history(self, session_maker: async_sessionmaker = async_session_maker) -> int:
+        """
+        카탈로그가 비어 있으면 기존 세션의 이벤트 이미지로 채움 (카탈로그 도입 전 데이터)
+
+        Returns:
+            등록한 항목 수
+        """
+        try:
+            async with session_maker() as db:
+                if (await db.execute(select(func.count()).select_from(SpecialEventCatalog))).scalar():
+                    return 0
+
+                # (디자인, 화풍, 이벤트)마다 가장 먼저 만들어진 이미지
+                art_style = func.coalesce(CharacterSetting.art_style, DEFAULT_ART_STYLE)
+                first_images = (
+                    select(
+                        func.gen_random_uuid(),
+                        CharacterSetting.design_hash,
+                        art_style,
+                        SpecialEventImage.event_type,
+                        SpecialEventImage.image_url,
+                        SpecialEventImage.video_url,
+                        SpecialEventImage.is_nsfw,
+                        SpecialEventImage.created_at,
+                    )
+                    .join(CharacterSetting, CharacterSetting.session_id == SpecialEventImage.session_id)
+                    .where(
+                        CharacterSetting.design_hash.isnot(None),
+                        *[~SpecialEventImage.image_url.startswith(prefix) for prefix in PLACEHOLDER_URL_PREFIXES],
+                    )
+                    .distinct(CharacterSetting.design_hash, art_style, SpecialEventImage.event_type)
+                    .order_by(
+                        CharacterSetting.design_hash,
+                        art_style,
+                        SpecialEventImage.event_type,
+                        SpecialEventImage.created_at,
+                    )
+                )
+                result = await db.execute(
+                    insert(SpecialEventCatalog)
+                    .from_select(
+                        ["id", "design_hash", "art_style", "event_type", "image_url", "video_url", "is_nsfw", "created_at"],
+                        first_images,
+                    )
+                    .on_conflict_do_nothing(constraint="uq_special_event_catalog_design_event")
+                    .returning(SpecialEventCatalog.image_url)
+                )
+                image_urls = [row[0] for row in result.all()]
+                await blob_store.acquire(db, image_urls)
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[EventCatalog] Seeding from history failed: {e}")
+            return 0
+
+        if image_urls:
+            logger.info(f"[EventCatalog] Seeded {len(image_urls)} catalog entries from existing sessions")
+        return len(image_urls)
+
+
+event_catalog = EventCatalog()
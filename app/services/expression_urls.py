@@ -0,0 +1,168 @@
+"""
+캐릭터 표정 이미지/비디오 URL 맵 (setting_id -> {expression_type: URL})
+- 워커 메모리의 LRU(EXPRESSION_URL_CACHE_SIZE개 캐릭터)에서 읽음 → 턴마다 하던 표정 조회가 네트워크 없이 끝남
+- 없으면 그 캐릭터의 표정 전체(이미지 + 비디오)를 한 번에 읽어 채움
+- 표정 행을 쓰는 쪽(표정 생성, 캐릭터 뺏기, 비디오 완료)은 커밋 후 invalidate() 호출
+  → 자기 워커에서 바로 지우고 Redis pub/sub으로 다른 워커에도 알림
+- 구독이 끊겼다 다시 연결되면 그 사이 알림을 놓쳤을 수 있으므로 LRU 전체를 비움
+- 읽는 중에 무효화가 들어오면 읽은 값은 캐시하지 않음 (커밋 전 값이 남지 않도록)
+- Redis 장애 시 다른 워커로의 알림만 빠짐 (자기 워커의 무효화는 그대로)
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.game import CharacterExpression
+
+logger = logging.getLogger(__name__)
+
+# 무효화 알림 채널 (메시지 = setting_id)
+INVALIDATE_CHANNEL = "expression_urls:invalidate"
+
+# 구독 재연결 대기 (초)
+RESUBSCRIBE_DELAY = 1.0
+
+ExpressionUrls = dict[str, dict[str, Optional[str]]]
+
+
+class ExpressionUrlMap:
+    """캐릭터 설정별 표정 URL (워커 로컬 LRU + 워커 간 무효화)"""
+
+    def __init__(self, redis: Redis, max_size: int | None = None):
+        self.redis = redis
+        self.max_size = settings.EXPRESSION_URL_CACHE_SIZE if max_size is None else max_size
+        self._cache: OrderedDict[UUID, ExpressionUrls] = OrderedDict()
+        # 무효화가 일어날 때마다 증가 (읽는 도중 무효화 감지용)
+        self._generation = 0
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+
+    # ============ 조회 ============
+
+    async def get_all(self, db: AsyncSession, setting_id: UUID) -> ExpressionUrls:
+        """
+        Returns:
+            {expression_type: {"image_url": ..., "video_url": ...}}
+        """
+        urls = self._cache.get(setting_id)
+        if urls is not None:
+            self._cache.move_to_end(setting_id)
+            self.hits += 1
+            return urls
+
+        self.misses += 1
+        generation = self._generation
+        urls = await self._load(db, setting_id)
+        if generation == self._generation:
+            self._store(setting_id, urls)
+        return urls
+
+    async def get(self, db: AsyncSession, setting_id: UUID, expression_type: str) -> Optional[str]:
+        """표정 이미지 URL (없으면 None)"""
+        return (await self.get_all(db, setting_id)).get(expression_type, {}).get("image_url")
+
+    async def _load(self, db: AsyncSession, setting_id: UUID) -> ExpressionUrls:
+        result = await db.execute(
+            select(
+                CharacterExpression.expression_type,
+                CharacterExpression.image_url,
+                CharacterExpression.video_url,
+            ).where(CharacterExpression.setting_id == setting_id)
+        )
+        return {
+            expression_type: {"image_url": image_url, "video_url": video_url}
+            for expression_type, image_url, video_url in result.all()
+        }
+
+    def _store(self, setting_id: UUID, urls: ExpressionUrls) -> None:
+        if self.max_size <= 0:
+            return
+        self._cache[setting_id] = urls
+        self._cache.move_to_end(setting_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    # ============ 무효화 ============
+
+    def _evict(self, setting_id: UUID | None = None) -> None:
+        self._generation += 1
+        if setting_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(setting_id, None)
+
+    async def invalidate(self, *setting_ids: UUID) -> None:
+        """표정 행이 바뀐 캐릭터 (커밋 후 호출)"""
+        for setting_id in setting_ids:
+            self._evict(setting_id)
+            try:
+                await self.redis.publish(INVALIDATE_CHANNEL, str(setting_id))
+            except (RedisError, OSError) as e:
+                logger.warning(f"[ExpressionUrls] Failed to publish invalidation for {setting_id}: {e}")
+
+    def _on_message(self, data) -> None:
+        value = data.decode() if isinstance(data, bytes) else str(data)
+        try:
+            self._evict(UUID(value))
+        except ValueError:
+            logger.warning(f"[ExpressionUrls] Ignoring malformed invalidation: {value!r}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                # 구독 전에 놓쳤을 수 있는 알림
+                self._evict()
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                logger.warning(f"[ExpressionUrls] Invalidation subscription lost, retrying: {e}")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "subscribed": self._task is not None and not self._task.done(),
+        }
+
+
+expression_urls = ExpressionUrlMap(redis_client)
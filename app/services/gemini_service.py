@@ -4,27 +4,172 @@ Gemini API Service
 이미지 생성 (Imagen 3)
 """
 
+import asyncio
 import hashlib
-import json
 import os
-import uuid
-from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
 
+import httpx
 from google import genai
 from google.genai import types
+from pydantic import ValidationError
 
 from app.core.config import settings
+from app.services.generation_cache import generation_cache, normalize_prompt
+from app.services.image_pipeline import image_pipeline
+from app.core.metrics import metrics
+from app.schemas.generation import DynamicEvent, SceneChoice, SceneContent
+from app.services.json_stream_parser import JsonStringFieldStreamer, parse_json_object
+from app.services.model_health_service import ModelUnavailableError, classify_error, model_health
+from app.services.placeholder_service import (
+    event_placeholder,
+    expression_placeholder,
+    placeholder_url,
+    scene_placeholder,
+)
+from app.services.rate_limiter import Priority, estimate_tokens, rate_limiter
+from app.services.storage import IMAGES_PREFIX, VIDEOS_PREFIX, storage
+from app.services.video_download import VideoDownloadError, download_video
 
 # Gemini API 클라이언트 설정
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
-# 이미지 저장 경로
-IMAGES_DIR = Path(__file__).parent.parent.parent / "static" / "images" / "characters"
-IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+# 텍스트 생성 모델
+TEXT_MODEL = 'gemini-2.0-flash'
+
+# Imagen 모델 (4.0 -> 3.0 폴백)
+IMAGE_MODELS = [
+    'imagen-4.0-generate-001',
+    'imagen-4.0-fast-generate-001',
+    'imagen-3.0-generate-002',
+    'imagen-3.0-fast-generate-001',
+]
+
+# 구조화 출력 설정 (응답 JSON 구조를 모델에 강제)
+SCENE_CONTENT_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=SceneContent,
+)
+DYNAMIC_EVENT_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=DynamicEvent,
+)
+
+# 워커당 동시 Gemini 호출 수 제한
+# (비동기 클라이언트를 사용하므로 호출 중에도 이벤트 루프는 다른 요청을 처리함)
+_gemini_semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+
+async def _generate_content(
+    model: str,
+    contents,
+    config: types.GenerateContentConfig | None = None,
+    timeout: float | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+):
+    """
+    비동기 Gemini 텍스트 생성 (할당량 + 동시성 제한 + 호출별 타임아웃)
+    결과는 모델 상태(circuit breaker)에 기록됨
+
+    Raises:
+        RateLimitExceeded: 우선순위 대기 시간 안에 할당량을 얻지 못한 경우
+        asyncio.TimeoutError: timeout 초 안에 응답이 오지 않은 경우
+    """
+    await rate_limiter.acquire(model, priority, tokens=estimate_tokens(str(contents)))
+    async with _gemini_semaphore:
+        try:
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                ),
+                timeout=timeout or settings.GEMINI_TEXT_TIMEOUT,
+            )
+        except Exception as e:
+            await model_health.record_failure(model, e)
+            raise
+    await model_health.record_success(model)
+    return response
+
+
+async def _generate_images(
+    model: str,
+    prompt: str,
+    config: types.GenerateImagesConfig | None = None,
+    timeout: float | None = None,
+    priority: Priority = Priority.EXPRESSION,
+):
+    """
+    비동기 Imagen 이미지 생성 (할당량 + 동시성 제한 + 호출별 타임아웃)
+    결과는 모델 상태(circuit breaker)에 기록됨
+
+    Raises:
+        RateLimitExceeded: 우선순위 대기 시간 안에 할당량을 얻지 못한 경우
+        asyncio.TimeoutError: timeout 초 안에 응답이 오지 않은 경우
+    """
+    await rate_limiter.acquire(model, priority)
+    async with _gemini_semaphore:
+        try:
+            response = await asyncio.wait_for(
+                client.aio.models.generate_images(
+                    model=model,
+                    prompt=prompt,
+                    config=config,
+                ),
+                timeout=timeout or settings.GEMINI_IMAGE_TIMEOUT,
+            )
+        except Exception as e:
+            await model_health.record_failure(model, e)
+            raise
+    await model_health.record_success(model)
+    return response
+
+
+async def _generate_content_stream(
+    model: str,
+    contents,
+    config: types.GenerateContentConfig | None = None,
+    timeout: float | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> AsyncIterator[str]:
+    """
+    비동기 Gemini 스트리밍 텍스트 생성 - 도착하는 텍스트 청크를 그대로 yield
+    할당량/동시성 제한은 _generate_content와 같고, timeout은 스트림 전체에 적용
+
+    Raises:
+        RateLimitExceeded: 우선순위 대기 시간 안에 할당량을 얻지 못한 경우
+        asyncio.TimeoutError: timeout 초 안에 스트림이 끝나지 않은 경우
+    """
+    await rate_limiter.acquire(model, priority, tokens=estimate_tokens(str(contents)))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or settings.GEMINI_TEXT_TIMEOUT)
+    async with _gemini_semaphore:
+        try:
+            stream = await asyncio.wait_for(
+                client.aio.models.generate_content_stream(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                ),
+                timeout=deadline - loop.time(),
+            )
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        iterator.__anext__(),
+                        timeout=max(0.0, deadline - loop.time()),
+                    )
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            await model_health.record_failure(model, e)
+            raise
+    await model_health.record_success(model)
 
-# 비디오 저장 경로
-VIDEOS_DIR = Path(__file__).parent.parent.parent / "static" / "videos" / "characters"
-VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
 # 7가지 표정 타입
 EXPRESSION_TYPES = [
@@ -449,6 +594,101 @@ DO NOT include: text, watermarks, multiple characters, Western features, legs, f
     return prompt
 
 
+# Veo 모델 (최신 모델 우선)
+VIDEO_MODELS = [
+    'veo-3.1-generate-preview',
+    'veo-3.0-generate-001',
+    'veo-2.0-generate-001',
+]
+
+# Veo operation 폴링 간격 (초)
+VIDEO_POLL_INTERVAL = 10
+
+
+async def start_video_generation(model: str, prompt: str):
+    """
+    Veo 비디오 생성 요청 (long-running operation 반환, 완료를 기다리지 않음)
+
+    Returns:
+        GenerateVideosOperation
+    """
+    await rate_limiter.acquire(model, Priority.VIDEO)
+    async with _gemini_semaphore:
+        try:
+            operation = await asyncio.wait_for(
+                client.aio.models.generate_videos(model=model, prompt=prompt),
+                timeout=settings.GEMINI_TEXT_TIMEOUT,
+            )
+        except Exception as e:
+            await model_health.record_failure(model, e)
+            raise
+    await model_health.record_success(model)
+    return operation
+
+
+async def get_video_operation(operation_name: str):
+    """
+    Veo operation 상태 조회 (operation 이름만으로 조회 가능 - 재시작 후에도 사용)
+
+    Returns:
+        GenerateVideosOperation
+    """
+    return await asyncio.wait_for(
+        client.aio.operations.get(types.GenerateVideosOperation(name=operation_name)),
+        timeout=settings.GEMINI_TEXT_TIMEOUT,
+    )
+
+
+async def save_generated_video(generated_video) -> str | None:
+    """
+    완료된 Veo 결과를 저장소(videos/characters/{sha256}.mp4)에 저장
+
+    다운로드 URI가 있으면 임시 파일로 스트리밍해서 그대로 저장소에 넘김 (메모리에 통째로 올리지 않음).
+    URI로 받을 수 없을 때만 응답에 포함된 바이트/SDK 다운로드를 사용.
+
+    Returns:
+        저장된 비디오 URL (비디오 데이터가 없으면 None)
+    """
+    if not (hasattr(generated_video, 'video') and generated_video.video):
+        return None
+    video = generated_video.video
+
+    uri = getattr(video, 'uri', None)
+    if isinstance(uri, str) and uri.startswith(("https://", "http://")):
+        try:
+            downloaded = await download_video(uri)
+        except (VideoDownloadError, httpx.HTTPError, OSError) as download_error:
+            print(f"Streaming video download failed, trying inline bytes: {download_error}")
+        else:
+            try:
+                with open(downloaded.path, "rb") as f:
+                    video_url, _ = await storage.put_if_absent(
+                        f"{VIDEOS_PREFIX}/{downloaded.sha256}.mp4", f, "video/mp4"
+                    )
+            finally:
+                await asyncio.to_thread(downloaded.unlink)
+            print(f"Video saved, size: {downloaded.size} bytes")
+            return video_url
+
+    # 폴백: 응답에 포함된 바이트 (Vertex 등 URI로 받을 수 없는 경우)
+    video_bytes = getattr(video, 'video_bytes', None)
+    if not video_bytes:
+        try:
+            video_bytes = await client.aio.files.download(file=video)
+        except Exception as download_error:
+            print(f"Video download failed: {download_error}")
+    if not video_bytes or len(video_bytes) <= 100:
+        return None
+    if len(video_bytes) > settings.VIDEO_DOWNLOAD_MAX_BYTES:
+        print(f"Video too large: {len(video_bytes)} bytes")
+        return None
+
+    digest = hashlib.sha256(video_bytes).hexdigest()
+    video_url, _ = await storage.put_if_absent(f"{VIDEOS_PREFIX}/{digest}.mp4", video_bytes, "video/mp4")
+    print(f"Video saved, size: {len(video_bytes)} bytes")
+    return video_url
+
+
 async def generate_character_video(
     gender: str,
     style: str,
@@ -459,6 +699,9 @@ async def generate_character_video(
     """
     Gemini Veo API를 사용하여 캐릭터 애니메이션 비디오 생성
 
+    완료될 때까지 기다리므로 API 요청 안에서는 사용하지 말 것.
+    API에서는 video_job_service(백그라운드 폴러)로 작업을 등록한다.
+
     Args:
         gender: 캐릭터 성별 (male/female)
         style: 캐릭터 성격 (tsundere/cool/cute/sexy/pure)
@@ -471,61 +714,35 @@ async def generate_character_video(
     """
     prompt = build_video_prompt(gender, style, art_style, expression, character_design)
 
-    # Veo 모델 사용 (최신 모델 우선)
-    models_to_try = [
-        'veo-3.1-generate-preview',
-        'veo-3.0-generate-001',
-        'veo-2.0-generate-001',
-    ]
+    async def _generate() -> dict | None:
+        for model_name in VIDEO_MODELS:
+            try:
+                print(f"Trying video generation with model: {model_name}")
 
-    for model_name in models_to_try:
-        try:
-            print(f"Trying video generation with model: {model_name}")
+                # 비디오 생성 요청
+                operation = await start_video_generation(model_name, prompt)
 
-            # 비디오 생성 요청
-            operation = client.models.generate_videos(
-                model=model_name,
-                prompt=prompt,
-            )
+                # 비디오 생성 완료 대기 (이벤트 루프를 막지 않음)
+                while not operation.done:
+                    await asyncio.sleep(VIDEO_POLL_INTERVAL)
+                    operation = await get_video_operation(operation.name)
 
-            # 비디오 생성 완료 대기
-            while not operation.done:
-                import time
-                time.sleep(10)
-                operation = client.operations.get(operation)
-
-            if operation.response and operation.response.generated_videos:
-                generated_video = operation.response.generated_videos[0]
-
-                video_id = str(uuid.uuid4())
-                video_filename = f"{video_id}.mp4"
-                video_path = VIDEOS_DIR / video_filename
-
-                # 새로운 API 방식: files.download() 후 save() 사용
-                if hasattr(generated_video, 'video') and generated_video.video:
-                    try:
-                        # 파일 다운로드
-                        client.files.download(file=generated_video.video)
-                        # 저장
-                        generated_video.video.save(str(video_path))
+                if operation.response and operation.response.generated_videos:
+                    video_url = await save_generated_video(operation.response.generated_videos[0])
+                    if video_url:
                         print(f"Video generated successfully with {model_name}")
-                        return f"/static/videos/characters/{video_filename}"
-                    except Exception as save_error:
-                        print(f"Save method failed, trying direct bytes: {save_error}")
-                        # 폴백: 직접 바이트 저장 시도
-                        if hasattr(generated_video.video, 'video_bytes'):
-                            video_bytes = generated_video.video.video_bytes
-                            if video_bytes and len(video_bytes) > 100:
-                                with open(video_path, 'wb') as f:
-                                    f.write(video_bytes)
-                                print(f"Video saved via bytes fallback, size: {len(video_bytes)} bytes")
-                                return f"/static/videos/characters/{video_filename}"
-
-            print(f"No video data in response from {model_name}")
+                        return {"url": video_url, "model": model_name}
 
-        except Exception as e:
-            print(f"Model {model_name} failed: {e}")
-            continue
+                print(f"No video data in response from {model_name}")
+
+            except Exception as e:
+                print(f"Model {model_name} failed: {e}")
+                continue
+        return None
+
+    generated = await generation_cache.get_or_create("video", prompt, _generate)
+    if generated:
+        return generated["url"]
 
     # 모든 모델 실패 시 placeholder 반환
     print(f"All video generation models failed, using placeholder")
@@ -543,6 +760,7 @@ async def generate_character_image(
     art_style: str,
     expression: str,
     character_design: dict | None = None,
+    priority: Priority = Priority.EXPRESSION,
 ) -> str:
     """
     Gemini API를 사용하여 캐릭터 이미지 생성
@@ -553,45 +771,61 @@ async def generate_character_image(
         art_style: 그림체 (anime/realistic/watercolor)
         expression: 표정 (neutral/happy/sad/jealous/shy/excited)
         character_design: 캐릭터 디자인 (동일 캐릭터 유지를 위해 전달)
+        priority: Gemini 할당량 우선순위
 
     Returns:
         생성된 이미지의 URL
     """
     prompt = build_expression_prompt(gender, style, art_style, expression, character_design)
 
-    # Imagen 모델 (4.0 -> 3.0 폴백)
-    models_to_try = [
-        'imagen-4.0-generate-001',
-        'imagen-4.0-fast-generate-001',
-        'imagen-3.0-generate-002',
-        'imagen-3.0-fast-generate-001',
-    ]
+    # 같은 프롬프트로 생성한 이미지가 있으면 재사용
+    generated = await generation_cache.get_or_create(
+        "expression_image",
+        prompt,
+        lambda: _generate_image_file(prompt, priority=priority),
+    )
+    if generated:
+        return generated["url"]
+
+    # 모든 모델 실패 시 placeholder 반환
+    print(f"All image generation models failed, using placeholder")
+    return _get_placeholder_url(expression, gender, style)
+
+
+async def _generate_image_file(prompt: str, priority: Priority, blurred: bool = False) -> dict | None:
+    """
+    Imagen으로 이미지 1장 생성 후 저장소(images/characters)에 저장
+    blurred=True면 비프리미엄용 blur 변형도 생성 (특별 이벤트 이미지)
+
+    Returns:
+        {"url": 저장된 이미지 URL, "model": 사용한 모델, "variants": 크기별 WebP/AVIF URL}
+        (모든 모델 실패 시 None)
+    """
+    # Imagen 모델 (4.0 -> 3.0 폴백) - circuit이 열린 모델은 건너뜀
+    models_to_try = await model_health.available_models(IMAGE_MODELS)
 
     for model_name in models_to_try:
         try:
             print(f"Trying image generation with model: {model_name}")
-            response = client.models.generate_images(
+            response = await _generate_images(
                 model=model_name,
                 prompt=prompt,
                 config=types.GenerateImagesConfig(
                     number_of_images=1,
                 ),
+                priority=priority,
             )
 
             if response.generated_images and len(response.generated_images) > 0:
-                image_id = str(uuid.uuid4())
-                image_filename = f"{image_id}.png"
-                image_path = IMAGES_DIR / image_filename
-
                 # 이미지 데이터 가져오기
                 generated_image = response.generated_images[0]
                 if hasattr(generated_image, 'image') and generated_image.image:
                     image_bytes = generated_image.image.image_bytes
                     if image_bytes and len(image_bytes) > 100:
-                        with open(image_path, 'wb') as f:
-                            f.write(image_bytes)
+                        # sha256 이름으로 저장 + WebP/AVIF 변형 생성 (이벤트 루프 밖에서)
+                        stored = await image_pipeline.ingest(image_bytes, IMAGES_PREFIX, blurred=blurred)
                         print(f"Image generated successfully with {model_name}, size: {len(image_bytes)} bytes")
-                        return f"/static/images/characters/{image_filename}"
+                        return {"url": stored["url"], "model": model_name, "variants": stored["variants"]}
                     else:
                         print(f"Image data too small: {len(image_bytes) if image_bytes else 0} bytes")
                 else:
@@ -603,28 +837,71 @@ async def generate_character_image(
             error_str = str(e)
             print(f"Model {model_name} failed: {error_str}")
             # 429 할당량 초과 시 다음 모델로 빠르게 넘어감
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+            if classify_error(e) == "quota":
                 print(f"Quota exceeded for {model_name}, trying next model...")
             continue
 
-    # 모든 모델 실패 시 placeholder 반환
-    print(f"All image generation models failed, using placeholder")
-    return _get_placeholder_url(expression, gender, style)
+    return None
+
+
+async def generate_character_images(
+    gender: str,
+    style: str,
+    art_style: str,
+    expressions: list[str],
+    character_design: dict | None = None,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+    generate_image: Callable[..., Awaitable[str]] | None = None,
+) -> AsyncIterator[tuple[str, str]]:
+    """
+    여러 표정 이미지를 동시에 생성하고 끝나는 순서대로 반환
+
+    Args:
+        expressions: 생성할 표정 목록
+        character_design: 모든 표정에서 동일하게 사용할 캐릭터 디자인
+        concurrency: 동시에 생성할 최대 표정 수
+        timeout: 표정 하나당 타임아웃 (초과 시 placeholder)
+        generate_image: 표정 하나를 생성하는 함수 (기본값 generate_character_image)
+
+    Yields:
+        (표정, 이미지 URL)
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.EXPRESSION_GENERATION_CONCURRENCY)
+    timeout = timeout or settings.EXPRESSION_GENERATION_TIMEOUT
+    generate_image = generate_image or generate_character_image
+
+    async def _generate(expression: str) -> tuple[str, str]:
+        async with semaphore:
+            try:
+                image_url = await asyncio.wait_for(
+                    generate_image(
+                        gender=gender,
+                        style=style,
+                        art_style=art_style,
+                        expression=expression,
+                        character_design=character_design,
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                print(f"Image generation for {expression} timed out after {timeout}s, using placeholder")
+                image_url = _get_placeholder_url(expression, gender, style)
+            return expression, image_url
+
+    tasks = [asyncio.create_task(_generate(expression)) for expression in expressions]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 호출자가 중간에 중단하면 남은 생성 취소
+        for task in tasks:
+            task.cancel()
 
 
 def _get_placeholder_url(expression: str, gender: str, style: str) -> str:
-    """이미지 생성 실패 시 placeholder URL 반환"""
-    colors = {
-        "neutral": "B0C4DE",
-        "happy": "FFD700",
-        "sad": "87CEEB",
-        "jealous": "FF6B6B",
-        "shy": "FFB6C1",
-        "excited": "FF69B4",
-        "disgusted": "556B2F",  # 어두운 올리브색 (불쾌함)
-    }
-    color = colors.get(expression, "FFB6C1")
-    return f"https://placehold.co/512x512/{color}/333333?text={expression}+{gender}+{style}"
+    """이미지 생성 실패 시 placeholder URL 반환 (로컬에서 그린 이미지)"""
+    return placeholder_url(expression_placeholder(expression, gender, style))
 
 
 # 동적 이벤트 씬 생성을 위한 기본 카테고리 (Gemini API가 참고할 힌트)
@@ -712,45 +989,40 @@ async def generate_dynamic_event_scene(
 
 JSON만 출력하세요."""
 
-    try:
-        response = client.models.generate_content(
-            model='gemini-2.0-flash',
-            contents=prompt,
-        )
+    async def _request_event() -> dict | None:
+        try:
+            if not await model_health.is_available(TEXT_MODEL):
+                raise ModelUnavailableError(TEXT_MODEL)
+
+            response = await _generate_content(
+                model=TEXT_MODEL,
+                contents=prompt,
+                config=DYNAMIC_EVENT_CONFIG,
+                priority=Priority.SPECIAL_EVENT,
+            )
+
+            # JSON 파싱 + 필수 필드 검증
+            metrics.increment("gemini_json_parse_total", kind="event")
+            try:
+                event = DynamicEvent.model_validate(parse_json_object(response.text)).model_dump()
+            except ValueError:
+                metrics.increment("gemini_json_parse_failures", kind="event")
+                raise
 
-        response_text = response.text.strip()
-
-        # JSON 추출
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            json_lines = []
-            in_json = False
-            for line in lines:
-                if line.startswith("```json"):
-                    in_json = True
-                    continue
-                elif line.startswith("```"):
-                    in_json = False
-                    continue
-                if in_json:
-                    json_lines.append(line)
-            response_text = "\n".join(json_lines)
-
-        event = json.loads(response_text)
-
-        # 필수 필드 검증
-        required_fields = ["name", "description", "scene", "mood", "outfit"]
-        for field in required_fields:
-            if field not in event:
-                raise ValueError(f"Missing field: {field}")
-
-        print(f"[Dynamic Event] Generated: {event['name']} - {event['description']}")
+            print(f"[Dynamic Event] Generated: {event['name']} - {event['description']}")
+            return event
+
+        except Exception as e:
+            print(f"Dynamic event generation failed: {e}")
+            return None
+
+    # 같은 조건(성별/성격/이전 이벤트)의 기획이 있으면 재사용 → 이벤트 이미지도 캐시 적중
+    event = await generation_cache.get_or_create("event_scene", prompt, _request_event)
+    if event:
         return event
 
-    except Exception as e:
-        print(f"Dynamic event generation failed: {e}")
-        # 폴백: 기본 이벤트 생성
-        return _get_fallback_event(gender, style, prev_list)
+    # 폴백: 기본 이벤트 생성
+    return _get_fallback_event(gender, style, prev_list)
 
 
 def _get_fallback_event(gender: str, style: str, previous_events: list[str]) -> dict:
@@ -905,49 +1177,18 @@ ABSOLUTE REQUIREMENTS:
 
 DO NOT include: text, watermarks, multiple characters, Western/Caucasian features, deformed anatomy, different character design, explicit nudity, pornographic content"""
 
-    # Imagen 모델 (4.0 -> 3.0 폴백)
-    models_to_try = [
-        'imagen-4.0-generate-001',
-        'imagen-4.0-fast-generate-001',
-        'imagen-3.0-generate-002',
-        'imagen-3.0-fast-generate-001',
-    ]
-
-    for model_name in models_to_try:
-        try:
-            print(f"Generating special event image with model: {model_name}")
-            response = client.models.generate_images(
-                model=model_name,
-                prompt=prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                ),
-            )
-
-            if response.generated_images and len(response.generated_images) > 0:
-                image_id = str(uuid.uuid4())
-                image_filename = f"event_{image_id}.png"
-                image_path = IMAGES_DIR / image_filename
-
-                generated_image = response.generated_images[0]
-                if hasattr(generated_image, 'image') and generated_image.image:
-                    image_bytes = generated_image.image.image_bytes
-                    if image_bytes and len(image_bytes) > 100:
-                        with open(image_path, 'wb') as f:
-                            f.write(image_bytes)
-                        print(f"Special event image generated successfully: {len(image_bytes)} bytes, event: {event['name']}")
-                        return (f"/static/images/characters/{image_filename}", event['description'], event['name'])
-
-        except Exception as e:
-            error_str = str(e)
-            print(f"Special event image generation failed with {model_name}: {error_str}")
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                print(f"Quota exceeded for {model_name}, trying next model...")
-            continue
+    # 같은 캐릭터 + 같은 이벤트 프롬프트면 이미 생성한 이미지 재사용
+    generated = await generation_cache.get_or_create(
+        "event_image",
+        prompt,
+        lambda: _generate_image_file(prompt, priority=Priority.SPECIAL_EVENT, blurred=True),
+    )
+    if generated:
+        print(f"Special event image ready: {generated['url']}, event: {event['name']}")
+        return (generated["url"], event['description'], event['name'])
 
     # 실패 시 placeholder
-    placeholder = f"https://placehold.co/1024x768/FF69B4/FFFFFF?text=Special+Event+{event['name']}"
-    return (placeholder, event['description'], event['name'])
+    return (placeholder_url(event_placeholder()), event['description'], event['name'])
 
 
 # 캐릭터 스타일 설명 (한국어)
@@ -1023,16 +1264,16 @@ CONVERSATION_TOPICS = [
 ]
 
 
-async def generate_scene_content(
+def build_scene_prompt(
     character_setting,
     user_mbti: str | None,
     scene_number: int,
     affection: int,
     previous_choice: str | None = None,
     previous_dialogue: str | None = None,
-) -> dict:
+) -> str:
     """
-    Gemini API를 사용하여 씬 콘텐츠 생성 (대화 + 선택지)
+    씬 콘텐츠(대화 + 선택지) 생성 프롬프트
 
     Args:
         character_setting: CharacterSetting 모델 (gender, style, mbti, art_style)
@@ -1216,46 +1457,122 @@ async def generate_scene_content(
 
 JSON만 출력하세요. 다른 설명은 필요 없습니다."""
 
+    return prompt
+
+
+# 선택지가 부족할 때 채워 넣는 기본 선택지
+DEFAULT_SCENE_CHOICES = [
+    {"text": "고개를 끄덕인다", "delta": 0, "expression": "neutral"},
+    {"text": "반갑게 인사한다", "delta": 2, "expression": "happy"},
+    {"text": "무시한다", "delta": -5, "expression": "sad"},
+]
+
+
+def _parse_scene_response(response_text: str | None, scene_number: int) -> dict:
+    """
+    Gemini 응답 텍스트 → 씬 콘텐츠 dict (SceneContent로 검증)
+    대사는 있는데 선택지 일부만 잘못된 경우 올바른 선택지만 남기고 기본 선택지로 채움
+    (이미 비용을 낸 응답을 버리지 않도록)
+
+    Raises:
+        ValueError: JSON 파싱 실패 또는 대사 없음
+    """
+    metrics.increment("gemini_json_parse_total", kind="scene")
     try:
-        # Gemini API 호출 (새로운 SDK)
-        response = client.models.generate_content(
-            model='gemini-2.0-flash',
-            contents=prompt,
-        )
+        data = parse_json_object(response_text)
+    except ValueError:
+        metrics.increment("gemini_json_parse_failures", kind="scene")
+        raise
+
+    try:
+        content = SceneContent.model_validate(data)
+        choices = [choice.model_dump() for choice in content.choices]
+        dialogue = content.dialogue
+    except ValidationError:
+        dialogue = data.get("dialogue")
+        if not isinstance(dialogue, str) or not dialogue:
+            metrics.increment("gemini_json_parse_failures", kind="scene")
+            raise
+        choices = []
+        for raw_choice in data.get("choices") or []:
+            try:
+                choices.append(SceneChoice.model_validate(raw_choice).model_dump())
+            except ValidationError:
+                continue
+        metrics.increment("gemini_json_parse_salvaged", kind="scene")
+
+    if len(choices) < 3:
+        choices += DEFAULT_SCENE_CHOICES[len(choices):]
+
+    # 이미지 URL (placeholder - 실제로는 character_expressions에서 가져옴)
+    image_url = placeholder_url(scene_placeholder())
 
-        # 응답 파싱
-        response_text = response.text.strip()
-
-        # JSON 추출 (```json ... ``` 형식일 수 있음)
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            json_lines = []
-            in_json = False
-            for line in lines:
-                if line.startswith("```json"):
-                    in_json = True
-                    continue
-                elif line.startswith("```"):
-                    in_json = False
-                    continue
-                if in_json:
-                    json_lines.append(line)
-            response_text = "\n".join(json_lines)
-
-        content = json.loads(response_text)
-
-        # 이미지 URL (placeholder - 실제로는 character_expressions에서 가져옴)
-        image_url = f"https://placehold.co/1024x768/FFB6C1/333333?text=Turn+{scene_number}"
-
-        return {
-            "image_url": image_url,
-            "dialogue": content.get("dialogue", "안녕하세요!"),
-            "choices": content.get("choices", [
-                {"text": "고개를 끄덕인다", "delta": 0, "expression": "neutral"},
-                {"text": "반갑게 인사한다", "delta": 2, "expression": "happy"},
-                {"text": "무시한다", "delta": -5, "expression": "sad"},
-            ]),
-        }
+    return {
+        "image_url": image_url,
+        "dialogue": dialogue,
+        "choices": choices[:3],
+    }
+
+
+async def request_scene_content(
+    character_setting,
+    user_mbti: str | None,
+    scene_number: int,
+    affection: int,
+    previous_choice: str | None = None,
+    previous_dialogue: str | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> dict:
+    """
+    Gemini API를 사용하여 씬 콘텐츠 생성 (폴백 없음 - 실패 시 예외)
+    인자는 build_scene_prompt 참고
+    """
+    prompt = build_scene_prompt(
+        character_setting=character_setting,
+        user_mbti=user_mbti,
+        scene_number=scene_number,
+        affection=affection,
+        previous_choice=previous_choice,
+        previous_dialogue=previous_dialogue,
+    )
+
+    # Gemini API 호출 (새로운 SDK)
+    if not await model_health.is_available(TEXT_MODEL):
+        raise ModelUnavailableError(TEXT_MODEL)
+
+    response = await _generate_content(
+        model=TEXT_MODEL,
+        contents=prompt,
+        config=SCENE_CONTENT_CONFIG,
+        priority=priority,
+    )
+
+    # 응답 파싱
+    return _parse_scene_response(response.text, scene_number)
+
+
+async def generate_scene_content(
+    character_setting,
+    user_mbti: str | None,
+    scene_number: int,
+    affection: int,
+    previous_choice: str | None = None,
+    previous_dialogue: str | None = None,
+) -> dict:
+    """
+    Gemini API를 사용하여 씬 콘텐츠 생성 (대화 + 선택지)
+    인자는 build_scene_prompt 참고, 실패 시 폴백 콘텐츠 반환
+    """
+    char_style = character_setting.style if character_setting else "cute"
+    try:
+        return await request_scene_content(
+            character_setting=character_setting,
+            user_mbti=user_mbti,
+            scene_number=scene_number,
+            affection=affection,
+            previous_choice=previous_choice,
+            previous_dialogue=previous_dialogue,
+        )
 
     except Exception as e:
         print(f"Gemini API error: {e}")
@@ -1263,6 +1580,68 @@ JSON만 출력하세요. 다른 설명은 필요 없습니다."""
         return _get_fallback_content(char_style, scene_number, affection)
 
 
+async def stream_scene_content(
+    character_setting,
+    user_mbti: str | None,
+    scene_number: int,
+    affection: int,
+    previous_choice: str | None = None,
+    previous_dialogue: str | None = None,
+) -> AsyncIterator[dict]:
+    """
+    씬 콘텐츠 스트리밍 생성 (인자는 build_scene_prompt 참고)
+
+    Yields:
+        {"type": "dialogue", "text": 새로 도착한 대사 조각}
+        {"type": "reset"} - 스트리밍 도중 실패하여 폴백 대사로 다시 보냄 (이미 보낸 대사 폐기)
+        {"type": "choices", "choices": [...]} - 응답이 끝나 선택지 파싱 완료
+        {"type": "done", "content": generate_scene_content와 같은 형식의 dict}
+    """
+    char_style = character_setting.style if character_setting else "cute"
+    prompt = build_scene_prompt(
+        character_setting=character_setting,
+        user_mbti=user_mbti,
+        scene_number=scene_number,
+        affection=affection,
+        previous_choice=previous_choice,
+        previous_dialogue=previous_dialogue,
+    )
+
+    streamer = JsonStringFieldStreamer("dialogue")
+    try:
+        if not await model_health.is_available(TEXT_MODEL):
+            raise ModelUnavailableError(TEXT_MODEL)
+
+        chunks = []
+        async for chunk in _generate_content_stream(
+            model=TEXT_MODEL,
+            contents=prompt,
+            config=SCENE_CONTENT_CONFIG,
+            priority=Priority.INTERACTIVE,
+        ):
+            chunks.append(chunk)
+            delta = streamer.feed(chunk)
+            if delta:
+                yield {"type": "dialogue", "text": delta}
+
+        content = _parse_scene_response("".join(chunks), scene_number)
+        if content["dialogue"] != streamer.value:
+            # 대사 필드를 스트리밍으로 찾지 못한 경우 (예: 키 누락) 전체 대사를 보냄
+            if streamer.value:
+                yield {"type": "reset"}
+            yield {"type": "dialogue", "text": content["dialogue"]}
+
+    except Exception as e:
+        print(f"Gemini streaming error: {e}")
+        content = _get_fallback_content(char_style, scene_number, affection)
+        if streamer.value:
+            yield {"type": "reset"}
+        yield {"type": "dialogue", "text": content["dialogue"]}
+
+    yield {"type": "choices", "choices": content["choices"]}
+    yield {"type": "done", "content": content}
+
+
 def _get_fallback_content(style: str, scene_number: int, affection: int) -> dict:
     """Gemini API 실패 시 폴백 콘텐츠"""
 
@@ -1293,7 +1672,7 @@ def _get_fallback_content(style: str, scene_number: int, affection: int) -> dict
     dialogue = random.choice(dialogues.get(style, dialogues["cute"]))
 
     return {
-        "image_url": f"https://placehold.co/1024x768/FFB6C1/333333?text=Turn+{scene_number}",
+        "image_url": placeholder_url(scene_placeholder()),
         "dialogue": dialogue,
         "choices": [
             {"text": "다른 곳을 본다", "delta": -5, "expression": "sad"},
@@ -1304,5 +1683,5 @@ def _get_fallback_content(style: str, scene_number: int, affection: int) -> dict
 
 
 def get_prompt_hash(prompt: str) -> str:
-    """프롬프트 해시 생성 (캐싱용)"""
-    return hashlib.sha256(prompt.encode()).hexdigest()
+    """프롬프트 해시 생성 (캐싱용) - 공백/줄바꿈 차이는 무시"""
+    return hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
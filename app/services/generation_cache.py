@@ -0,0 +1,351 @@
+"""
+AI 생성 결과 캐시 (2단계)
+- 콘텐츠 타입 + 정규화된 프롬프트를 해시하여 콘텐츠 주소로 사용 (prompt_key)
+  gemini_service.get_prompt_hash(프롬프트만 해시)와는 다른 값이므로 ai_generated_content 조회는 prompt_key로
+- 1단계: Redis (짧은 TTL) → 2단계: Postgres ai_generated_content (오래 보관) → 미스면 생성 후 양쪽에 기록
+- 콘텐츠 타입별 TTL/보관 기간 정책, 대화(dialogue)는 맥락마다 달라야 하므로 캐시하지 않음
+- placeholder(생성 실패)는 캐시하지 않음
+- 같은 워커에서 동시에 들어온 같은 프롬프트는 한 번만 생성 (single-flight)
+- 타입별 적중률은 Redis Hash에 집계
+- 미디어 GC가 파일을 지우면 그 URL을 내주던 항목도 DB/Redis에서 같이 지움 (forget_urls)
+- Redis/DB 장애 시에는 캐시 없이 생성 (fail-open)
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session_maker
+from app.core.redis import redis_client
+from app.models.game import AIGeneratedContent
+from app.services.cache_service import (
+    EXPRESSION_TTL,
+    SPECIAL_IMAGE_TTL,
+    VIDEO_TTL,
+    CacheService,
+)
+from app.services.storage import storage
+
+logger = logging.getLogger(__name__)
+
+# 적중률 집계 Redis Hash
+STATS_KEY = "gen_cache:stats"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """콘텐츠 타입별 캐시 정책"""
+    enabled: bool = True
+    redis_ttl: int = 3600  # Redis 보관 시간 (초)
+    db_max_age: Optional[timedelta] = None  # DB 보관 기간 (None이면 무기한)
+
+
+CACHE_POLICIES = {
+    # 표정 이미지: 같은 디자인 + 표정이면 같은 그림이어도 됨
+    "expression_image": CachePolicy(redis_ttl=EXPRESSION_TTL),
+    # 특별 이벤트 이미지 (Redis는 CacheService.cache_special_image 키 사용)
+    "event_image": CachePolicy(redis_ttl=SPECIAL_IMAGE_TTL, db_max_age=timedelta(days=90)),
+    # 동적 이벤트 기획 (텍스트) - 새 이벤트가 계속 나오도록 짧게 보관
+    "event_scene": CachePolicy(redis_ttl=3600, db_max_age=timedelta(days=7)),
+    # Veo 비디오
+    "video": CachePolicy(redis_ttl=VIDEO_TTL),
+    # 대화: 이전 선택/상황이 프롬프트에 들어가므로 재사용 불가
+    "dialogue": CachePolicy(enabled=False),
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# single-flight: 생성 함수가 예외로 끝난 경우 대기자는 직접 생성
+_FAILED = object()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """줄바꿈/들여쓰기 차이는 같은 프롬프트로 취급"""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def prompt_key(content_type: str, prompt: str) -> str:
+    """콘텐츠 타입 + 정규화된 프롬프트의 해시 (ai_generated_content.prompt_hash)"""
+    return hashlib.sha256(normalize_prompt(f"{content_type}:{prompt}").encode()).hexdigest()
+
+
+def _is_servable(value: dict) -> bool:
+    """저장소 URL이면 파일이 아직 있는지 확인 (GC로 삭제된 파일을 캐시에서 내주지 않도록)"""
+    url = value.get("url")
+    if isinstance(url, str):
+        return storage.is_available(url)
+    return True
+
+
+class GenerationCache:
+    """
+    Redis + Postgres 2단계 생성 캐시
+
+    content_data 형식
+    - 이미지/비디오: {"url": ..., "model": ...}
+    - event_scene: 이벤트 dict (name, description, scene, mood, outfit)
+    """
+
+    def __init__(
+        self,
+        cache: CacheService,
+        session_maker: async_sessionmaker = async_session_maker,
+        policies: dict[str, CachePolicy] | None = None,
+    ):
+        self.cache = cache
+        self.session_maker = session_maker
+        self.policies = policies or CACHE_POLICIES
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _policy(self, content_type: str) -> CachePolicy:
+        return self.policies.get(content_type, CachePolicy(enabled=False))
+
+    # ---------- Redis 단계 ----------
+
+    async def _redis_get(self, content_type: str, prompt_hash: str) -> Optional[dict]:
+        if content_type == "event_image":
+            url = await self.cache.get_special_image(prompt_hash)
+            return {"url": url} if url else None
+        value = await self.cache.get(f"generated:{content_type}:{prompt_hash}")
+        return value if isinstance(value, dict) else None
+
+    async def _redis_set(self, content_type: str, prompt_hash: str, value: dict) -> None:
+        if content_type == "event_image":
+            await self.cache.cache_special_image(prompt_hash, value["url"])
+            return
+        await self.cache.set(
+            f"generated:{content_type}:{prompt_hash}", value, ttl=self._policy(content_type).redis_ttl
+        )
+
+    async def _redis_delete(self, content_type: str, prompt_hash: str) -> None:
+        prefix = "special" if content_type == "event_image" else f"generated:{content_type}"
+        await self.cache.delete(f"{prefix}:{prompt_hash}")
+
+    async def _record(self, content_type: str, outcome: str) -> None:
+        try:
+            await self.cache.redis.hincrby(STATS_KEY, f"{content_type}:{outcome}", 1)
+        except (RedisError, OSError):
+            pass
+
+    # ---------- 조회 / 기록 ----------
+
+    async def get(self, content_type: str, prompt: str) -> Optional[dict]:
+        """캐시 조회 (Redis → DB, DB 적중 시 Redis 채움)"""
+        policy = self._policy(content_type)
+        if not policy.enabled:
+            return None
+        prompt_hash = prompt_key(content_type, prompt)
+
+        try:
+            value = await self._redis_get(content_type, prompt_hash)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[GenCache] Redis unavailable: {e}")
+            value = None
+        if value is not None and _is_servable(value):
+            await self._record(content_type, "redis_hit")
+            return value
+
+        value = await self._db_get(content_type, prompt_hash, policy)
+        if value is not None:
+            await self._record(content_type, "db_hit")
+            try:
+                await self._redis_set(content_type, prompt_hash, value)
+            except (RedisError, OSError):
+                pass
+            return value
+
+        await self._record(content_type, "miss")
+        return None
+
+    async def _db_get(self, content_type: str, prompt_hash: str, policy: CachePolicy) -> Optional[dict]:
+        try:
+            async with self.session_maker() as db:
+                result = await db.execute(
+                    select(AIGeneratedContent).where(AIGeneratedContent.prompt_hash == prompt_hash)
+                )
+                row = result.scalar_one_or_none()
+                if row is None:
+                    return None
+
+                expired = policy.db_max_age is not None and row.created_at \
+                    and datetime.utcnow() - row.created_at > policy.db_max_age
+                if expired or not _is_servable(row.content_data):
+                    await db.delete(row)
+                    await db.commit()
+                    return None
+                return row.content_data
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[GenCache] DB lookup failed: {e}")
+            return None
+
+    async def put(self, content_type: str, prompt: str, value: dict) -> None:
+        """생성 결과 기록 (placeholder는 호출자가 넘기지 않음)"""
+        policy = self._policy(content_type)
+        if not policy.enabled:
+            return
+        prompt_hash = prompt_key(content_type, prompt)
+
+        try:
+            await self._redis_set(content_type, prompt_hash, value)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[GenCache] Failed to write Redis: {e}")
+
+        try:
+            async with self.session_maker() as db:
+                await db.execute(
+                    insert(AIGeneratedContent)
+                    .values(prompt_hash=prompt_hash, content_type=content_type, content_data=value)
+                    .on_conflict_do_nothing(index_elements=["prompt_hash"])
+                )
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[GenCache] Failed to write DB: {e}")
+
+    async def invalidate(self, content_type: str, prompt: str) -> None:
+        prompt_hash = prompt_key(content_type, prompt)
+        try:
+            await self._redis_delete(content_type, prompt_hash)
+        except (RedisError, OSError):
+            pass
+        try:
+            async with self.session_maker() as db:
+                await db.execute(
+                    delete(AIGeneratedContent).where(AIGeneratedContent.prompt_hash == prompt_hash)
+                )
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[GenCache] Failed to invalidate: {e}")
+
+    async def get_or_create(
+        self,
+        content_type: str,
+        prompt: str,
+        create: Callable[[], Awaitable[Optional[dict]]],
+    ) -> Optional[dict]:
+        """
+        캐시에 있으면 반환, 없으면 create()로 생성 후 기록
+
+        Args:
+            create: 생성 함수 - 실패(placeholder)면 None을 반환하여 캐시하지 않음
+
+        Returns:
+            캐시된/생성된 값 또는 None (생성 실패)
+        """
+        if not self._policy(content_type).enabled:
+            return await create()
+
+        prompt_hash = prompt_key(content_type, prompt)
+        inflight = self._inflight.get(prompt_hash)
+        if inflight is not None:
+            value = await asyncio.shield(inflight)
+            if value is not _FAILED:
+                return value
+            return await create()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[prompt_hash] = future
+        value = _FAILED
+        try:
+            value = await self.get(content_type, prompt)
+            if value is None:
+                value = await create()
+                if value is not None:
+                    await self.put(content_type, prompt, value)
+            return value
+        finally:
+            future.set_result(value)
+            del self._inflight[prompt_hash]
+
+    # ---------- 관리 ----------
+
+    async def forget_urls(self, db: AsyncSession, urls: list[str]) -> list[tuple[str, str]]:
+        """
+        삭제된 파일 URL을 내주던 DB 항목 삭제 (호출자의 트랜잭션 안에서 - 커밋 후 forget_redis 호출)
+
+        Returns:
+            삭제한 항목의 [(content_type, prompt_hash)]
+        """
+        if not urls:
+            return []
+        result = await db.execute(
+            delete(AIGeneratedContent)
+            .where(AIGeneratedContent.content_data["url"].as_string().in_(urls))
+            .returning(AIGeneratedContent.content_type, AIGeneratedContent.prompt_hash)
+        )
+        return [(content_type, prompt_hash) for content_type, prompt_hash in result.all()]
+
+    async def forget_redis(self, entries: list[tuple[str, str]]) -> None:
+        """forget_urls로 지운 항목의 Redis 복사본 삭제"""
+        for content_type, prompt_hash in entries:
+            try:
+                await self._redis_delete(content_type, prompt_hash)
+            except (RedisError, OSError) as e:
+                logger.warning(f"[GenCache] Failed to drop {content_type}:{prompt_hash} from Redis: {e}")
+
+    async def evict_expired(self) -> int:
+        """보관 기간이 지난 DB 항목 삭제 (Redis는 TTL로 만료)"""
+        deleted = 0
+        try:
+            async with self.session_maker() as db:
+                for content_type, policy in self.policies.items():
+                    if policy.db_max_age is None:
+                        continue
+                    result = await db.execute(
+                        delete(AIGeneratedContent).where(
+                            AIGeneratedContent.content_type == content_type,
+                            AIGeneratedContent.created_at < datetime.utcnow() - policy.db_max_age,
+                        )
+                    )
+                    deleted += result.rowcount or 0
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[GenCache] Eviction failed: {e}")
+        if deleted:
+            logger.info(f"[GenCache] Evicted {deleted} expired entries")
+        return deleted
+
+    async def get_stats(self) -> dict[str, dict]:
+        """
+        콘텐츠 타입별 적중률
+
+        Returns:
+            {content_type: {"redis_hits", "db_hits", "misses", "hit_rate"}}
+        """
+        try:
+            raw = await self.cache.redis.hgetall(STATS_KEY)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[GenCache] Redis unavailable: {e}")
+            return {}
+
+        counts: dict[str, dict[str, int]] = {}
+        for field, count in raw.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            content_type, _, outcome = field.rpartition(":")
+            counts.setdefault(content_type, {})[outcome] = int(count)
+
+        stats = {}
+        for content_type, outcome in counts.items():
+            redis_hits = outcome.get("redis_hit", 0)
+            db_hits = outcome.get("db_hit", 0)
+            misses = outcome.get("miss", 0)
+            total = redis_hits + db_hits + misses
+            stats[content_type] = {
+                "redis_hits": redis_hits,
+                "db_hits": db_hits,
+                "misses": misses,
+                "hit_rate": round((redis_hits + db_hits) / total, 3) if total else 0.0,
+            }
+        return stats
+
+
+generation_cache = GenerationCache(CacheService(redis_client))
@@ -0,0 +1,256 @@
+"""
+이미지 인제스트 파이프라인
+- 원본/변형은 저장소 백엔드(storage: 로컬 static/ 또는 S3)로 기록, WebP/AVIF 인코딩과 리사이즈는 프로세스 풀에서 처리 (이벤트 루프를 막지 않음)
+- 256/512/1024 크기 변형을 만들어 모바일 클라이언트는 필요한 크기만 받도록 함
+- 특별/엔딩 이미지는 작고 강하게 blur 처리한 WebP도 생성 → 비프리미엄 사용자는 원본 대신 이것만 받음
+- 변형 URL은 원본 URL 기준으로 image_assets 테이블에 기록
+- 원본 파일 이름은 바이트의 sha256 → 같은 이미지가 다시 생성되면 쓰기/변환 없이 기존 파일 재사용 (blob_store)
+- 변환/기록이 실패해도 원본 PNG는 그대로 서빙 (변형 없이)
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from PIL import Image, ImageFilter, features
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.game import ImageAsset
+from app.services.blob_store import BlobStore, blob_store
+from app.services.storage import IMAGES_PREFIX, StorageBackend, storage
+
+logger = logging.getLogger(__name__)
+
+# 포맷별 인코딩 옵션 (확장자, Pillow save 인자)
+FORMAT_OPTIONS = {
+    "webp": ("webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "avif": ("avif", {"format": "AVIF", "quality": 55, "speed": 8}),
+}
+
+CONTENT_TYPES = {"png": "image/png", "webp": "image/webp", "avif": "image/avif"}
+
+# 비프리미엄용 blur 변형 (긴 변 크기, blur 반경, WebP 품질)
+BLURRED_SIZE = 256
+BLURRED_RADIUS = 12
+BLURRED_QUALITY = 50
+
+
+def supported_formats() -> tuple[str, ...]:
+    """이 Pillow 빌드에서 인코딩 가능한 변형 포맷"""
+    formats = ["webp"] if features.check("webp") else []
+    if settings.IMAGE_AVIF_ENABLED and features.check("avif"):
+        formats.append("avif")
+    return tuple(formats)
+
+
+def _variant_labels(longest: int, sizes: tuple[int, ...]) -> list[int]:
+    """원본보다 작은 크기 + 원본 크기 (업스케일하지 않음)"""
+    return sorted({size for size in sizes if size < longest} | {longest})
+
+
+def encode_variants(
+    image_bytes: bytes,
+    sizes: tuple[int, ...],
+    formats: tuple[str, ...],
+    blurred: bool = False,
+) -> dict[str, dict[str, bytes]]:
+    """
+    원본 이미지를 포맷 × 크기별로 인코딩 (프로세스 풀 워커에서 실행)
+
+    Args:
+        blurred: True면 비프리미엄용 blur 변형도 생성 ("blurred" 키, WebP)
+
+    Returns:
+        {"webp": {"256": bytes, ...}, "avif": {...}} - 크기 라벨은 긴 변 픽셀 수
+    """
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        source.load()
+        has_alpha = source.mode in ("RGBA", "LA") or "transparency" in source.info
+        image = source.convert("RGBA" if has_alpha else "RGB")
+
+    longest = max(image.size)
+    outputs: dict[str, dict[str, bytes]] = {fmt: {} for fmt in formats}
+    for size in _variant_labels(longest, sizes):
+        resized = image
+        if size < longest:
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            _, options = FORMAT_OPTIONS[fmt]
+            buffer = io.BytesIO()
+            resized.save(buffer, **options)
+            outputs[fmt][str(size)] = buffer.getvalue()
+
+    if blurred:
+        small = image.copy()
+        small.thumbnail((BLURRED_SIZE, BLURRED_SIZE), Image.Resampling.LANCZOS)
+        small = small.filter(ImageFilter.GaussianBlur(BLURRED_RADIUS))
+        buffer = io.BytesIO()
+        small.save(buffer, format="WEBP", quality=BLURRED_QUALITY)
+        outputs["blurred"] = {str(max(small.size)): buffer.getvalue()}
+    return outputs
+
+
+def blurred_url(variants: Optional[dict]) -> Optional[str]:
+    """변형 중 blur 처리된 URL (없으면 None)"""
+    by_size = (variants or {}).get("blurred") or {}
+    return next(iter(by_size.values()), None)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ImagePipeline:
+    """
+    생성 이미지 저장 + 변형 생성
+
+    variants 형식: {"webp": {"256": url, "512": url, "1024": url}, "avif": {...}}
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        backend: StorageBackend = storage,
+        sizes: Optional[tuple[int, ...]] = None,
+        max_workers: Optional[int] = None,
+        blobs: BlobStore = blob_store,
+    ):
+        self.session_maker = session_maker
+        self.blobs = blobs
+        self.storage = backend
+        self.sizes = tuple(sizes or settings.IMAGE_VARIANT_SIZES)
+        self.max_workers = max_workers or settings.IMAGE_PIPELINE_WORKERS
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def ingest(
+        self,
+        image_bytes: bytes,
+        prefix: str = IMAGES_PREFIX,
+        extension: str = "png",
+        blurred: bool = False,
+    ) -> dict:
+        """
+        원본을 콘텐츠 주소 키({prefix}/{sha256}.{extension})로 저장하고 WebP/AVIF 크기 변형을 만들어 기록
+        같은 키가 이미 있으면 쓰지 않음 → 같은 이미지는 한 번만 저장
+
+        Args:
+            prefix: 저장소 키 접두사
+            blurred: 비프리미엄용 blur 변형도 생성 (특별/엔딩 이미지)
+
+        Returns:
+            {"url": 원본 URL, "variants": {...}} - 변환 실패 시 variants는 빈 dict
+        """
+        digest = await asyncio.to_thread(_sha256, image_bytes)
+        stem = f"{prefix}/{digest}"
+        url, created = await self.storage.put_if_absent(
+            f"{stem}.{extension}", image_bytes, CONTENT_TYPES.get(extension, "application/octet-stream")
+        )
+        await self.blobs.register(digest, url, len(image_bytes))
+
+        if not created:
+            # 같은 이미지가 이미 있으면 변형도 이미 있음
+            variants = await self._lookup(url)
+            if variants is not None and (not blurred or blurred_url(variants)):
+                return {"url": url, "variants": variants}
+
+        variants = await self._create_variants(image_bytes, stem, blurred)
+        if variants:
+            await self._record(url, variants)
+        return {"url": url, "variants": variants}
+
+    async def _lookup(self, url: str) -> Optional[dict]:
+        try:
+            async with self.session_maker() as db:
+                return (await get_image_variants(db, [url])).get(url)
+        except (SQLAlchemyError, OSError):
+            return None
+
+    async def _create_variants(self, image_bytes: bytes, stem: str, blurred: bool = False) -> dict:
+        formats = supported_formats()
+        if not formats:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        try:
+            encoded = await loop.run_in_executor(
+                self._get_pool(), encode_variants, image_bytes, self.sizes, formats, blurred
+            )
+        except BrokenProcessPool:
+            logger.warning("[ImagePipeline] Worker pool broken, recreating on next image")
+            self._pool = None
+            return {}
+        except (OSError, ValueError) as e:
+            # 손상된 이미지 (UnidentifiedImageError는 OSError)
+            logger.warning(f"[ImagePipeline] Failed to encode variants for {stem}: {e}")
+            return {}
+
+        uploads = []
+        for fmt, by_size in encoded.items():
+            if fmt == "blurred":
+                name, extension = f"{stem}_blurred", "webp"
+            else:
+                name, (extension, _) = stem, FORMAT_OPTIONS[fmt]
+            for size, data in by_size.items():
+                uploads.append((fmt, size, f"{name}_{size}.{extension}", data, CONTENT_TYPES[extension]))
+
+        try:
+            urls = await asyncio.gather(*[
+                self.storage.put(key, data, content_type) for _, _, key, data, content_type in uploads
+            ])
+        except OSError as e:
+            logger.warning(f"[ImagePipeline] Failed to write variants for {stem}: {e}")
+            return {}
+
+        variants: dict[str, dict[str, str]] = {}
+        for (fmt, size, *_), url in zip(uploads, urls):
+            variants.setdefault(fmt, {})[size] = url
+        return variants
+
+    async def _record(self, url: str, variants: dict) -> None:
+        try:
+            async with self.session_maker() as db:
+                statement = insert(ImageAsset).values(url=url, variants=variants)
+                # 같은 이미지에 blur 변형이 나중에 추가되는 경우 덮어씀
+                await db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=["url"],
+                        set_={"variants": statement.excluded.variants},
+                    )
+                )
+                await db.commit()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"[ImagePipeline] Failed to record variants for {url}: {e}")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+async def get_image_variants(db: AsyncSession, urls: list[str]) -> dict[str, dict]:
+    """원본 URL → 변형 URL (변형이 없는 URL은 결과에 없음)"""
+    urls = [url for url in urls if url]
+    if not urls:
+        return {}
+    result = await db.execute(
+        select(ImageAsset.url, ImageAsset.variants).where(ImageAsset.url.in_(urls))
+    )
+    return {url: variants for url, variants in result.all()}
+
+
+image_pipeline = ImagePipeline()
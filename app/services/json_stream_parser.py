@@ -0,0 +1,129 @@
+"""
+Gemini JSON 응답 파서
+- parse_json_object: 완성된 응답에서 JSON 객체를 한 번에 파싱 (코드 펜스/앞뒤 문장 허용)
+- JsonStringFieldStreamer: 스트리밍 응답은 JSON이 임의의 위치에서 잘려서 도착하므로,
+  전체 응답을 기다리지 않고 특정 문자열 필드의 값만 도착하는 대로 꺼냄
+"""
+
+import json
+import re
+
+# 문자열 안의 날것 줄바꿈 등 제어 문자도 허용
+_decoder = json.JSONDecoder(strict=False)
+
+# JSON 문자열 이스케이프 (\uXXXX 제외)
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def parse_json_object(text: str | None) -> dict:
+    """
+    응답 텍스트의 첫 JSON 객체를 파싱
+    ```json 코드 펜스나 앞뒤 설명 문장이 있어도 첫 '{'부터 객체 하나만 읽고 나머지는 무시
+
+    Raises:
+        ValueError: JSON 객체가 없거나 올바르지 않은 경우
+    """
+    text = text or ""
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("No JSON object in response")
+    obj, _ = _decoder.raw_decode(text, start)
+    if not isinstance(obj, dict):
+        raise ValueError("Response JSON is not an object")
+    return obj
+
+
+class JsonStringFieldStreamer:
+    """
+    JSON 문자열 필드 하나를 청크 단위로 디코딩
+
+    사용 예:
+        streamer = JsonStringFieldStreamer("dialogue")
+        for chunk in chunks:
+            delta = streamer.feed(chunk)  # 이번 청크에서 새로 확정된 글자
+    """
+
+    def __init__(self, field: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self.done = False
+        self._parts: list[str] = []
+
+    @property
+    def value(self) -> str:
+        """지금까지 디코딩된 필드 값"""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> str:
+        """
+        청크를 추가하고 새로 디코딩된 텍스트 반환
+        이스케이프 시퀀스가 청크 경계에서 잘리면 다음 청크가 올 때까지 보류
+        """
+        if self.done:
+            return ""
+        self._buffer += chunk
+
+        if not self._started:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._started = True
+            self._pos = match.end()
+
+        buffer = self._buffer
+        pos = self._pos
+        out = []
+        while pos < len(buffer):
+            ch = buffer[pos]
+            if ch == '"':
+                self.done = True
+                pos += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                pos += 1
+                continue
+
+            # 이스케이프 시퀀스
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape != "u":
+                out.append(_ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+
+            if pos + 6 > len(buffer):
+                break
+            code = int(buffer[pos + 2:pos + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # 서로게이트 쌍 (이모지 등)
+                if pos + 12 > len(buffer):
+                    break
+                if buffer[pos + 6:pos + 8] == "\\u":
+                    low = int(buffer[pos + 8:pos + 12], 16)
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    pos += 12
+                    continue
+                out.append("�")
+                pos += 6
+                continue
+            out.append(chr(code))
+            pos += 6
+
+        self._pos = pos
+        text = "".join(out)
+        if text:
+            self._parts.append(text)
+        return text
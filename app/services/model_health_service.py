@@ -0,0 +1,246 @@
+"""
+Gemini/Imagen 모델별 상태 추적 (Circuit Breaker)
+- 모델 상태를 Redis에 저장하여 모든 워커가 공유
+- 429 RESOURCE_EXHAUSTED: 즉시 차단 (retry-after가 있으면 그만큼)
+- 5xx / 타임아웃: FAILURE_WINDOW_SECONDS 안의 실패가 임계치에 도달하면 차단
+- 오류 분류는 SDK 오류의 HTTP 상태 코드(APIError.code)로 판단 (메시지 문자열은 보지 않음)
+- 차단 시간이 지나면 half-open: 모든 워커 중 probe 잠금(SET NX)을 잡은 호출 하나만 모델을 시험
+  → 성공하면 상태 초기화, 실패하면 임계치와 관계없이 다시 차단 (probe가 응답 없이 끝나면 잠금 만료 후 다른 호출이 시험)
+- Redis 장애 시에는 모든 모델을 사용 가능한 것으로 간주 (fail-open)
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+from google.genai import errors as genai_errors
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis 키
+MODEL_HEALTH_KEY_PREFIX = "gemini:model_health:"
+KNOWN_MODELS_KEY = "gemini:model_health:models"
+
+# 실패 임계치 (5xx / 타임아웃)
+FAILURE_THRESHOLD = 3
+
+# 실패 카운트 구간 (초) - 첫 실패부터 이 시간이 지나면 카운트 초기화
+FAILURE_WINDOW_SECONDS = 60
+
+# 차단 시간 (초)
+QUOTA_COOLDOWN_SECONDS = 60
+SERVER_ERROR_COOLDOWN_SECONDS = 30
+MAX_COOLDOWN_SECONDS = 600
+
+# half-open probe 잠금 유지 시간 (초) - probe 호출이 결과를 기록하지 못하고 끝나도 이 시간 뒤 다른 호출이 시험
+PROBE_LEASE_SECONDS = 30
+
+_RETRY_DELAY_PATTERNS = [
+    re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s"),
+    re.compile(r"retry[-_ ]after['\"]?\s*[:=]?\s*['\"]?(\d+(?:\.\d+)?)", re.IGNORECASE),
+]
+
+
+class ModelUnavailableError(Exception):
+    """Circuit이 열려 있어 모델 호출을 건너뜀"""
+
+    def __init__(self, model: str):
+        super().__init__(f"Model {model} is temporarily unavailable (circuit open)")
+        self.model = model
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    모델 오류 분류
+
+    Returns:
+        'quota' (429), 'server' (5xx/타임아웃) 또는 None (요청 자체의 문제 - 차단하지 않음)
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return "server"
+    if not isinstance(error, genai_errors.APIError) or not isinstance(error.code, int):
+        return None
+
+    if error.code == 429:
+        return "quota"
+    if 500 <= error.code < 600:
+        return "server"
+    return None
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    """오류 메시지의 retryDelay / retry-after 값 (초)"""
+    message = str(error)
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class ModelHealthService:
+    """
+    Redis 기반 모델 상태 관리
+
+    Hash 키 gemini:model_health:{model}
+    - open_until: 차단 해제 시각 (epoch seconds, 0이면 정상)
+    - opened: 연속 차단 횟수 (차단 시간 지수 증가용)
+    - last_error: 마지막 오류 메시지
+
+    String 키 gemini:model_health:{model}:failures - 현재 구간의 실패 수 (첫 실패 시 FAILURE_WINDOW_SECONDS TTL)
+    String 키 gemini:model_health:{model}:probe - half-open 시험 호출 잠금
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _key(model: str) -> str:
+        return f"{MODEL_HEALTH_KEY_PREFIX}{model}"
+
+    @staticmethod
+    def _failures_key(model: str) -> str:
+        return f"{MODEL_HEALTH_KEY_PREFIX}{model}:failures"
+
+    @staticmethod
+    def _probe_key(model: str) -> str:
+        return f"{MODEL_HEALTH_KEY_PREFIX}{model}:probe"
+
+    async def _claim_probe(self, model: str) -> bool:
+        """half-open 모델을 시험할 호출 하나 (Redis 장애 시에는 시험 허용)"""
+        try:
+            return bool(await self.redis.set(self._probe_key(model), 1, nx=True, ex=PROBE_LEASE_SECONDS))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ModelHealth] Redis unavailable, probing {model}: {e}")
+            return True
+
+    async def available_models(self, models: list[str], probe: bool = True) -> list[str]:
+        """
+        사용 가능한 모델만 원래 우선순위대로 반환 (Redis 1회 왕복, half-open 모델이 있으면 probe 잠금 시도 추가)
+        half-open 모델은 probe 잠금을 잡은 경우에만 포함 - 호출자가 결과를 record_success/record_failure로 기록
+        (probe=False: 호출하지 않고 상태만 보는 경우 - half-open 모델은 제외하고 잠금도 잡지 않음)
+        """
+        try:
+            pipe = self.redis.pipeline()
+            for model in models:
+                pipe.hget(self._key(model), "open_until")
+            open_untils = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ModelHealth] Redis unavailable, assuming all models healthy: {e}")
+            return list(models)
+
+        now = time.time()
+        available = []
+        for model, open_until in zip(models, open_untils):
+            open_until = float(open_until or 0)
+            if not open_until:
+                available.append(model)
+            elif probe and open_until <= now and await self._claim_probe(model):
+                logger.info(f"[ModelHealth] Probing {model} (half-open)")
+                available.append(model)
+        skipped = len(models) - len(available)
+        if skipped:
+            logger.info(f"[ModelHealth] Skipping {skipped} model(s) with open circuit")
+        return available
+
+    async def is_available(self, model: str) -> bool:
+        return bool(await self.available_models([model]))
+
+    async def record_success(self, model: str) -> None:
+        """성공 시 실패 기록 초기화 (half-open probe였으면 차단 해제)"""
+        try:
+            await self.redis.delete(self._key(model), self._failures_key(model), self._probe_key(model))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ModelHealth] Failed to record success for {model}: {e}")
+
+    async def record_failure(self, model: str, error: BaseException) -> None:
+        """실패 기록 - 분류에 따라 circuit open"""
+        kind = classify_error(error)
+        if kind is None:
+            return
+
+        key = self._key(model)
+        failures_key = self._failures_key(model)
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline()
+            pipe.sadd(KNOWN_MODELS_KEY, model)
+            # 구간의 첫 실패일 때만 TTL이 붙음 (INCR은 TTL을 유지)
+            pipe.set(failures_key, 0, nx=True, ex=FAILURE_WINDOW_SECONDS)
+            pipe.incr(failures_key)
+            pipe.hincrby(key, "opened", 0)
+            pipe.hset(key, "last_error", str(error)[:500])
+            pipe.expire(key, MAX_COOLDOWN_SECONDS + FAILURE_WINDOW_SECONDS)
+            pipe.hget(key, "open_until")
+            _, _, failures, opened, _, _, open_until = await pipe.execute()
+            # half-open probe 실패는 한 번으로 다시 차단
+            probing = 0 < float(open_until or 0) <= now
+
+            if kind == "quota":
+                cooldown = parse_retry_after(error) or QUOTA_COOLDOWN_SECONDS
+            elif failures >= FAILURE_THRESHOLD or probing:
+                cooldown = SERVER_ERROR_COOLDOWN_SECONDS * (2 ** opened)
+            else:
+                return
+
+            cooldown = min(cooldown, MAX_COOLDOWN_SECONDS)
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping={"open_until": now + cooldown})
+            pipe.hincrby(key, "opened", 1)
+            pipe.delete(failures_key, self._probe_key(model))
+            await pipe.execute()
+            logger.warning(f"[ModelHealth] Circuit opened for {model} ({kind}) for {cooldown:.0f}s")
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ModelHealth] Failed to record failure for {model}: {e}")
+
+    async def get_states(self, models: list[str] | None = None) -> dict[str, dict]:
+        """
+        모델별 현재 상태
+
+        Returns:
+            {model: {"state": "closed"|"open"|"half_open", "failures": int, "retry_in": float, "last_error": str|None}}
+        """
+        try:
+            known = await self.redis.smembers(KNOWN_MODELS_KEY)
+            names = list(dict.fromkeys(
+                (models or []) + sorted(m.decode() if isinstance(m, bytes) else m for m in known)
+            ))
+            pipe = self.redis.pipeline()
+            for model in names:
+                pipe.hgetall(self._key(model))
+                pipe.get(self._failures_key(model))
+            results = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ModelHealth] Redis unavailable: {e}")
+            return {}
+
+        now = time.time()
+        states = {}
+        for model, raw, failures in zip(names, results[::2], results[1::2]):
+            data = {
+                (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                for k, v in raw.items()
+            }
+            open_until = float(data.get("open_until") or 0)
+            if open_until > now:
+                state = "open"
+            elif open_until:
+                state = "half_open"
+            else:
+                state = "closed"
+            states[model] = {
+                "state": state,
+                "failures": int(failures or 0),
+                "retry_in": max(0.0, round(open_until - now, 1)),
+                "last_error": data.get("last_error"),
+            }
+        return states
+
+
+model_health = ModelHealthService(redis_client)
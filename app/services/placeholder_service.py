@@ -0,0 +1,184 @@
+"""
+로컬 placeholder 이미지
+- 이미지 생성 실패/미구현 시 외부 placeholder 서비스(placehold.co) 대신 Pillow로 직접 그린 PNG 사용
+- 같은 사양은 한 번만 그림: 메모리(이름 -> URL)와 디스크(static/placeholders/) 2단 캐시
+- 이름이 사양에서 결정되고 내용이 바뀌지 않으므로 /static 마운트에서 immutable 캐시 헤더로 서빙
+  (그리는 방식이 바뀌면 PLACEHOLDERS_PREFIX의 버전을 올림)
+- 텍스트 변형이 유한하도록 회차/이벤트 이름 같은 값은 이미지에 넣지 않음
+"""
+
+import io
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.services.storage import PLACEHOLDERS_PREFIX, STATIC_DIR, _write_local
+
+logger = logging.getLogger(__name__)
+
+EXPRESSION_SIZE = (512, 512)
+SCENE_SIZE = (1024, 768)
+
+EXPRESSION_COLORS = {
+    "neutral": "B0C4DE",
+    "happy": "FFD700",
+    "sad": "87CEEB",
+    "jealous": "FF6B6B",
+    "shy": "FFB6C1",
+    "excited": "FF69B4",
+    "disgusted": "556B2F",  # 어두운 올리브색 (불쾌함)
+}
+DEFAULT_COLOR = "FFB6C1"
+
+# 시작 시 미리 그려두는 캐릭터 설정 조합 (그 외 값은 처음 요청될 때 그림)
+GENDERS = ("female", "male")
+STYLES = ("cute", "cool", "tsundere", "sexy", "pure")
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    """placeholder 이미지 사양 (name이 파일명)"""
+    name: str
+    size: tuple[int, int]
+    background: str
+    foreground: str
+    text: str
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-") or "unknown"
+
+
+def expression_placeholder(expression: str, gender: str, style: str) -> Placeholder:
+    return Placeholder(
+        name=f"expression-{_slug(expression)}-{_slug(gender)}-{_slug(style)}",
+        size=EXPRESSION_SIZE,
+        background=EXPRESSION_COLORS.get(expression, DEFAULT_COLOR),
+        foreground="333333",
+        text=f"{expression} {gender} {style}",
+    )
+
+
+def scene_placeholder() -> Placeholder:
+    return Placeholder(name="scene", size=SCENE_SIZE, background="FFB6C1", foreground="333333", text="Scene")
+
+
+def event_placeholder() -> Placeholder:
+    return Placeholder(
+        name="special-event", size=SCENE_SIZE, background="FF69B4", foreground="FFFFFF", text="Special Event",
+    )
+
+
+def ending_placeholder(is_positive: bool) -> Placeholder:
+    if is_positive:
+        return Placeholder(
+            name="ending-happy", size=SCENE_SIZE, background="FF69B4", foreground="FFFFFF",
+            text="happy ending romantic",
+        )
+    return Placeholder(
+        name="ending-sad", size=SCENE_SIZE, background="808080", foreground="FFFFFF",
+        text="sad ending melancholic",
+    )
+
+
+def default_placeholders() -> list[Placeholder]:
+    """시작 시 미리 그릴 placeholder 목록"""
+    placeholders = [
+        expression_placeholder(expression, gender, style)
+        for expression in EXPRESSION_COLORS
+        for gender in GENDERS
+        for style in STYLES
+    ]
+    placeholders += [scene_placeholder(), event_placeholder(), ending_placeholder(True), ending_placeholder(False)]
+    return placeholders
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=size)
+    except (TypeError, OSError):
+        # FreeType 없는 Pillow 빌드는 크기 조절 불가한 비트맵 폰트만 있음
+        return ImageFont.load_default()
+
+
+def render_placeholder(placeholder: Placeholder) -> bytes:
+    """단색 배경 + 가운데 텍스트 PNG"""
+    width, height = placeholder.size
+    image = Image.new("RGB", placeholder.size, f"#{placeholder.background}")
+    draw = ImageDraw.Draw(image)
+    font = _font(max(12, min(width, height) // 14))
+    left, top, right, bottom = draw.textbbox((0, 0), placeholder.text, font=font)
+    position = ((width - (right - left)) / 2 - left, (height - (bottom - top)) / 2 - top)
+    draw.text(position, placeholder.text, fill=f"#{placeholder.foreground}", font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+class PlaceholderRenderer:
+    """placeholder를 그려서 static 디렉토리에 두고 URL 반환"""
+
+    def __init__(self, directory: Path = STATIC_DIR / PLACEHOLDERS_PREFIX,
+                 base_url: str = f"/static/{PLACEHOLDERS_PREFIX}"):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+        # 디스크에 있는 것이 확인된 이름 -> URL (이후 호출은 파일 IO 없음)
+        self._urls: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def url(self, placeholder: Placeholder) -> str:
+        """
+        placeholder URL (처음 보는 사양이면 그려서 저장)
+        시작 시 prerender로 기본 조합을 그려두므로 요청 경로에서 그리는 일은 드묾
+        """
+        url = self._urls.get(placeholder.name)
+        if url is not None:
+            return url
+
+        with self._lock:
+            url = self._urls.get(placeholder.name)
+            if url is not None:
+                return url
+            path = self.directory / f"{placeholder.name}.png"
+            if not path.is_file():
+                try:
+                    _write_local(path, render_placeholder(placeholder))
+                except OSError as e:
+                    # 디스크 문제여도 URL은 돌려줌 (이미지만 깨지고 게임 진행은 유지)
+                    logger.warning(f"[Placeholder] Failed to write {path}: {e}")
+                    return f"{self.base_url}/{placeholder.name}.png"
+            url = f"{self.base_url}/{placeholder.name}.png"
+            self._urls[placeholder.name] = url
+            return url
+
+    def prerender(self, placeholders: Iterable[Placeholder]) -> int:
+        """기본 placeholder를 미리 그림 (동기 - 시작 시 스레드에서 호출). 새로 그린 개수 반환"""
+        rendered = 0
+        for placeholder in placeholders:
+            exists = (self.directory / f"{placeholder.name}.png").is_file()
+            self.url(placeholder)
+            rendered += 0 if exists else 1
+        if rendered:
+            logger.info(f"[Placeholder] Rendered {rendered} placeholder images")
+        return rendered
+
+
+placeholder_renderer = PlaceholderRenderer()
+
+
+def placeholder_url(placeholder: Placeholder) -> str:
+    return placeholder_renderer.url(placeholder)
+
+
+# placeholder URL 접두사 (이전 버전 placeholder와 외부 placeholder 서비스 URL 포함)
+PLACEHOLDER_URL_PREFIXES = ("/static/placeholders/", "https://placehold.co/")
+
+
+def is_placeholder_url(url: str | None) -> bool:
+    """생성 실패로 placeholder가 들어간 URL인지"""
+    return bool(url) and url.startswith(PLACEHOLDER_URL_PREFIXES)
@@ -0,0 +1,259 @@
+"""
+Gemini 할당량 분배 (Redis 토큰 버킷)
+- 모델 × 할당량 차원(rpm, tpm, rpd)마다 하나의 토큰 버킷을 Redis에 두고 모든 워커가 공유
+- 우선순위 레인: 대화 > 특별 이벤트 > 다음 씬 미리 생성 > 표정 사전 생성 > 비디오 > 캐릭터 풀 채우기
+  낮은 우선순위는 버킷의 일정 비율(reserve)을 남겨두어야만 토큰을 가져갈 수 있음
+  → 캐릭터 생성이 몰려도 대화 생성 몫은 항상 남음
+- 토큰이 없으면 deadline까지 대기 후 RateLimitExceeded
+- Redis 장애 시에는 제한 없이 통과 (fail-open)
+"""
+
+import asyncio
+import logging
+import time
+from enum import IntEnum
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Gemini 호출 우선순위 (값이 작을수록 높음)"""
+    INTERACTIVE = 0  # 대화 생성 (generate_scene_content)
+    SPECIAL_EVENT = 1  # 특별 이벤트 씬/이미지
+    PREFETCH = 2  # 다음 씬 미리 생성 (scene_prefetch)
+    EXPRESSION = 3  # 표정 이미지 사전 생성
+    VIDEO = 4  # Veo 비디오
+    POOL = 5  # 캐릭터 풀 채우기 (character_pool, 한가할 때만)
+
+
+# 우선순위별로 버킷에 남겨둬야 하는 비율
+PRIORITY_RESERVE = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.SPECIAL_EVENT: 0.1,
+    Priority.PREFETCH: 0.2,
+    Priority.EXPRESSION: 0.3,
+    Priority.VIDEO: 0.5,
+    Priority.POOL: 0.6,
+}
+
+# 우선순위별 최대 대기 시간 (초) - 이 안에 토큰을 못 받으면 포기
+PRIORITY_MAX_WAIT = {
+    Priority.INTERACTIVE: 3.0,
+    Priority.SPECIAL_EVENT: 15.0,
+    Priority.PREFETCH: 5.0,  # 곧 쓰일지 모르는 추측 생성이므로 오래 기다리지 않음
+    Priority.EXPRESSION: 60.0,
+    Priority.VIDEO: 300.0,
+    Priority.POOL: 30.0,
+}
+
+# 할당량 차원별 기간 (초)
+QUOTA_PERIODS = {
+    "rpm": 60,  # requests per minute
+    "tpm": 60,  # tokens per minute
+    "rpd": 86400,  # requests per day
+}
+
+# 모델별 기본 할당량 (GEMINI_RATE_LIMITS 설정으로 덮어쓸 수 있음)
+DEFAULT_MODEL_QUOTAS = {
+    "gemini-2.0-flash": {"rpm": 1000, "tpm": 1_000_000},
+    "imagen-4.0-generate-001": {"rpm": 10, "rpd": 70},
+    "imagen-4.0-fast-generate-001": {"rpm": 10, "rpd": 70},
+    "imagen-3.0-generate-002": {"rpm": 20},
+    "imagen-3.0-fast-generate-001": {"rpm": 20},
+    "veo-3.1-generate-preview": {"rpm": 2, "rpd": 10},
+    "veo-3.0-generate-001": {"rpm": 2, "rpd": 10},
+    "veo-2.0-generate-001": {"rpm": 2, "rpd": 50},
+}
+
+# Redis 키
+RATE_LIMIT_KEY_PREFIX = "gemini:ratelimit:"
+
+# 같은 워커 안에서 더 높은 우선순위가 기다리는 동안 양보하는 간격 (초)
+YIELD_INTERVAL = 0.05
+
+# 버킷들을 한 번에 확인하고 모두 충분할 때만 차감
+# KEYS: 버킷 키 / ARGV: (capacity, rate, cost, reserve) × len(KEYS)
+# 반환: "0" (획득) 또는 토큰이 찰 때까지 기다려야 하는 시간(초)
+_TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local levels = {}
+local wait = 0
+for i = 1, #KEYS do
+    local base = (i - 1) * 4
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    local reserve = tonumber(ARGV[base + 4])
+    local data = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(data[1])
+    local ts = tonumber(data[2])
+    if tokens == nil then
+        tokens = capacity
+        ts = now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    local need = cost + reserve
+    if tokens < need then
+        local w = (need - tokens) / rate
+        if w > wait then
+            wait = w
+        end
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i = 1, #KEYS do
+    local base = (i - 1) * 4
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    redis.call('HSET', KEYS[i], 'tokens', tostring(levels[i] - cost), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 60)
+end
+return '0'
+"""
+
+
+class RateLimitExceeded(Exception):
+    """deadline 안에 토큰을 얻지 못함"""
+
+    def __init__(self, model: str, priority: Priority):
+        super().__init__(f"Rate limit for {model} not available in time (priority={priority.name})")
+        self.model = model
+        self.priority = priority
+
+
+def estimate_tokens(text: str) -> int:
+    """tpm 차감용 대략적인 토큰 수 (한글 기준 약 3자당 1토큰)"""
+    return len(text) // 3 + 1
+
+
+class GeminiRateLimiter:
+    """
+    Redis 토큰 버킷 기반 Gemini 호출 제한
+
+    Hash 키 gemini:ratelimit:{model}:{dimension}
+    - tokens: 남은 토큰
+    - ts: 마지막 갱신 시각 (Redis 서버 시간)
+    """
+
+    def __init__(self, redis: Redis, quotas: dict[str, dict[str, float]] | None = None):
+        self.redis = redis
+        self.quotas = {**DEFAULT_MODEL_QUOTAS, **(quotas or {})}
+        self._script = redis.register_script(_TOKEN_BUCKET_LUA)
+        # 워커 내 대기 중인 요청 수 (model -> priority -> count)
+        self._waiting: dict[str, dict[Priority, int]] = {}
+
+    def _bucket_args(self, model: str, priority: Priority, tokens: int) -> tuple[list[str], list]:
+        keys, args = [], []
+        reserve_ratio = PRIORITY_RESERVE[priority]
+        for dimension, limit in self.quotas.get(model, {}).items():
+            period = QUOTA_PERIODS[dimension]
+            cost = tokens if dimension == "tpm" else 1
+            keys.append(f"{RATE_LIMIT_KEY_PREFIX}{model}:{dimension}")
+            args.extend([limit, limit / period, cost, limit * reserve_ratio])
+        return keys, args
+
+    async def try_acquire(self, model: str, priority: Priority, tokens: int = 0) -> float:
+        """
+        토큰 획득 시도
+
+        Returns:
+            0 (획득) 또는 다시 시도할 때까지 기다려야 하는 시간(초)
+        """
+        keys, args = self._bucket_args(model, priority, tokens)
+        if not keys:
+            return 0.0
+        try:
+            result = await self._script(keys=keys, args=args)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[RateLimit] Redis unavailable, not limiting {model}: {e}")
+            return 0.0
+        return float(result.decode() if isinstance(result, bytes) else result)
+
+    async def headroom(self, model: str) -> float:
+        """
+        모델의 남은 할당량 비율 (0~1, 가장 부족한 차원 기준)
+        토큰을 차감하지 않고 조회만 하며, Redis 장애 시에는 알 수 없으므로 0
+        ts가 Redis 서버 시간이므로 경과 시간도 같은 파이프라인의 TIME으로 계산 (워커 시계 오차 무관)
+        """
+        dimensions = list(self.quotas.get(model, {}).items())
+        if not dimensions:
+            return 1.0
+        try:
+            pipe = self.redis.pipeline()
+            pipe.time()
+            for dimension, _ in dimensions:
+                pipe.hmget(f"{RATE_LIMIT_KEY_PREFIX}{model}:{dimension}", "tokens", "ts")
+            (seconds, microseconds), *levels = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[RateLimit] Redis unavailable, unknown headroom for {model}: {e}")
+            return 0.0
+
+        now = seconds + microseconds / 1_000_000
+        ratio = 1.0
+        for (dimension, limit), (tokens, ts) in zip(dimensions, levels):
+            if tokens is None:
+                continue  # 아직 사용 기록 없음 → 가득 참
+            refill = max(0.0, now - float(ts)) * limit / QUOTA_PERIODS[dimension]
+            ratio = min(ratio, min(limit, float(tokens) + refill) / limit)
+        return max(0.0, ratio)
+
+    def _higher_priority_waiting(self, model: str, priority: Priority) -> bool:
+        waiting = self._waiting.get(model, {})
+        return any(count > 0 for p, count in waiting.items() if p < priority)
+
+    async def acquire(
+        self,
+        model: str,
+        priority: Priority,
+        tokens: int = 0,
+        deadline: float | None = None,
+    ) -> None:
+        """
+        토큰을 얻을 때까지 대기 (우선순위가 높은 대기자가 먼저)
+
+        Args:
+            model: 호출할 모델
+            priority: 호출 우선순위
+            tokens: tpm 차감량 (estimate_tokens)
+            deadline: time.monotonic() 기준 포기 시각 (기본값: 우선순위별 최대 대기 시간)
+
+        Raises:
+            RateLimitExceeded: deadline 안에 토큰을 얻지 못한 경우
+        """
+        if model not in self.quotas:
+            return
+
+        if deadline is None:
+            deadline = time.monotonic() + PRIORITY_MAX_WAIT[priority]
+
+        waiting = self._waiting.setdefault(model, {})
+        waiting[priority] = waiting.get(priority, 0) + 1
+        try:
+            while True:
+                if self._higher_priority_waiting(model, priority):
+                    wait = YIELD_INTERVAL
+                else:
+                    wait = await self.try_acquire(model, priority, tokens)
+                    if wait <= 0:
+                        return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    raise RateLimitExceeded(model, priority)
+                await asyncio.sleep(wait)
+        finally:
+            waiting[priority] -= 1
+
+
+rate_limiter = GeminiRateLimiter(redis_client, settings.GEMINI_RATE_LIMITS)
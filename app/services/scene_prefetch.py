@@ -0,0 +1,219 @@
+"""
+다음 씬 미리 생성 (Speculative Prefetch)
+- 씬의 선택지 3개가 정해지면 다음 씬 프롬프트도 모두 정해지므로 선택 전에 미리 생성
+- 기본은 가장 유력한 선택지 하나, 할당량 여유가 있으면 3개 모두
+- 결과는 (session, scene_number, choice_index) 키로 짧게 보관 (워커 로컬 태스크 + Redis 사본)
+- 선택이 확정되면 나머지 분기는 취소/삭제
+- 생성 당시 호감도와 실제 호감도가 다르면(미니게임 등) 사용하지 않음
+"""
+
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.services import gemini_service
+from app.services.rate_limiter import Priority, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Redis 키
+PREFETCH_KEY_PREFIX = "scene_prefetch:"
+
+# 미리 생성한 씬 보관 시간 (초)
+PREFETCH_TTL_SECONDS = 300
+
+# 텍스트 모델 할당량이 이 비율 이상 남아 있으면 선택지 3개 모두 미리 생성
+PREFETCH_ALL_HEADROOM = 0.5
+
+# generate_scene에서 아직 진행 중인 미리 생성을 기다리는 최대 시간 (초)
+PREFETCH_WAIT_SECONDS = 10.0
+
+
+def rank_choices(choices: list[dict]) -> list[int]:
+    """
+    선택 가능성이 높은 순서로 선택지 인덱스 정렬
+    플레이어는 대부분 호감도가 오르는 선택지를 고르므로 delta 내림차순
+    """
+    return sorted(range(len(choices)), key=lambda i: choices[i].get("delta", 0), reverse=True)
+
+
+class ScenePrefetcher:
+    """
+    다음 씬 미리 생성 관리
+
+    Redis 키 scene_prefetch:{session_id}:{scene_number}:{choice_index}
+    - {"affection": 생성 당시 호감도, "content": generate_scene_content 결과}
+    """
+
+    def __init__(self, redis: Redis, ttl: int = PREFETCH_TTL_SECONDS):
+        self.redis = redis
+        self.ttl = ttl
+        # (session_id, scene_number, choice_index) -> 진행 중/완료된 태스크
+        self._tasks: dict[tuple[UUID, int, int], asyncio.Task] = {}
+
+    @staticmethod
+    def _key(session_id: UUID, scene_number: int, choice_index: int) -> str:
+        return f"{PREFETCH_KEY_PREFIX}{session_id}:{scene_number}:{choice_index}"
+
+    async def schedule(
+        self,
+        session_id: UUID,
+        scene_number: int,
+        character_setting,
+        user_mbti: str | None,
+        affection: int,
+        dialogue: str,
+        choices: list[dict],
+    ) -> list[int]:
+        """
+        방금 제시한 씬(scene_number)의 선택지별 다음 씬을 백그라운드에서 생성
+
+        Returns:
+            미리 생성을 시작한 선택지 인덱스
+        """
+        if not settings.SCENE_PREFETCH_ENABLED or not choices:
+            return []
+
+        ranked = rank_choices(choices)
+        if await rate_limiter.headroom(gemini_service.TEXT_MODEL) < PREFETCH_ALL_HEADROOM:
+            ranked = ranked[:1]
+
+        # 요청 DB 세션이 닫힌 뒤에도 쓸 수 있도록 캐릭터 정보 복사
+        setting = SimpleNamespace(
+            gender=character_setting.gender,
+            style=character_setting.style,
+            mbti=character_setting.mbti,
+        ) if character_setting else None
+
+        started = []
+        for index in ranked:
+            choice = choices[index]
+            next_affection = max(0, min(100, affection + choice.get("delta", 0)))
+            if next_affection <= 0 or next_affection >= 100:
+                continue  # 엔딩으로 끝나는 분기
+            key = (session_id, scene_number + 1, index)
+            if key in self._tasks:
+                continue
+            task = asyncio.create_task(self._prefetch(
+                key,
+                character_setting=setting,
+                user_mbti=user_mbti,
+                affection=next_affection,
+                previous_choice=choice.get("text", ""),
+                previous_dialogue=dialogue,
+            ))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t, key=key: self._expire_later(key, t))
+            started.append(index)
+
+        if started:
+            logger.info(f"[Prefetch] Session {session_id} scene {scene_number + 1}: choices {started}")
+        return started
+
+    def _expire_later(self, key: tuple, task: asyncio.Task) -> None:
+        def expire():
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+        asyncio.get_running_loop().call_later(self.ttl, expire)
+
+    async def _prefetch(
+        self,
+        key: tuple[UUID, int, int],
+        character_setting,
+        user_mbti: str | None,
+        affection: int,
+        previous_choice: str,
+        previous_dialogue: str,
+    ) -> dict | None:
+        session_id, scene_number, _ = key
+        try:
+            content = await gemini_service.request_scene_content(
+                character_setting=character_setting,
+                user_mbti=user_mbti,
+                scene_number=scene_number,
+                affection=affection,
+                previous_choice=previous_choice,
+                previous_dialogue=previous_dialogue,
+                priority=Priority.PREFETCH,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 실패한 분기는 버림 (실제 요청 때 다시 생성)
+            logger.info(f"[Prefetch] Skipped {key}: {e}")
+            return None
+
+        payload = {"affection": affection, "content": content}
+        try:
+            await self.redis.set(
+                self._key(*key), json.dumps(payload, ensure_ascii=False), ex=self.ttl
+            )
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Prefetch] Failed to store {key} in Redis: {e}")
+        return payload
+
+    async def resolve(self, session_id: UUID, scene_number: int, choice_index: int | None) -> None:
+        """
+        선택 확정 - 선택되지 않은 분기의 생성을 취소하고 결과 삭제
+        choice_index가 None이면 어떤 분기를 쓸지 알 수 없으므로 모두 버림
+        """
+        losing = [i for i in range(3) if i != choice_index]
+        for index in losing:
+            task = self._tasks.pop((session_id, scene_number, index), None)
+            if task and not task.done():
+                task.cancel()
+        try:
+            await self.redis.delete(*(self._key(session_id, scene_number, i) for i in losing))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Prefetch] Failed to drop losing branches: {e}")
+
+    async def take(
+        self,
+        session_id: UUID,
+        scene_number: int,
+        choice_index: int,
+        affection: int,
+    ) -> dict | None:
+        """
+        미리 생성된 씬 콘텐츠 꺼내기 (한 번만 사용 가능)
+
+        Returns:
+            generate_scene_content 형식의 dict, 없거나 호감도가 달라졌으면 None
+        """
+        payload = None
+        task = self._tasks.pop((session_id, scene_number, choice_index), None)
+        if task:
+            # 이 워커에서 생성 중/완료 → 결과를 기다림 (요청이 끊겨도 생성은 계속)
+            try:
+                payload = await asyncio.wait_for(asyncio.shield(task), timeout=PREFETCH_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.info(f"[Prefetch] Still generating {session_id}:{scene_number}, not waiting")
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+
+        try:
+            # 다른 워커가 생성했을 수도 있으므로 Redis도 확인 (사용한 결과는 삭제)
+            raw = await self.redis.getdel(self._key(session_id, scene_number, choice_index))
+            if payload is None and raw:
+                payload = json.loads(raw)
+        except (RedisError, OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[Prefetch] Failed to read prefetched scene: {e}")
+
+        if not payload:
+            return None
+        if payload["affection"] != affection:
+            logger.info(f"[Prefetch] Affection changed ({payload['affection']} -> {affection}), discarding")
+            return None
+        logger.info(f"[Prefetch] Hit {session_id}:{scene_number}:{choice_index}")
+        return payload["content"]
+
+
+scene_prefetcher = ScenePrefetcher(redis_client)
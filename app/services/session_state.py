@@ -0,0 +1,195 @@
+"""
+게임 세션 hot state (Redis)
+- 매 턴 바뀌는 세션 상태(호감도, 현재 씬, 상태, 캐릭터 설정 id 등)를 Redis에 두고 턴 요청은 Redis에서 읽음
+  → 씬 생성/선택/이벤트 체크/미니게임 결과마다 하던 GameSession 조회를 생략
+- 쓰기는 write-through: 요청의 트랜잭션 안에서 Postgres를 갱신하고 커밋 후 Redis 복사본 교체
+  (Postgres가 원본이므로 Redis가 유실되어도 커밋된 턴은 잃지 않음)
+- 커밋 전에 복사본을 먼저 지우고 커밋 후 다시 씀: 커밋이 실패하거나 Redis 쓰기가 실패해도
+  다음 읽기는 Postgres에서 다시 채우므로 커밋되지 않은 값이 보이지 않음
+- 세션 상태를 ORM 객체로 직접 바꾸는 다른 경로는 commit()에 state 없이 호출해서 복사본만 지움
+- bulk UPDATE는 flush를 거치지 않으므로 session/user 키를 직접 기록 (읽기 복제본 read-your-writes)
+- Redis 장애 시 Postgres에서 읽음 (fail-open)
+"""
+
+import logging
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.recent_writes import record_written
+from app.core.redis import redis_client
+from app.models.game import CharacterSetting, GameSession
+from app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SessionState:
+    """턴 진행에 필요한 게임 세션 상태 (GameSession 컬럼 + 캐릭터 설정 id)"""
+    id: UUID
+    user_id: UUID
+    affection: int
+    current_scene: int
+    status: str
+    is_stolen: bool = False
+    stolen_from_session_id: Optional[UUID] = None
+    setting_id: Optional[UUID] = None
+
+    def to_dict(self) -> dict:
+        return {key: str(value) if isinstance(value, UUID) else value for key, value in asdict(self).items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionState":
+        def uuid_or_none(value):
+            return UUID(value) if value else None
+
+        return cls(
+            id=UUID(data["id"]),
+            user_id=UUID(data["user_id"]),
+            affection=int(data["affection"]),
+            current_scene=int(data["current_scene"]),
+            status=data["status"],
+            is_stolen=bool(data.get("is_stolen")),
+            stolen_from_session_id=uuid_or_none(data.get("stolen_from_session_id")),
+            setting_id=uuid_or_none(data.get("setting_id")),
+        )
+
+
+def _record_written(db: AsyncSession, state: SessionState) -> None:
+    # GET /games?user_id= 같은 사용자 단위 읽기도 커밋 직후에는 primary에서 읽도록
+    record_written(db, {f"session:{state.id}", f"user:{state.user_id}"})
+
+
+class SessionStateService:
+    """세션 hot state 조회/갱신"""
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+
+    async def get(self, db: AsyncSession, session_id: UUID) -> Optional[SessionState]:
+        """
+        세션 상태 (Redis 복사본, 없으면 Postgres에서 한 번에 읽어 채움)
+
+        Returns:
+            SessionState 또는 None (세션 없음)
+        """
+        try:
+            cached = await self.cache.get_session(str(session_id))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[SessionState] Redis unavailable, reading from DB: {e}")
+            cached = None
+        if isinstance(cached, dict):
+            try:
+                return SessionState.from_dict(cached)
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"[SessionState] Discarding malformed cached state for {session_id}")
+
+        state = await self._load(db, session_id)
+        if state is not None:
+            # 그 사이 쓰기 요청이 새 값을 넣었으면 덮어쓰지 않음
+            await self._publish(state, only_if_absent=True)
+        return state
+
+    async def _load(self, db: AsyncSession, session_id: UUID) -> Optional[SessionState]:
+        result = await db.execute(
+            select(
+                GameSession.id,
+                GameSession.user_id,
+                GameSession.affection,
+                GameSession.current_scene,
+                GameSession.status,
+                GameSession.is_stolen,
+                GameSession.stolen_from_session_id,
+                CharacterSetting.id.label("setting_id"),
+            )
+            .outerjoin(CharacterSetting, CharacterSetting.session_id == GameSession.id)
+            .where(GameSession.id == session_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return SessionState(
+            id=row.id,
+            user_id=row.user_id,
+            affection=row.affection,
+            current_scene=row.current_scene,
+            status=row.status,
+            is_stolen=bool(row.is_stolen),
+            stolen_from_session_id=row.stolen_from_session_id,
+            setting_id=row.setting_id,
+        )
+
+    async def save(self, db: AsyncSession, state: SessionState, **changes) -> SessionState:
+        """
+        상태 변경을 Postgres에 반영 (호출자의 트랜잭션 안에서 - 이어서 commit() 호출)
+
+        Returns:
+            변경된 상태
+        """
+        await db.execute(update(GameSession).where(GameSession.id == state.id).values(**changes))
+        return replace(state, **changes)
+
+    async def advance_turn(self, db: AsyncSession, state: SessionState, affection_delta: int) -> Optional[SessionState]:
+        """
+        선택지 한 턴 적용: UPDATE ... RETURNING 한 번 (호감도 0~100 제한, 엔딩 판정까지 SQL에서)
+        state의 턴에서만 적용 - 같은 턴에 동시에 들어온 두 번째 클릭은 반영되지 않음 (행 잠금 대기 없이 0행)
+        호출자의 트랜잭션 안에서 실행 (이어서 commit() 호출)
+
+        Returns:
+            적용 후 상태 또는 None (이미 다음 턴으로 넘어갔거나 세션 없음)
+        """
+        new_affection = func.greatest(0, func.least(100, GameSession.affection + affection_delta))
+        result = await db.execute(
+            update(GameSession)
+            .where(GameSession.id == state.id, GameSession.current_scene == state.current_scene)
+            .values(
+                affection=new_affection,
+                current_scene=GameSession.current_scene + 1,
+                status=case(
+                    (new_affection <= 0, "sad_ending"),
+                    (new_affection >= 100, "happy_ending"),
+                    else_=GameSession.status,
+                ),
+            )
+            .returning(GameSession.affection, GameSession.current_scene, GameSession.status)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        _record_written(db, state)
+        return replace(state, affection=row.affection, current_scene=row.current_scene, status=row.status)
+
+    async def commit(self, db: AsyncSession, session_id: UUID, state: Optional[SessionState] = None) -> None:
+        """
+        커밋 + Redis 복사본 교체 (state가 없으면 복사본을 지워 다음 읽기에서 다시 채움)
+        """
+        if state is not None:
+            _record_written(db, state)
+        await self.invalidate(session_id)
+        await db.commit()
+        if state is not None:
+            await self._publish(state)
+        else:
+            # 커밋 전 지운 뒤 다른 요청이 커밋 전 값으로 다시 채웠을 수 있음
+            await self.invalidate(session_id)
+
+    async def invalidate(self, session_id: UUID) -> None:
+        try:
+            await self.cache.invalidate_session(str(session_id))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[SessionState] Failed to invalidate {session_id}: {e}")
+
+    async def _publish(self, state: SessionState, only_if_absent: bool = False) -> None:
+        try:
+            await self.cache.cache_session(str(state.id), state.to_dict(), only_if_absent=only_if_absent)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[SessionState] Failed to cache {state.id}: {e}")
+
+
+session_state = SessionStateService(CacheService(redis_client))
@@ -0,0 +1,284 @@
+"""
+생성 미디어 저장소 백엔드
+- LocalStorage: static/ 디렉토리에 저장하고 /static 마운트로 서빙 (단일 노드/개발용)
+- S3Storage: S3 호환 오브젝트 스토리지 (AWS S3, MinIO) - 여러 노드가 같은 미디어를 공유
+- 키는 "images/characters/{sha256}.png" 처럼 백엔드와 무관한 상대 경로, DB에는 공개 URL 저장
+- 생성 미디어는 덮어쓰지 않으므로 (콘텐츠 해시/uuid 이름) 오래가는 immutable 캐시 헤더 사용
+- 버킷이 비공개면 응답 직전에 presigned URL로 바꿔서 내려줌 (STORAGE_PRESIGNED_URLS)
+"""
+
+import asyncio
+import io
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Union
+
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+
+STATIC_DIR = Path(__file__).parent.parent.parent / "static"
+
+# 생성 미디어 키 접두사 (이 아래 파일은 한 번 쓰면 바뀌지 않음)
+IMAGES_PREFIX = "images/characters"
+VIDEOS_PREFIX = "videos/characters"
+# 로컬에서 그린 placeholder (노드마다 직접 그리므로 백엔드와 무관하게 항상 /static에서 서빙)
+PLACEHOLDERS_PREFIX = "placeholders/v1"
+IMMUTABLE_PREFIXES = (IMAGES_PREFIX, VIDEOS_PREFIX, PLACEHOLDERS_PREFIX)
+
+Data = Union[bytes, BinaryIO]
+
+
+class StorageError(OSError):
+    """저장소 백엔드 오류 (호출자는 파일 IO 오류와 같이 OSError로 처리)"""
+
+
+def immutable_cache_control() -> str:
+    return f"public, max-age={settings.STORAGE_CACHE_MAX_AGE}, immutable"
+
+
+class StorageBackend(ABC):
+    """미디어 저장소 인터페이스"""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """키의 공개 URL (DB에 저장되는 값)"""
+
+    @abstractmethod
+    def key_for_url(self, url: str) -> Optional[str]:
+        """이 저장소의 URL이면 키, 아니면 None (placeholder/외부 URL)"""
+
+    @abstractmethod
+    async def put(self, key: str, data: Data, content_type: str) -> str:
+        """
+        저장 후 URL 반환 (data가 파일 객체면 통째로 메모리에 올리지 않고 스트리밍)
+        """
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]) -> None:
+        ...
+
+    async def put_if_absent(self, key: str, data: Data, content_type: str) -> tuple[str, bool]:
+        """
+        콘텐츠 주소 키용: 이미 있으면 쓰지 않음
+
+        Returns:
+            (URL, 새로 썼는지)
+        """
+        if await self.exists(key):
+            return self.url(key), False
+        return await self.put(key, data, content_type), True
+
+    def is_available(self, url: str) -> bool:
+        """캐시된 URL을 내줘도 되는지 (로컬은 파일 존재 확인, 원격은 확인 비용 때문에 신뢰)"""
+        return True
+
+    def sign_url(self, url: Optional[str]) -> Optional[str]:
+        """응답용 URL (presigned URL 사용 시 서명, 아니면 그대로)"""
+        return url
+
+    def sign_variants(self, variants: Optional[dict]) -> Optional[dict]:
+        """image_variants의 모든 URL 서명"""
+        if not variants:
+            return variants
+        return {
+            fmt: {size: self.sign_url(url) for size, url in by_size.items()}
+            for fmt, by_size in variants.items()
+        }
+
+
+def _write_local(path: Path, data: Data) -> None:
+    """임시 파일에 쓴 뒤 rename (반쯤 쓰인 파일이 서빙되지 않도록)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def _delete_local(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+class LocalStorage(StorageBackend):
+    """static/ 디렉토리 저장 (파일 IO는 스레드에서)"""
+
+    def __init__(self, root: Path = STATIC_DIR, base_url: str = "/static"):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        prefix = f"{self.base_url}/"
+        if not url or not url.startswith(prefix):
+            return None
+        return url[len(prefix):]
+
+    async def put(self, key: str, data: Data, content_type: str) -> str:
+        await asyncio.to_thread(_write_local, self._path(key), data)
+        return self.url(key)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        await asyncio.to_thread(_delete_local, [self._path(key) for key in keys])
+
+    def is_available(self, url: str) -> bool:
+        key = self.key_for_url(url)
+        return key is None or self._path(key).is_file()
+
+
+class S3Storage(StorageBackend):
+    """
+    S3 호환 오브젝트 스토리지 (boto3, 호출은 스레드에서)
+    로컬 MinIO: S3_ENDPOINT_URL=http://localhost:9000
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_base_url: Optional[str] = None,
+        presign: bool = False,
+        presign_expires: int = 3600,
+        client=None,
+    ):
+        self.bucket = bucket
+        self.presign = presign
+        self.presign_expires = presign_expires
+        if public_base_url:
+            self.base_url = public_base_url.rstrip("/")
+        elif endpoint_url:
+            # path-style (MinIO)
+            self.base_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.base_url = f"https://{bucket}.s3.{region or 'us-east-1'}.amazonaws.com"
+
+        if client is None:
+            # boto3는 S3 백엔드를 쓸 때만 필요
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+            )
+        self.client = client
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        prefix = f"{self.base_url}/"
+        if not url or not url.startswith(prefix):
+            return None
+        return url[len(prefix):].split("?", 1)[0]
+
+    async def _call(self, method, **kwargs):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            return await asyncio.to_thread(method, **kwargs)
+        except (BotoCoreError, ClientError) as e:
+            raise StorageError(str(e)) from e
+
+    async def put(self, key: str, data: Data, content_type: str) -> str:
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        # upload_fileobj는 큰 파일을 멀티파트로 나눠 스트리밍 업로드
+        await self._call(
+            self.client.upload_fileobj,
+            Fileobj=fileobj,
+            Bucket=self.bucket,
+            Key=key,
+            ExtraArgs={"ContentType": content_type, "CacheControl": immutable_cache_control()},
+        )
+        return self.url(key)
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self._call(self.client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except StorageError as e:
+            response = getattr(e.__cause__, "response", None) or {}
+            if response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        # delete_objects는 요청당 최대 1000개
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            await self._call(
+                self.client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+
+    def sign_url(self, url: Optional[str]) -> Optional[str]:
+        if not self.presign or not url:
+            return url
+        key = self.key_for_url(url)
+        if key is None:
+            return url
+        # 서명은 로컬 계산이라 네트워크 호출 없음
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.presign_expires,
+        )
+
+
+class MediaStaticFiles(StaticFiles):
+    """/static 마운트: 생성 미디어(덮어쓰지 않는 파일)에 immutable 캐시 헤더 추가"""
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        path = Path(self.get_path(scope)).as_posix()
+        if path.startswith(IMMUTABLE_PREFIXES):
+            response.headers["Cache-Control"] = immutable_cache_control()
+        return response
+
+
+def create_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_base_url=settings.S3_PUBLIC_BASE_URL,
+            presign=settings.STORAGE_PRESIGNED_URLS,
+            presign_expires=settings.STORAGE_PRESIGN_EXPIRES,
+        )
+    return LocalStorage()
+
+
+storage = create_storage()
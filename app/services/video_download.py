@@ -0,0 +1,143 @@
+"""
+Veo 결과 비디오 스트리밍 다운로드
+- 응답 전체를 메모리에 올리지 않고 청크 단위로 임시 파일에 씀 (다운로드당 메모리 = 청크 크기)
+- 파일 쓰기/해시 계산은 스레드에서 (이벤트 루프를 막지 않음)
+- 크기 제한: Content-Length로 먼저 거르고, 받는 중에도 누적 크기로 확인
+- 검증: Content-Length와 받은 크기 비교, 응답에 x-goog-hash(md5)가 있으면 비교
+- sha256은 저장 키(콘텐츠 주소)로 사용
+- 리다이렉트는 직접 따라감: API 키는 Gemini API 호스트로만 보내고 리다이렉트된 저장소 호스트로는 넘기지 않음
+  (httpx는 다른 호스트로 리다이렉트될 때 Authorization만 지우고 x-goog-api-key는 그대로 보냄)
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# API 키를 보내는 호스트 (Veo 결과 URI)
+GEMINI_API_HOST = "generativelanguage.googleapis.com"
+
+MAX_REDIRECTS = 5
+
+
+class VideoDownloadError(Exception):
+    """다운로드 실패 (크기 초과, 잘린 응답, 체크섬 불일치)"""
+
+
+@dataclass
+class DownloadedVideo:
+    path: Path
+    size: int
+    sha256: str
+
+    def unlink(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _expected_md5(headers: httpx.Headers) -> Optional[str]:
+    """x-goog-hash: crc32c=...,md5=... 에서 md5 (base64)"""
+    for value in headers.get_list("x-goog-hash"):
+        for part in value.split(","):
+            name, _, digest = part.strip().partition("=")
+            if name == "md5" and digest:
+                return digest
+    return None
+
+
+def _auth_headers(url: httpx.URL) -> dict:
+    if settings.GEMINI_API_KEY and url.scheme == "https" and url.host == GEMINI_API_HOST:
+        return {"x-goog-api-key": settings.GEMINI_API_KEY}
+    return {}
+
+
+@asynccontextmanager
+async def _stream(client: httpx.AsyncClient, url: str) -> AsyncIterator[httpx.Response]:
+    """GET 스트리밍 (리다이렉트마다 헤더를 다시 정함)"""
+    target = httpx.URL(url)
+    for _ in range(MAX_REDIRECTS + 1):
+        request = client.build_request("GET", target, headers=_auth_headers(target))
+        response = await client.send(request, stream=True, follow_redirects=False)
+        if not response.has_redirect_location:
+            break
+        await response.aclose()
+        target = target.join(response.headers["location"])
+    else:
+        raise VideoDownloadError(f"Too many redirects downloading video: {url}")
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+def _write_chunk(file: BinaryIO, digests: tuple, chunk: bytes) -> None:
+    file.write(chunk)
+    for digest in digests:
+        digest.update(chunk)
+
+
+async def download_video(
+    url: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> DownloadedVideo:
+    """
+    URL의 비디오를 임시 파일로 스트리밍 다운로드
+
+    호출자가 사용 후 unlink()로 임시 파일을 지워야 함
+
+    Raises:
+        VideoDownloadError: 크기 초과/잘린 응답/체크섬 불일치
+        httpx.HTTPError: 네트워크/HTTP 오류
+    """
+    max_bytes = max_bytes or settings.VIDEO_DOWNLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.VIDEO_DOWNLOAD_CHUNK_SIZE
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=settings.VIDEO_DOWNLOAD_TIMEOUT)
+
+    fd, name = tempfile.mkstemp(prefix="veo-", suffix=".mp4")
+    path = Path(name)
+    try:
+        async with _stream(client, url) as response:
+            response.raise_for_status()
+            content_length = response.headers.get("content-length")
+            expected_size = int(content_length) if content_length and content_length.isdigit() else None
+            if expected_size is not None and expected_size > max_bytes:
+                raise VideoDownloadError(f"Video too large: {expected_size} > {max_bytes} bytes")
+            expected_md5 = _expected_md5(response.headers)
+
+            sha256 = hashlib.sha256()
+            md5 = hashlib.md5(usedforsecurity=False)
+            size = 0
+            with os.fdopen(fd, "wb") as file:
+                fd = None
+                async for chunk in response.aiter_bytes(chunk_size):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise VideoDownloadError(f"Video exceeded {max_bytes} bytes while downloading")
+                    await asyncio.to_thread(_write_chunk, file, (sha256, md5), chunk)
+
+        if expected_size is not None and size != expected_size:
+            raise VideoDownloadError(f"Truncated video: got {size} of {expected_size} bytes")
+        if expected_md5 and base64.b64encode(md5.digest()).decode() != expected_md5:
+            raise VideoDownloadError("Video checksum mismatch (md5)")
+        return DownloadedVideo(path=path, size=size, sha256=sha256.hexdigest())
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        if owns_client:
+            await client.aclose()
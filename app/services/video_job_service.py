@@ -0,0 +1,276 @@
+"""
+Veo 비디오 생성 작업 관리
+- 비디오 생성 요청은 VideoJob 행으로 기록되고 API는 job id를 바로 반환
+- 워커마다 하나의 asyncio 태스크(VideoJobPoller)가 모든 작업을 백오프로 폴링
+- 작업 상태는 DB에 저장되므로 서버 재시작 후에도 operation 이름으로 이어서 폴링
+- 완료 시 CharacterExpression.video_url 채움
+- 같은 프롬프트의 비디오가 생성 캐시에 있으면 Veo 호출 없이 바로 완료
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session_maker
+from app.models.game import CharacterExpression, VideoJob
+from app.services import gemini_service
+from app.services.expression_urls import expression_urls
+from app.services.generation_cache import generation_cache
+
+logger = logging.getLogger(__name__)
+
+# 폴러 루프 주기 (초) - 새 작업이 등록되면 바로 깨어남
+POLL_TICK_SECONDS = 2.0
+
+# 작업별 폴링 백오프 (초)
+POLL_BACKOFF_MIN_SECONDS = 10.0
+POLL_BACKOFF_MAX_SECONDS = 120.0
+POLL_BACKOFF_FACTOR = 1.5
+
+# 한 번에 가져오는 작업 수
+POLL_BATCH_SIZE = 20
+
+# 다른 워커가 같은 작업을 동시에 폴링하지 않도록 잡아두는 시간 (초)
+POLL_LEASE_SECONDS = 60
+
+# 이 시간이 지나도 끝나지 않은 작업은 실패 처리
+JOB_TIMEOUT = timedelta(minutes=30)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def next_poll_delay(attempts: int) -> float:
+    """폴링 횟수에 따른 다음 폴링까지의 대기 시간 (지수 백오프)"""
+    delay = POLL_BACKOFF_MIN_SECONDS * (POLL_BACKOFF_FACTOR ** attempts)
+    return min(delay, POLL_BACKOFF_MAX_SECONDS)
+
+
+async def create_video_jobs(
+    db: AsyncSession,
+    expressions: list[CharacterExpression],
+    prompts: dict[str, str],
+) -> list[VideoJob]:
+    """
+    표정별 비디오 생성 작업 등록 (commit은 호출자가 수행)
+
+    Args:
+        expressions: 비디오를 만들 표정 행
+        prompts: expression_type -> Veo 프롬프트
+    """
+    jobs = []
+    for expression in expressions:
+        job = VideoJob(
+            expression_id=expression.id,
+            status="queued",
+            prompt=prompts[expression.expression_type],
+            model_name=gemini_service.VIDEO_MODELS[0],
+            attempts=0,
+            next_poll_at=datetime.utcnow(),
+        )
+        db.add(job)
+        jobs.append(job)
+    return jobs
+
+
+class VideoJobPoller:
+    """
+    모든 Veo 작업을 하나의 태스크에서 폴링
+
+    - queued: Veo 생성 요청 후 operation 이름 저장 → running
+    - running: operation 조회, 미완료면 백오프 후 재조회
+    - 완료: 비디오 저장 후 CharacterExpression.video_url 갱신 → succeeded
+    - 모델 실패 시 다음 Veo 모델로 재시도, 모두 실패하면 failed
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        tick: float = POLL_TICK_SECONDS,
+    ):
+        self.session_maker = session_maker
+        self.tick = tick
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """새 작업 등록 시 폴러를 즉시 깨움"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[VideoJob] Poll cycle failed")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.tick)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def poll_once(self) -> int:
+        """
+        폴링 시점이 된 작업을 한 번씩 진행
+        - 리스를 잡는 트랜잭션은 바로 커밋하고 연결을 돌려줌
+        - Veo 폴링/비디오 다운로드·업로드는 트랜잭션 없이 (수 분 걸려도 풀 연결을 잡지 않음)
+        - 결과는 작업마다 짧은 트랜잭션으로 반영 (리스가 남아 있어 다른 워커가 가져가지 않음)
+
+        Returns:
+            처리한 작업 수
+        """
+        async with self.session_maker() as db:
+            jobs = await self._claim_due_jobs(db)
+        if not jobs:
+            return 0
+
+        # 네트워크 호출은 동시에 (job 속성만 변경)
+        await asyncio.gather(*[self._advance(job) for job in jobs])
+
+        for job in jobs:
+            try:
+                await self._apply(job)
+            except (SQLAlchemyError, OSError) as e:
+                # 리스가 끝나면 다시 폴링됨
+                logger.warning(f"[VideoJob] Failed to save {job.id}: {e}")
+        return len(jobs)
+
+    async def _claim_due_jobs(self, db: AsyncSession) -> list[VideoJob]:
+        """폴링할 작업을 잡고(lease) 다른 워커가 건너뛰도록 next_poll_at을 미룸"""
+        now = datetime.utcnow()
+        result = await db.execute(
+            select(VideoJob)
+            .where(
+                VideoJob.status.in_(ACTIVE_STATUSES),
+                VideoJob.next_poll_at <= now,
+            )
+            .order_by(VideoJob.next_poll_at)
+            .limit(POLL_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(result.scalars().all())
+        for job in jobs:
+            job.next_poll_at = now + timedelta(seconds=POLL_LEASE_SECONDS)
+        await db.commit()
+        return jobs
+
+    async def _apply(self, job: VideoJob) -> None:
+        """_advance 결과를 작업 하나씩 반영 (완료면 표정 video_url도 같은 트랜잭션에서)"""
+        setting_id = None
+        async with self.session_maker() as db:
+            await db.execute(
+                update(VideoJob)
+                .where(VideoJob.id == job.id)
+                .values(
+                    status=job.status,
+                    model_name=job.model_name,
+                    operation_name=job.operation_name,
+                    attempts=job.attempts,
+                    next_poll_at=job.next_poll_at,
+                    video_url=job.video_url,
+                    error=job.error,
+                )
+            )
+            if job.status == "succeeded":
+                expression = await db.get(CharacterExpression, job.expression_id)
+                if expression:
+                    expression.video_url = job.video_url
+                    setting_id = expression.setting_id
+            await db.commit()
+        if setting_id:
+            await expression_urls.invalidate(setting_id)
+
+    async def _advance(self, job: VideoJob) -> None:
+        """작업 하나를 한 단계 진행 (DB I/O 없음, job 속성만 변경)"""
+        now = datetime.utcnow()
+        if job.created_at and now - job.created_at > JOB_TIMEOUT:
+            self._fail(job, "Timed out waiting for video generation")
+            return
+
+        try:
+            if job.status == "queued":
+                # 같은 프롬프트로 이미 만든 비디오가 있으면 Veo 호출 없이 완료
+                cached = await generation_cache.get("video", job.prompt)
+                if cached:
+                    job.status = "succeeded"
+                    job.video_url = cached["url"]
+                    job.error = None
+                    logger.info(f"[VideoJob] {job.id} served from cache: {job.video_url}")
+                    return
+
+                operation = await gemini_service.start_video_generation(job.model_name, job.prompt)
+                job.operation_name = operation.name
+                job.status = "running"
+                job.attempts = 0
+                self._schedule(job, now)
+                logger.info(f"[VideoJob] {job.id} started on {job.model_name}: {job.operation_name}")
+                return
+
+            operation = await gemini_service.get_video_operation(job.operation_name)
+            if not operation.done:
+                job.attempts += 1
+                self._schedule(job, now)
+                return
+
+            if operation.response and operation.response.generated_videos:
+                video_url = await gemini_service.save_generated_video(
+                    operation.response.generated_videos[0]
+                )
+                if video_url:
+                    job.status = "succeeded"
+                    job.video_url = video_url
+                    job.error = None
+                    await generation_cache.put("video", job.prompt, {"url": video_url, "model": job.model_name})
+                    logger.info(f"[VideoJob] {job.id} succeeded: {video_url}")
+                    return
+
+            self._try_next_model(job, now, str(operation.error or "No video data in response"))
+
+        except Exception as e:
+            logger.warning(f"[VideoJob] {job.id} failed on {job.model_name}: {e}")
+            self._try_next_model(job, now, str(e))
+
+    def _schedule(self, job: VideoJob, now: datetime) -> None:
+        job.next_poll_at = now + timedelta(seconds=next_poll_delay(job.attempts))
+
+    def _try_next_model(self, job: VideoJob, now: datetime, error: str) -> None:
+        """현재 모델 실패 → 다음 Veo 모델로 다시 queued, 남은 모델이 없으면 failed"""
+        models = gemini_service.VIDEO_MODELS
+        index = models.index(job.model_name) if job.model_name in models else len(models) - 1
+        if index + 1 >= len(models):
+            self._fail(job, error)
+            return
+
+        job.model_name = models[index + 1]
+        job.status = "queued"
+        job.operation_name = None
+        job.attempts = 0
+        job.error = error
+        job.next_poll_at = now
+
+    def _fail(self, job: VideoJob, error: str) -> None:
+        job.status = "failed"
+        job.error = error
+        logger.warning(f"[VideoJob] {job.id} failed: {error}")
+
+
+video_job_poller = VideoJobPoller()
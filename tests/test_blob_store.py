@@ -0,0 +1,139 @@
+"""
+Tests for the content-addressed media store
+행이 URL을 복사/삭제할 때 참조 수를 증감하고, 참조가 없어진 파일만 GC가 지우는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.blob_store import BlobStore, _group_by_count
+from app.services.generation_cache import GenerationCache
+from app.services.storage import LocalStorage
+
+
+def _session_maker(session: AsyncMock) -> MagicMock:
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    return session_maker
+
+
+def _result(rows: list[tuple]) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+class TestReferenceCounting:
+
+    def test_duplicate_urls_count_multiple_references(self):
+        groups = _group_by_count(["/static/a.png", "/static/a.png", "/static/b.png", None])
+
+        assert groups == {2: ["/static/a.png"], 1: ["/static/b.png"]}
+
+    @pytest.mark.asyncio
+    async def test_acquire_runs_in_callers_transaction(self):
+        db = AsyncMock()
+
+        await BlobStore().acquire(db, ["/static/a.png"] * 7)
+
+        db.execute.assert_awaited_once()
+        db.commit.assert_not_awaited()
+        assert "ref_count + " in str(db.execute.await_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_acquire(self):
+        db = AsyncMock()
+
+        await BlobStore().acquire(db, [None])
+
+        db.execute.assert_not_awaited()
+
+
+class TestGarbageCollection:
+
+    @pytest.mark.asyncio
+    async def test_deletes_unreferenced_files_and_variants(self, tmp_path):
+        images = tmp_path / "static" / "images"
+        images.mkdir(parents=True)
+        for name in ("abc.png", "abc_256.webp", "keep.png"):
+            (images / name).write_bytes(b"x")
+
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result([("/static/images/abc.png",)]),
+            _result([("/static/images/abc.png", {"webp": {"256": "/static/images/abc_256.webp"}})]),
+            _result([]),
+        ]
+        store = BlobStore(
+            session_maker=_session_maker(session),
+            backend=LocalStorage(root=tmp_path / "static"),
+            cache=GenerationCache(AsyncMock()),
+        )
+
+        collected = await store.collect_garbage()
+
+        assert collected == 1
+        assert not (images / "abc.png").exists()
+        assert not (images / "abc_256.webp").exists()
+        assert (images / "keep.png").exists()
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_generation_cache_stops_serving_collected_urls(self, tmp_path):
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _result([("https://cdn.example.com/images/abc.png",)]),
+            _result([]),
+            _result([("expression_image", "h1"), ("event_image", "h2")]),
+        ]
+        cache = GenerationCache(AsyncMock())
+        store = BlobStore(
+            session_maker=_session_maker(session),
+            backend=LocalStorage(root=tmp_path / "static"),
+            cache=cache,
+        )
+
+        assert await store.collect_garbage() == 1
+
+        sql = str(session.execute.await_args_list[2].args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("DELETE FROM ai_generated_content")
+        assert "content_data ->> " in sql
+        assert [c.args[0] for c in cache.cache.delete.await_args_list] == [
+            "generated:expression_image:h1",
+            "special:h2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_db_outage_deletes_nothing(self, tmp_path):
+        from sqlalchemy.exc import OperationalError
+
+        session = AsyncMock()
+        session.execute.side_effect = OperationalError("select", {}, Exception("down"))
+        store = BlobStore(session_maker=_session_maker(session), backend=LocalStorage(root=tmp_path / "static"))
+
+        assert await store.collect_garbage() == 0
+
+
+class TestDeleteGameReleasesReferences:
+
+    @pytest.mark.asyncio
+    async def test_event_image_references_are_released(self):
+        from app.api import games
+
+        session = MagicMock()
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = session
+        db = AsyncMock()
+        db.execute.side_effect = [found, _result([("/static/images/event.png",)])]
+        blobs = MagicMock()
+        blobs.release = AsyncMock()
+
+        with patch.object(games, "blob_store", blobs):
+            await games.delete_game(uuid4(), db=db)
+
+        blobs.release.assert_awaited_once_with(db, ["/static/images/event.png"])
+        db.delete.assert_awaited_once_with(session)
+        db.commit.assert_awaited_once()
@@ -0,0 +1,185 @@
+"""
+Tests for the warm pool of pre-generated characters
+풀에서 완성된 캐릭터를 원자적으로 꺼내고, 한가할 때만 완성된 캐릭터로 채우는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from app.services.character_pool import CharacterPool, pool_combinations
+
+EXPRESSION_TYPES = ["neutral", "happy", "sad", "jealous", "shy", "excited", "disgusted"]
+DESIGN = {"hair": "long black hair", "eyes": "brown eyes"}
+URLS = {expression: f"/static/images/characters/{expression}.png" for expression in EXPRESSION_TYPES}
+
+
+def _session_maker(session: AsyncMock) -> MagicMock:
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    return session_maker
+
+
+def _db() -> AsyncMock:
+    db = AsyncMock()
+    db.begin_nested = MagicMock()
+    return db
+
+
+def _first(row) -> MagicMock:
+    result = MagicMock()
+    result.first.return_value = row
+    return result
+
+
+class TestClaim:
+
+    @pytest.mark.asyncio
+    async def test_claim_is_a_single_skip_locked_delete(self):
+        db = _db()
+        db.execute.return_value = _first((DESIGN, URLS))
+
+        claimed = await CharacterPool(size=1).claim(db, "female", "cute", "anime")
+
+        assert claimed == (DESIGN, URLS)
+        db.execute.assert_awaited_once()
+        db.commit.assert_not_awaited()
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("DELETE FROM pooled_characters")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.asyncio
+    async def test_empty_pool(self):
+        db = _db()
+        db.execute.return_value = _first(None)
+
+        assert await CharacterPool(size=1).claim(db, "female", "cute", "anime") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_claim_rolls_back_only_its_savepoint(self):
+        db = _db()
+        db.execute.side_effect = OperationalError("DELETE", {}, Exception("deadlock detected"))
+
+        assert await CharacterPool(size=1).claim(db, "female", "cute", "anime") is None
+
+        db.begin_nested.assert_called_once()
+        exc_type = db.begin_nested.return_value.__aexit__.await_args.args[0]
+        assert exc_type is OperationalError
+        db.rollback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_does_not_query(self):
+        db = _db()
+
+        assert await CharacterPool(size=0).claim(db, "female", "cute", "anime") is None
+        db.execute.assert_not_awaited()
+
+
+class TestFill:
+
+    @pytest.mark.asyncio
+    async def test_busy_quota_skips_filling(self):
+        pool = CharacterPool(size=1)
+        pool._reserve_slot = AsyncMock()
+
+        with patch.object(pool, "has_headroom", AsyncMock(return_value=False)):
+            assert await pool.fill_once() is False
+
+        pool._reserve_slot.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_completed_character_becomes_ready(self):
+        pooled = MagicMock(status="filling", expression_urls=None)
+        session = AsyncMock()
+        session.get.return_value = pooled
+        pool = CharacterPool(session_maker=_session_maker(session), size=1)
+        pool._reserve_slot = AsyncMock(return_value=(uuid4(), ("female", "cute", "anime"), DESIGN))
+        pool._generate = AsyncMock(return_value=URLS)
+        blobs = MagicMock()
+        blobs.acquire = AsyncMock()
+
+        with patch.object(pool, "has_headroom", AsyncMock(return_value=True)), \
+                patch("app.services.character_pool.blob_store", blobs):
+            assert await pool.fill_once() is True
+
+        assert pooled.status == "ready"
+        assert pooled.expression_urls == URLS
+        blobs.acquire.assert_awaited_once_with(session, list(URLS.values()))
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_character_with_failed_expression_is_discarded(self):
+        from app.services import character_pool as module
+
+        async def images(**kwargs):
+            yield "neutral", URLS["neutral"]
+            yield "happy", "/static/placeholders/v1/expression-happy-female-cute.png"
+            yield "sad", URLS["sad"]
+
+        pool = CharacterPool(size=1)
+        with patch.object(module.gemini_service, "generate_character_images", images):
+            assert await pool._generate("female", "cute", "anime", DESIGN) is None
+
+    def test_every_settings_combination_is_pooled(self):
+        assert len(pool_combinations()) == 2 * 5 * 3
+
+
+class TestGenerateExpressionsUsesPool:
+
+    @pytest.mark.asyncio
+    async def test_pooled_character_is_handed_out_without_generation(self):
+        from app.api import expressions as api
+
+        setting = MagicMock(id=uuid4(), gender="female", style="cute", art_style="anime", character_design=None)
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = MagicMock(user_id=uuid4(), character_setting=setting)
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.execute.return_value = found
+        db.refresh.side_effect = lambda expression: setattr(expression, "id", uuid4())
+        generate = MagicMock()
+
+        with patch.object(api, "find_reusable_character", AsyncMock(return_value=None)), \
+                patch.object(api.character_pool, "claim", AsyncMock(return_value=(DESIGN, URLS))), \
+                patch.object(api, "generate_character_images", generate), \
+                patch.object(api, "get_image_variants", AsyncMock(return_value={})):
+            response = await api.generate_expressions(uuid4(), db=db)
+
+        assert setting.character_design == DESIGN
+        assert [expr.expression_type for expr in response.expressions] == EXPRESSION_TYPES
+        assert response.expressions[0].image_url == URLS["neutral"]
+        generate.assert_not_called()
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_claim_still_generates(self):
+        from app.api import expressions as api
+
+        setting = MagicMock(id=uuid4(), gender="female", style="cute", art_style="anime", character_design=None)
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = MagicMock(user_id=uuid4(), character_setting=setting)
+        saved = MagicMock()
+        saved.scalars.return_value.all.return_value = []
+        db = _db()
+        db.add = MagicMock(side_effect=lambda row: setattr(row, "id", uuid4()))
+        db.execute.side_effect = [found, OperationalError("DELETE", {}, Exception("deadlock detected")), saved]
+
+        async def generate(**kwargs):
+            for expression_type in kwargs["expressions"]:
+                yield expression_type, URLS[expression_type]
+
+        with patch.object(api, "find_reusable_character", AsyncMock(return_value=None)), \
+                patch.object(api.character_pool, "size", 1), \
+                patch.object(api, "get_character_design", MagicMock(return_value=DESIGN)), \
+                patch.object(api, "generate_character_images", generate), \
+                patch.object(api.blob_store, "acquire", AsyncMock()), \
+                patch.object(api.expression_urls, "invalidate", AsyncMock()), \
+                patch.object(api, "get_image_variants", AsyncMock(return_value={})):
+            response = await api.generate_expressions(uuid4(), db=db)
+
+        assert setting.character_design == DESIGN
+        assert [expr.expression_type for expr in response.expressions] == EXPRESSION_TYPES
+        db.begin_nested.assert_called_once()
@@ -0,0 +1,94 @@
+"""
+Tests for the single-query character reuse lookup
+find_reusable_character가 표정 수 집계 + NOT EXISTS 한 번의 쿼리로 재사용 캐릭터를 찾는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.api import expressions as api
+from app.api.expressions import find_reusable_character
+from app.models.game import CharacterExpression, GameSession
+
+
+def _db(found) -> AsyncMock:
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = found
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+class TestFindReusableCharacter:
+
+    @pytest.mark.asyncio
+    async def test_one_query_with_aggregate_and_anti_join(self):
+        user_id = uuid4()
+        db = _db(None)
+
+        assert await find_reusable_character(db, user_id, "female", "cute", "ENFP", "anime") is None
+
+        db.execute.assert_awaited_once()
+        statement = db.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "NOT (EXISTS (SELECT" in sql
+        assert "character_settings_1.design_hash = character_settings.design_hash" in sql
+        assert "GROUP BY character_settings.id" in sql
+        assert "HAVING count(DISTINCT character_expressions.expression_type) >=" in sql
+        assert "LIMIT" in sql
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params["user_id_1"] == user_id
+        assert params["count_1"] == 7
+
+    @pytest.mark.asyncio
+    async def test_returns_first_eligible_setting(self):
+        setting = MagicMock(id=uuid4())
+
+        assert await find_reusable_character(_db(setting), uuid4(), "female", "cute", "ENFP", "anime") is setting
+
+    def test_join_columns_are_indexed(self):
+        def leading_columns(table):
+            return {next(iter(index.columns)).name for index in table.indexes}
+
+        assert "setting_id" in leading_columns(CharacterExpression.__table__)
+        assert "user_id" in leading_columns(GameSession.__table__)
+
+
+class TestInterruptedGenerationResumes:
+
+    @pytest.mark.asyncio
+    async def test_setting_with_design_skips_reuse_and_fills_missing_expressions(self):
+        design = {"hair": "long black hair"}
+        setting = MagicMock(id=uuid4(), gender="female", style="cute", art_style="anime", character_design=design)
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = MagicMock(user_id=uuid4(), character_setting=setting)
+        saved = MagicMock()
+        saved.scalars.return_value.all.return_value = [
+            CharacterExpression(id=uuid4(), setting_id=setting.id, expression_type="neutral", image_url="/n.png"),
+        ]
+        db = AsyncMock()
+        db.add = MagicMock(side_effect=lambda row: setattr(row, "id", uuid4()))
+        db.execute.side_effect = [found, saved]
+        requested = []
+
+        async def generate(**kwargs):
+            requested.extend(kwargs["expressions"])
+            for expression_type in kwargs["expressions"]:
+                yield expression_type, f"/{expression_type}.png"
+
+        reuse = AsyncMock()
+        with patch.object(api, "find_reusable_character", reuse), \
+                patch.object(api.character_pool, "claim", AsyncMock()) as claim, \
+                patch.object(api, "generate_character_images", generate), \
+                patch.object(api.blob_store, "acquire", AsyncMock()), \
+                patch.object(api.expression_urls, "invalidate", AsyncMock()), \
+                patch.object(api, "get_image_variants", AsyncMock(return_value={})):
+            response = await api.generate_expressions(uuid4(), db=db)
+
+        reuse.assert_not_awaited()
+        claim.assert_not_awaited()
+        assert setting.character_design == design
+        assert "neutral" not in requested and len(requested) == 6
+        assert len(response.expressions) == 7
@@ -0,0 +1,64 @@
+"""
+Tests for the async engine configuration and pool telemetry
+풀/드라이버 설정이 엔진 인자로 전달되고, 연결 대기/overflow/타임아웃이 메트릭으로 집계되는지 검증
+"""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import engine_options
+from app.core.db_pool import InstrumentedQueuePool, instrument, pool_stats
+from app.core.metrics import metrics
+
+
+class TestEngineOptions:
+
+    def test_postgres_gets_pool_and_statement_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 7)
+        monkeypatch.setattr(settings, "DATABASE_STATEMENT_CACHE_SIZE", 0)
+
+        options = engine_options("postgresql+asyncpg://u:p@db:5432/app")
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 7
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"statement_cache_size": 0}
+        assert options["echo"] is False
+
+    def test_sqlite_keeps_driver_defaults(self):
+        assert engine_options("sqlite+aiosqlite:///:memory:") == {"echo": False}
+
+
+class TestPoolTelemetry:
+
+    @pytest.mark.asyncio
+    async def test_checkouts_overflow_and_timeouts(self):
+        engine = instrument(create_async_engine(
+            "sqlite+aiosqlite://",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05,
+        ), "test-telemetry")
+        try:
+            first = await engine.connect()
+            second = await engine.connect()
+            await second.execute(text("SELECT 1"))
+
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+            assert stats["overflow_connections"] == 1
+            assert stats["checkouts"] == 2
+
+            with pytest.raises(exc.TimeoutError):
+                await engine.connect()
+            assert metrics.get("db_pool_timeouts", pool="test-telemetry") == 1
+
+            await first.close()
+            await second.close()
+            assert pool_stats(engine)["checked_out"] == 0
+        finally:
+            await engine.dispose()
@@ -0,0 +1,34 @@
+"""
+Tests for the persisted character design fingerprint
+character_design을 쓸 때 design_hash가 계산되고, 재사용 조회가 지문으로 SQL에서 걸러지는지 검증
+"""
+
+from app.models.game import CharacterSetting, design_fingerprint
+
+DESIGN = {"hair": "long black hair", "eyes": "brown eyes", "outfit": "school uniform"}
+
+
+class TestFingerprint:
+
+    def test_key_order_does_not_matter(self):
+        reordered = dict(reversed(list(DESIGN.items())))
+
+        assert design_fingerprint(DESIGN) == design_fingerprint(reordered)
+        assert len(design_fingerprint(DESIGN)) == 64
+
+    def test_set_on_write(self):
+        setting = CharacterSetting(gender="female", style="cute", mbti="ENFP", art_style="anime",
+                                   character_design=DESIGN)
+        assert setting.design_hash == design_fingerprint(DESIGN)
+
+        setting.character_design = {**DESIGN, "hair": "short red hair"}
+        assert setting.design_hash != design_fingerprint(DESIGN)
+
+        setting.character_design = None
+        assert setting.design_hash is None
+
+    def test_reuse_index_covers_settings_and_hash(self):
+        index = next(i for i in CharacterSetting.__table__.indexes if i.name == "ix_character_settings_reuse")
+
+        assert [c.name for c in index.columns] == ["gender", "style", "mbti", "art_style", "design_hash"]
+
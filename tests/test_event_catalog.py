@@ -0,0 +1,135 @@
+"""
+Tests for the special-event image catalog
+디자인별로 중복 없이 기록된 이벤트 이미지에서 세션이 보지 않은 것을 인덱스 조회 한 번으로 찾는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.models.game import SpecialEventCatalog, SpecialEventImage
+from app.services.event_catalog import EventCatalog
+
+DESIGN_HASH = "d" * 64
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _first(row) -> MagicMock:
+    result = MagicMock()
+    result.first.return_value = row
+    result.scalars.return_value.first.return_value = row
+    return result
+
+
+class TestNextUnseen:
+
+    @pytest.mark.asyncio
+    async def test_single_anti_join_lookup(self):
+        entry = MagicMock(event_type="beach_date")
+        db = AsyncMock()
+        db.execute.return_value = _first(entry)
+
+        assert await EventCatalog().next_unseen(db, DESIGN_HASH, "anime", uuid4()) is entry
+
+        db.execute.assert_awaited_once()
+        sql = _sql(db.execute.await_args.args[0])
+        assert "FROM special_event_catalog" in sql
+        assert "special_event_catalog.design_hash =" in sql
+        assert "special_event_catalog.art_style =" in sql
+        assert "NOT (EXISTS (SELECT special_event_images.id" in sql
+        assert "special_event_images.event_type = special_event_catalog.event_type" in sql
+        assert " IN (" not in sql
+
+    def test_lookups_are_indexed(self):
+        catalog_keys = [
+            [c.name for c in constraint.columns]
+            for constraint in SpecialEventCatalog.__table__.constraints
+            if constraint.name == "uq_special_event_catalog_design_event"
+        ]
+        session_index = next(
+            i for i in SpecialEventImage.__table__.indexes if i.name == "ix_special_event_images_session_event"
+        )
+
+        assert catalog_keys == [["design_hash", "art_style", "event_type"]]
+        assert [c.name for c in session_index.columns] == ["session_id", "event_type"]
+
+
+class TestAdd:
+
+    @pytest.mark.asyncio
+    async def test_new_entry_holds_an_image_reference(self):
+        db = AsyncMock()
+        db.execute.return_value = _first((uuid4(),))
+        blobs = MagicMock()
+        blobs.acquire = AsyncMock()
+
+        with patch("app.services.event_catalog.blob_store", blobs):
+            added = await EventCatalog().add(db, DESIGN_HASH, "anime", "beach_date", "/static/images/characters/a.png")
+
+        assert added is True
+        assert "ON CONFLICT ON CONSTRAINT uq_special_event_catalog_design_event DO NOTHING" in _sql(
+            db.execute.await_args.args[0]
+        )
+        blobs.acquire.assert_awaited_once_with(db, ["/static/images/characters/a.png"])
+
+    @pytest.mark.asyncio
+    async def test_existing_entry_is_not_referenced_twice(self):
+        db = AsyncMock()
+        db.execute.return_value = _first(None)
+        blobs = MagicMock()
+        blobs.acquire = AsyncMock()
+
+        with patch("app.services.event_catalog.blob_store", blobs):
+            added = await EventCatalog().add(db, DESIGN_HASH, "anime", "beach_date", "/static/images/characters/a.png")
+
+        assert added is False
+        blobs.acquire.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_placeholders_and_missing_design_are_skipped(self):
+        db = AsyncMock()
+        catalog = EventCatalog()
+
+        assert await catalog.add(db, DESIGN_HASH, "anime", "x", "/static/placeholders/v1/special-event.png") is False
+        assert await catalog.add(db, None, "anime", "x", "/static/images/characters/a.png") is False
+        db.execute.assert_not_awaited()
+
+
+class TestSeedFromHistory:
+
+    @pytest.mark.asyncio
+    async def test_skipped_when_catalog_has_entries(self):
+        count = MagicMock()
+        count.scalar.return_value = 3
+        session = AsyncMock()
+        session.execute.return_value = count
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = session
+
+        assert await EventCatalog().seed_from_history(session_maker) == 0
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_seed_keeps_art_styles_apart(self):
+        count = MagicMock()
+        count.scalar.return_value = 0
+        inserted = MagicMock()
+        inserted.all.return_value = []
+        session = AsyncMock()
+        session.execute.side_effect = [count, inserted]
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = session
+
+        with patch("app.services.event_catalog.blob_store", MagicMock(acquire=AsyncMock())):
+            await EventCatalog().seed_from_history(session_maker)
+
+        sql = _sql(session.execute.await_args.args[0])
+        assert sql.startswith("INSERT INTO special_event_catalog (id, design_hash, art_style, event_type")
+        assert (
+            "DISTINCT ON (character_settings.design_hash, coalesce(character_settings.art_style, "
+            in sql
+        )
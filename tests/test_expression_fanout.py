@@ -0,0 +1,104 @@
+"""
+Tests for concurrent expression image generation
+표정 7종을 동시에 생성하되 동시성 상한과 표정별 타임아웃을 지키는지 검증
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.gemini_service import EXPRESSION_TYPES, generate_character_images
+
+
+class TestGenerateCharacterImages:
+
+    @pytest.mark.asyncio
+    async def test_yields_every_expression(self):
+        async def fake_generate(**kwargs):
+            return f"/static/images/characters/{kwargs['expression']}.png"
+
+        results = [
+            item async for item in generate_character_images(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expressions=EXPRESSION_TYPES,
+                generate_image=fake_generate,
+            )
+        ]
+
+        assert {expression for expression, _ in results} == set(EXPRESSION_TYPES)
+        for expression, url in results:
+            assert url.endswith(f"{expression}.png")
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_cap(self):
+        running = 0
+        peak = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return "/static/images/characters/x.png"
+
+        started = time.monotonic()
+        results = [
+            item async for item in generate_character_images(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expressions=EXPRESSION_TYPES,
+                concurrency=3,
+                generate_image=fake_generate,
+            )
+        ]
+
+        assert len(results) == 7
+        assert peak == 3
+        # 7장을 3개씩 → 3라운드 (직렬이면 7라운드)
+        assert time.monotonic() - started < 0.05 * 6
+
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order(self):
+        delays = {"neutral": 0.15, "happy": 0.0}
+
+        async def fake_generate(**kwargs):
+            await asyncio.sleep(delays[kwargs["expression"]])
+            return kwargs["expression"]
+
+        order = [
+            expression async for expression, _ in generate_character_images(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expressions=["neutral", "happy"],
+                generate_image=fake_generate,
+            )
+        ]
+
+        assert order == ["happy", "neutral"]
+
+    @pytest.mark.asyncio
+    async def test_timed_out_expression_gets_placeholder(self):
+        async def fake_generate(**kwargs):
+            if kwargs["expression"] == "sad":
+                await asyncio.sleep(5)
+            return "/static/images/characters/ok.png"
+
+        results = dict([
+            item async for item in generate_character_images(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expressions=["happy", "sad"],
+                timeout=0.05,
+                generate_image=fake_generate,
+            )
+        ])
+
+        assert results["happy"] == "/static/images/characters/ok.png"
+        assert results["sad"] != "/static/images/characters/ok.png"
@@ -0,0 +1,148 @@
+"""
+Tests for the in-process expression URL map
+표정 URL이 워커 메모리 LRU에서 읽히고(네트워크 없음), 표정 행이 바뀌면 pub/sub으로 모든 워커에서 지워지는지 검증
+"""
+
+import asyncio
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.expression_urls import INVALIDATE_CHANNEL, ExpressionUrlMap
+
+
+def _db(rows) -> AsyncMock:
+    db = AsyncMock()
+    db.execute.return_value.all = MagicMock(return_value=rows)
+    return db
+
+
+def _redis() -> MagicMock:
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    return redis
+
+
+ROWS = [("neutral", "/n.png", None), ("happy", "/h.png", "/h.mp4")]
+
+
+class TestLookup:
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_whole_setting_then_hits_stay_local(self):
+        redis, db = _redis(), _db(ROWS)
+        urls = ExpressionUrlMap(redis, max_size=10)
+        setting_id = uuid4()
+
+        assert await urls.get(db, setting_id, "happy") == "/h.png"
+        assert await urls.get(db, setting_id, "neutral") == "/n.png"
+        assert (await urls.get_all(db, setting_id))["happy"]["video_url"] == "/h.mp4"
+
+        db.execute.assert_awaited_once()
+        assert redis.method_calls == []
+        assert (urls.hits, urls.misses) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_unknown_expression_is_none(self):
+        urls = ExpressionUrlMap(_redis(), max_size=10)
+
+        assert await urls.get(_db(ROWS), uuid4(), "jealous") is None
+
+    @pytest.mark.asyncio
+    async def test_bounded_by_least_recently_used(self):
+        urls = ExpressionUrlMap(_redis(), max_size=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+        db = _db(ROWS)
+
+        await urls.get_all(db, first)
+        await urls.get_all(db, second)
+        await urls.get_all(db, first)  # first를 최근으로
+        await urls.get_all(db, third)
+
+        assert list(urls._cache) == [first, third]
+
+
+class TestInvalidation:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_evicts_locally_and_notifies_other_workers(self):
+        redis, db = _redis(), _db(ROWS)
+        urls = ExpressionUrlMap(redis, max_size=10)
+        setting_id = uuid4()
+        await urls.get_all(db, setting_id)
+
+        await urls.invalidate(setting_id)
+
+        assert setting_id not in urls._cache
+        redis.publish.assert_awaited_once_with(INVALIDATE_CHANNEL, str(setting_id))
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_still_evicts_locally(self):
+        redis = _redis()
+        redis.publish.side_effect = RedisConnectionError("down")
+        urls = ExpressionUrlMap(redis, max_size=10)
+        setting_id = uuid4()
+        await urls.get_all(_db(ROWS), setting_id)
+
+        await urls.invalidate(setting_id)
+
+        assert setting_id not in urls._cache
+
+    @pytest.mark.asyncio
+    async def test_message_from_other_worker_evicts(self):
+        urls = ExpressionUrlMap(_redis(), max_size=10)
+        setting_id, other_id = uuid4(), uuid4()
+        await urls.get_all(_db(ROWS), setting_id)
+        await urls.get_all(_db(ROWS), other_id)
+
+        urls._on_message(str(setting_id).encode())
+        urls._on_message(b"not-a-uuid")
+
+        assert list(urls._cache) == [other_id]
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        urls = ExpressionUrlMap(_redis(), max_size=10)
+        setting_id = uuid4()
+        db = AsyncMock()
+
+        async def execute(statement):
+            urls._on_message(str(setting_id))  # 읽는 도중 다른 워커가 표정 행을 바꿈
+            result = MagicMock()
+            result.all.return_value = ROWS
+            return result
+
+        db.execute.side_effect = execute
+
+        assert await urls.get(db, setting_id, "happy") == "/h.png"
+        assert setting_id not in urls._cache
+
+    @pytest.mark.asyncio
+    async def test_subscriber_clears_map_on_subscribe_and_applies_messages(self):
+        setting_id, kept_id = uuid4(), uuid4()
+        received = asyncio.Event()
+        urls = ExpressionUrlMap(_redis(), max_size=10)
+        messages = [{"type": "message", "data": str(setting_id).encode()}]
+
+        async def get_message(timeout):
+            if messages:
+                # 구독 이후에 채워진 항목
+                urls._store(setting_id, {})
+                urls._store(kept_id, {})
+                return messages.pop()
+            received.set()
+            await asyncio.sleep(timeout)
+
+        pubsub = MagicMock(subscribe=AsyncMock(), aclose=AsyncMock(), get_message=get_message)
+        urls.redis.pubsub.return_value = pubsub
+        stale_id = uuid4()
+        await urls.get_all(_db(ROWS), stale_id)
+
+        urls.start()
+        await asyncio.wait_for(received.wait(), timeout=1)
+        await urls.stop()
+
+        pubsub.subscribe.assert_awaited_once_with(INVALIDATE_CHANNEL)
+        pubsub.aclose.assert_awaited_once()
+        assert list(urls._cache) == [kept_id]
@@ -0,0 +1,113 @@
+"""
+Tests for non-blocking Gemini calls
+Gemini 호출이 이벤트 루프를 막지 않고 비동기 클라이언트 + 타임아웃으로 동작하는지 검증
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import gemini_service
+
+
+def _text_response(payload: dict) -> MagicMock:
+    response = MagicMock()
+    response.text = json.dumps(payload, ensure_ascii=False)
+    return response
+
+
+def _mock_client() -> MagicMock:
+    mock_client = MagicMock()
+    mock_client.aio.models.generate_content = AsyncMock()
+    mock_client.aio.models.generate_images = AsyncMock()
+    return mock_client
+
+
+class TestAsyncGeminiCalls:
+    """Gemini 호출은 비동기 클라이언트(client.aio)를 사용해야 함"""
+
+    @pytest.mark.asyncio
+    async def test_generate_scene_content_uses_async_client(self):
+        mock_client = _mock_client()
+        mock_client.aio.models.generate_content.return_value = _text_response({
+            "dialogue": "안녕!",
+            "choices": [
+                {"text": "a", "delta": 1, "expression": "happy"},
+                {"text": "b", "delta": 0, "expression": "neutral"},
+                {"text": "c", "delta": -5, "expression": "sad"},
+            ],
+        })
+
+        with patch.object(gemini_service, "client", mock_client):
+            content = await gemini_service.generate_scene_content(
+                character_setting=None,
+                user_mbti="INFP",
+                scene_number=1,
+                affection=30,
+            )
+
+        assert content["dialogue"] == "안녕!"
+        mock_client.aio.models.generate_content.assert_awaited_once()
+        mock_client.models.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_character_image_uses_async_client(self):
+        mock_client = _mock_client()
+        mock_client.aio.models.generate_images.return_value = MagicMock(generated_images=[])
+
+        with patch.object(gemini_service, "client", mock_client):
+            url = await gemini_service.generate_character_image(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expression="happy",
+            )
+
+        assert isinstance(url, str)
+        assert mock_client.aio.models.generate_images.await_count >= 1
+        mock_client.models.generate_images.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_text_call_times_out_and_falls_back(self):
+        mock_client = _mock_client()
+
+        async def slow_call(**kwargs):
+            await asyncio.sleep(5)
+
+        mock_client.aio.models.generate_content.side_effect = slow_call
+
+        with patch.object(gemini_service, "client", mock_client), \
+                patch.object(gemini_service.settings, "GEMINI_TEXT_TIMEOUT", 0.05):
+            started = time.monotonic()
+            content = await gemini_service.generate_scene_content(
+                character_setting=None,
+                user_mbti=None,
+                scene_number=2,
+                affection=50,
+            )
+
+        assert time.monotonic() - started < 2
+        assert len(content["choices"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self):
+        """느린 호출 여러 개가 직렬이 아니라 동시에 진행되어야 함"""
+        mock_client = _mock_client()
+
+        async def slow_call(**kwargs):
+            await asyncio.sleep(0.2)
+            return _text_response({"dialogue": "...", "choices": []})
+
+        mock_client.aio.models.generate_content.side_effect = slow_call
+
+        with patch.object(gemini_service, "client", mock_client):
+            started = time.monotonic()
+            await asyncio.gather(*[
+                gemini_service._generate_content(model="gemini-2.0-flash", contents="hi")
+                for _ in range(5)
+            ])
+
+        assert time.monotonic() - started < 0.8
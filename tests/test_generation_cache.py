@@ -0,0 +1,174 @@
+"""
+Tests for two-tier AI generation cache
+같은 프롬프트의 생성 결과를 Redis → DB 순서로 재사용하고, 실패(placeholder)는 캐시하지 않는지 검증
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.cache_service import CacheService
+from app.services.generation_cache import (
+    GenerationCache,
+    normalize_prompt,
+    prompt_key,
+)
+
+
+def _cache(redis_value=None, db_value=None) -> tuple[GenerationCache, MagicMock]:
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = redis_value
+    cache = GenerationCache(CacheService(mock_redis))
+    cache._db_get = AsyncMock(return_value=db_value)
+    return cache, mock_redis
+
+
+class TestPromptKey:
+
+    def test_whitespace_differences_share_a_key(self):
+        a = "Create a portrait.\n    Hair: black\n"
+        b = "Create a portrait. Hair: black"
+        assert normalize_prompt(a) == b
+        assert prompt_key("expression_image", a) == prompt_key("expression_image", b)
+
+    def test_content_type_is_part_of_the_key(self):
+        assert prompt_key("expression_image", "p") != prompt_key("event_image", "p")
+
+
+class TestLookup:
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_skips_db(self):
+        cache, _ = _cache(redis_value=b'{"url": "https://cdn/x.png"}')
+
+        value = await cache.get("expression_image", "prompt")
+
+        assert value == {"url": "https://cdn/x.png"}
+        cache._db_get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_db_hit_refills_redis(self):
+        cache, mock_redis = _cache(db_value={"url": "https://cdn/x.png"})
+
+        value = await cache.get("expression_image", "prompt")
+
+        assert value == {"url": "https://cdn/x.png"}
+        mock_redis.set.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_event_images_use_special_image_keys(self):
+        cache, mock_redis = _cache(redis_value=b"https://cdn/event.png")
+
+        value = await cache.get("event_image", "prompt")
+
+        assert value == {"url": "https://cdn/event.png"}
+        key = mock_redis.get.await_args.args[0]
+        assert key == f"special:{prompt_key('event_image', 'prompt')}"
+
+    @pytest.mark.asyncio
+    async def test_missing_local_file_is_not_served(self):
+        cache, _ = _cache(redis_value=b'{"url": "/static/images/characters/deleted.png"}')
+
+        assert await cache.get("expression_image", "prompt") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_falls_through_to_db(self):
+        cache, mock_redis = _cache(db_value={"url": "https://cdn/x.png"})
+        mock_redis.get.side_effect = RedisConnectionError("down")
+        mock_redis.set.side_effect = RedisConnectionError("down")
+
+        assert await cache.get("expression_image", "prompt") == {"url": "https://cdn/x.png"}
+
+    @pytest.mark.asyncio
+    async def test_dialogue_is_never_cached(self):
+        cache, mock_redis = _cache(redis_value=b'{"dialogue": "x"}')
+
+        assert await cache.get("dialogue", "prompt") is None
+        mock_redis.get.assert_not_awaited()
+
+
+class TestGetOrCreate:
+
+    @pytest.mark.asyncio
+    async def test_miss_generates_and_writes_back(self):
+        cache, _ = _cache()
+        cache.put = AsyncMock()
+        create = AsyncMock(return_value={"url": "https://cdn/new.png"})
+
+        value = await cache.get_or_create("expression_image", "prompt", create)
+
+        assert value == {"url": "https://cdn/new.png"}
+        cache.put.assert_awaited_once_with("expression_image", "prompt", value)
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self):
+        cache, _ = _cache()
+        cache.put = AsyncMock()
+
+        value = await cache.get_or_create("expression_image", "prompt", AsyncMock(return_value=None))
+
+        assert value is None
+        cache.put.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_generate_once(self):
+        cache, _ = _cache()
+        cache.put = AsyncMock()
+        calls = 0
+
+        async def create():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"url": "https://cdn/new.png"}
+
+        results = await asyncio.gather(*[
+            cache.get_or_create("expression_image", "prompt", create) for _ in range(3)
+        ])
+
+        assert calls == 1
+        assert all(result == {"url": "https://cdn/new.png"} for result in results)
+
+
+class TestStats:
+
+    @pytest.mark.asyncio
+    async def test_hit_rate_per_content_type(self):
+        mock_redis = AsyncMock()
+        mock_redis.hgetall.return_value = {
+            b"expression_image:redis_hit": b"6",
+            b"expression_image:db_hit": b"2",
+            b"expression_image:miss": b"2",
+        }
+        cache = GenerationCache(CacheService(mock_redis))
+
+        stats = await cache.get_stats()
+
+        assert stats["expression_image"]["hit_rate"] == 0.8
+        assert stats["expression_image"]["misses"] == 2
+
+
+class TestImageGenerationUsesCache:
+
+    @pytest.mark.asyncio
+    async def test_cached_expression_image_skips_imagen(self):
+        from app.services import gemini_service
+
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_images = AsyncMock()
+        cache = MagicMock()
+        cache.get_or_create = AsyncMock(return_value={"url": "https://cdn/cached.png"})
+
+        with patch.object(gemini_service, "client", mock_client), \
+                patch.object(gemini_service, "generation_cache", cache):
+            url = await gemini_service.generate_character_image(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expression="happy",
+            )
+
+        assert url == "https://cdn/cached.png"
+        mock_client.aio.models.generate_images.assert_not_awaited()
@@ -0,0 +1,126 @@
+"""
+Tests for the image ingestion pipeline
+원본 PNG 저장 + WebP/AVIF 크기 변형을 프로세스 풀에서 만들고 변형 URL을 기록하는지 검증
+"""
+
+import hashlib
+import io
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from PIL import Image
+
+from app.services.image_pipeline import ImagePipeline, encode_variants
+from app.services.storage import LocalStorage
+
+
+def _png(size: int = 1024) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), (255, 105, 180)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    session = AsyncMock()
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    blobs = MagicMock()
+    blobs.register = AsyncMock()
+    pipeline = ImagePipeline(
+        session_maker=session_maker,
+        backend=LocalStorage(root=tmp_path / "static"),
+        max_workers=1,
+        blobs=blobs,
+    )
+    yield pipeline
+    pipeline.shutdown()
+
+
+class TestEncodeVariants:
+
+    def test_resizes_to_each_size(self):
+        encoded = encode_variants(_png(1024), (256, 512, 1024), ("webp",))
+
+        assert set(encoded["webp"]) == {"256", "512", "1024"}
+        for label, data in encoded["webp"].items():
+            with Image.open(io.BytesIO(data)) as image:
+                assert image.format == "WEBP"
+                assert image.size == (int(label), int(label))
+
+    def test_does_not_upscale_small_images(self):
+        encoded = encode_variants(_png(300), (256, 512, 1024), ("webp",))
+
+        assert set(encoded["webp"]) == {"256", "300"}
+
+
+class TestIngest:
+
+    @pytest.mark.asyncio
+    async def test_writes_original_and_variants(self, pipeline, tmp_path):
+        directory = tmp_path / "static" / "images"
+        png = _png()
+        digest = hashlib.sha256(png).hexdigest()
+
+        with patch("app.services.image_pipeline.supported_formats", return_value=("webp",)):
+            stored = await pipeline.ingest(png, "images")
+
+        assert stored["url"] == f"/static/images/{digest}.png"
+        assert (directory / f"{digest}.png").read_bytes() == png
+        assert stored["variants"]["webp"]["256"] == f"/static/images/{digest}_256.webp"
+        assert (directory / f"{digest}_256.webp").stat().st_size < len(png)
+        pipeline.blobs.register.assert_awaited_once_with(digest, stored["url"], len(png))
+        session = pipeline.session_maker.return_value.__aenter__.return_value
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_identical_image_is_stored_once(self, pipeline, tmp_path):
+        directory = tmp_path / "static" / "images"
+        png = _png(64)
+        variants = {"webp": {"64": "/static/images/x_64.webp"}}
+        pipeline._create_variants = AsyncMock(return_value=variants)
+        pipeline._record = AsyncMock()
+
+        first = await pipeline.ingest(png, "images")
+        with patch.object(pipeline, "_lookup", AsyncMock(return_value=variants)):
+            second = await pipeline.ingest(png, "images")
+
+        assert first == second
+        assert len(list(directory.glob("*.png"))) == 1
+        pipeline._create_variants.assert_awaited_once()
+        assert pipeline.blobs.register.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_undecodable_image_keeps_original_without_variants(self, pipeline, tmp_path):
+        data = b"not an image" * 20
+
+        stored = await pipeline.ingest(data, "images")
+
+        assert stored["variants"] == {}
+        assert (tmp_path / stored["url"].lstrip("/")).read_bytes() == data
+
+
+class TestImagenWritesThroughPipeline:
+
+    @pytest.mark.asyncio
+    async def test_generated_image_is_ingested(self):
+        from app.services import gemini_service
+
+        generated = MagicMock()
+        generated.image.image_bytes = _png(64)
+        health = MagicMock()
+        health.available_models = AsyncMock(return_value=["imagen-4.0-generate-001"])
+        ingest = AsyncMock(return_value={
+            "url": "/static/images/characters/x.png",
+            "variants": {"webp": {"64": "/static/images/characters/x_64.webp"}},
+        })
+
+        with patch.object(gemini_service, "_generate_images",
+                          AsyncMock(return_value=MagicMock(generated_images=[generated]))), \
+                patch.object(gemini_service, "model_health", health), \
+                patch.object(gemini_service.image_pipeline, "ingest", ingest):
+            result = await gemini_service._generate_image_file("prompt", gemini_service.Priority.EXPRESSION)
+
+        assert result["url"] == "/static/images/characters/x.png"
+        assert result["variants"]["webp"]["64"].endswith(".webp")
+        assert ingest.await_args.args[1] == "images/characters"
@@ -0,0 +1,233 @@
+"""
+Tests for per-model circuit breaker
+할당량 초과/5xx 모델을 Redis 공유 상태로 차단하고 건강한 모델로 바로 보내는지 검증
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from google.genai import errors as genai_errors
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.model_health_service import (
+    FAILURE_THRESHOLD,
+    FAILURE_WINDOW_SECONDS,
+    PROBE_LEASE_SECONDS,
+    ModelHealthService,
+    classify_error,
+    parse_retry_after,
+)
+
+
+def _mock_redis(*execute_results):
+    """pipeline().execute()가 차례대로 execute_results를 반환하는 Redis mock"""
+    mock_redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=list(execute_results))
+    mock_redis.pipeline.return_value = pipe
+    mock_redis.delete = AsyncMock()
+    mock_redis.set = AsyncMock(return_value=True)
+    return mock_redis, pipe
+
+
+def _api_error(code: int, status: str, message: str = "") -> genai_errors.APIError:
+    """SDK가 응답 본문으로 만드는 것과 같은 APIError"""
+    error_class = genai_errors.ClientError if code < 500 else genai_errors.ServerError
+    return error_class(code, MagicMock(body_segments=[{"error": {"code": code, "status": status, "message": message}}]))
+
+
+class TestErrorClassification:
+
+    def test_quota_errors(self):
+        assert classify_error(_api_error(429, "RESOURCE_EXHAUSTED", "Quota exceeded")) == "quota"
+
+    def test_server_errors(self):
+        assert classify_error(_api_error(503, "UNAVAILABLE", "model overloaded")) == "server"
+        assert classify_error(_api_error(500, "INTERNAL")) == "server"
+        assert classify_error(asyncio.TimeoutError()) == "server"
+
+    def test_client_errors_do_not_trip_circuit(self):
+        assert classify_error(_api_error(400, "INVALID_ARGUMENT", "bad prompt")) is None
+
+    def test_message_text_is_not_classified(self):
+        # 프롬프트/메시지에 숫자가 섞여 있어도 상태 코드가 없으면 차단하지 않음
+        assert classify_error(ValueError("image 512x512 failed: 429 characters")) is None
+        assert classify_error(_api_error(400, "INVALID_ARGUMENT", "503 UNAVAILABLE in prompt")) is None
+
+    def test_parse_retry_delay(self):
+        error = Exception("429 RESOURCE_EXHAUSTED {'retryDelay': '37s'}")
+        assert parse_retry_after(error) == 37.0
+        assert parse_retry_after(Exception("429")) is None
+
+
+class TestModelHealthService:
+
+    @pytest.mark.asyncio
+    async def test_open_models_are_skipped_in_priority_order(self):
+        mock_redis, _ = _mock_redis([str(time.time() + 60).encode(), None, b"0"])
+        service = ModelHealthService(mock_redis)
+
+        models = await service.available_models(["m1", "m2", "m3"])
+
+        assert models == ["m2", "m3"]
+
+    @pytest.mark.asyncio
+    async def test_expired_circuit_lets_one_probe_through(self):
+        mock_redis, _ = _mock_redis([str(time.time() - 1).encode()])
+        service = ModelHealthService(mock_redis)
+
+        assert await service.is_available("m1") is True
+        mock_redis.set.assert_awaited_once_with(
+            "gemini:model_health:m1:probe", 1, nx=True, ex=PROBE_LEASE_SECONDS
+        )
+
+    @pytest.mark.asyncio
+    async def test_other_callers_wait_while_probe_is_in_flight(self):
+        mock_redis, _ = _mock_redis([str(time.time() - 1).encode(), None])
+        mock_redis.set.return_value = None  # 다른 워커가 이미 probe 중
+        service = ModelHealthService(mock_redis)
+
+        assert await service.available_models(["m1", "m2"]) == ["m2"]
+
+    @pytest.mark.asyncio
+    async def test_status_check_does_not_take_the_probe(self):
+        mock_redis, _ = _mock_redis([str(time.time() - 1).encode(), None])
+        service = ModelHealthService(mock_redis)
+
+        assert await service.available_models(["m1", "m2"], probe=False) == ["m2"]
+        mock_redis.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_closed_models_take_no_probe_lock(self):
+        mock_redis, _ = _mock_redis([None, b"0"])
+        service = ModelHealthService(mock_redis)
+
+        assert await service.available_models(["m1", "m2"]) == ["m1", "m2"]
+        mock_redis.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_fails_open(self):
+        mock_redis, pipe = _mock_redis()
+        pipe.execute.side_effect = RedisConnectionError("down")
+        service = ModelHealthService(mock_redis)
+
+        assert await service.available_models(["m1", "m2"]) == ["m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_quota_error_opens_circuit_for_retry_delay(self):
+        mock_redis, pipe = _mock_redis([1, True, 1, 0, 1, True, None], [True, 1, 0])
+        service = ModelHealthService(mock_redis)
+
+        before = time.time()
+        await service.record_failure("m1", _api_error(429, "RESOURCE_EXHAUSTED", "{'retryDelay': '37s'}"))
+
+        mapping = pipe.hset.call_args_list[-1].kwargs["mapping"]
+        assert before + 36 <= mapping["open_until"] <= time.time() + 38
+
+    @pytest.mark.asyncio
+    async def test_server_errors_below_threshold_keep_circuit_closed(self):
+        mock_redis, pipe = _mock_redis([1, None, FAILURE_THRESHOLD - 1, 0, 1, True, None])
+        service = ModelHealthService(mock_redis)
+
+        await service.record_failure("m1", _api_error(500, "INTERNAL"))
+
+        assert pipe.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_count_expires_with_its_window(self):
+        mock_redis, pipe = _mock_redis([1, True, 1, 0, 1, True, None])
+        service = ModelHealthService(mock_redis)
+
+        await service.record_failure("m1", _api_error(500, "INTERNAL"))
+
+        # 첫 실패에만 TTL이 붙고 이후 실패는 TTL을 늘리지 않음
+        pipe.set.assert_called_once_with(
+            "gemini:model_health:m1:failures", 0, nx=True, ex=FAILURE_WINDOW_SECONDS
+        )
+        pipe.incr.assert_called_once_with("gemini:model_health:m1:failures")
+
+    @pytest.mark.asyncio
+    async def test_threshold_within_window_opens_and_resets_count(self):
+        mock_redis, pipe = _mock_redis([1, None, FAILURE_THRESHOLD, 0, 1, True, None], [True, 1, 2])
+        service = ModelHealthService(mock_redis)
+
+        await service.record_failure("m1", _api_error(503, "UNAVAILABLE"))
+
+        assert pipe.execute.await_count == 2
+        pipe.delete.assert_called_once_with("gemini:model_health:m1:failures", "gemini:model_health:m1:probe")
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens_circuit_immediately(self):
+        probing_since = str(time.time() - 1).encode()
+        mock_redis, pipe = _mock_redis([1, True, 1, 1, 1, True, probing_since], [True, 2, 2])
+        service = ModelHealthService(mock_redis)
+
+        await service.record_failure("m1", _api_error(503, "UNAVAILABLE"))
+
+        assert pipe.execute.await_count == 2
+        assert pipe.hset.call_args_list[-1].kwargs["mapping"]["open_until"] > time.time()
+        pipe.delete.assert_called_once_with("gemini:model_health:m1:failures", "gemini:model_health:m1:probe")
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_recorded(self):
+        mock_redis, pipe = _mock_redis()
+        service = ModelHealthService(mock_redis)
+
+        await service.record_failure("m1", _api_error(400, "INVALID_ARGUMENT"))
+
+        pipe.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_success_resets_state(self):
+        mock_redis, _ = _mock_redis()
+        service = ModelHealthService(mock_redis)
+
+        await service.record_success("m1")
+
+        mock_redis.delete.assert_awaited_once_with(
+            "gemini:model_health:m1", "gemini:model_health:m1:failures", "gemini:model_health:m1:probe"
+        )
+
+    @pytest.mark.asyncio
+    async def test_states_report_failures_in_current_window(self):
+        mock_redis, _ = _mock_redis([{b"last_error": b"500 INTERNAL"}, b"2", {}, None])
+        mock_redis.smembers = AsyncMock(return_value={b"m2"})
+        service = ModelHealthService(mock_redis)
+
+        states = await service.get_states(["m1"])
+
+        assert states["m1"]["state"] == "closed"
+        assert states["m1"]["failures"] == 2
+        assert states["m2"]["failures"] == 0
+
+
+class TestImageGenerationRouting:
+
+    @pytest.mark.asyncio
+    async def test_generation_goes_straight_to_first_healthy_model(self):
+        from app.services import gemini_service
+
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_images = AsyncMock(
+            return_value=MagicMock(generated_images=[])
+        )
+        health = MagicMock()
+        health.available_models = AsyncMock(return_value=[gemini_service.IMAGE_MODELS[2]])
+        health.record_success = AsyncMock()
+        health.record_failure = AsyncMock()
+
+        with patch.object(gemini_service, "client", mock_client), \
+                patch.object(gemini_service, "model_health", health):
+            await gemini_service.generate_character_image(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expression="happy",
+            )
+
+        called_models = [
+            call.kwargs["model"] for call in mock_client.aio.models.generate_images.call_args_list
+        ]
+        assert called_models == [gemini_service.IMAGE_MODELS[2]]
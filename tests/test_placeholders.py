@@ -0,0 +1,105 @@
+"""
+Tests for locally rendered placeholder images
+외부 placeholder 서비스 대신 Pillow로 그린 이미지를 한 번만 만들어 /static에서 서빙하는지 검증
+"""
+
+import io
+
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from PIL import Image
+
+from app.services.placeholder_service import (
+    PlaceholderRenderer,
+    default_placeholders,
+    ending_placeholder,
+    expression_placeholder,
+    render_placeholder,
+)
+from app.services.storage import MediaStaticFiles
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    return PlaceholderRenderer(directory=tmp_path / "placeholders" / "v1", base_url="/static/placeholders/v1")
+
+
+class TestRender:
+
+    def test_expression_placeholder_is_colored_png(self):
+        data = render_placeholder(expression_placeholder("happy", "female", "cute"))
+
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.format == "PNG"
+            assert image.size == (512, 512)
+            assert image.convert("RGB").getpixel((0, 0)) == (0xFF, 0xD7, 0x00)
+
+    def test_names_are_safe_file_names(self):
+        placeholder = expression_placeholder("happy", "female", "../Weird Style")
+
+        assert placeholder.name == "expression-happy-female-weird-style"
+
+    def test_default_set_has_unique_names(self):
+        names = [placeholder.name for placeholder in default_placeholders()]
+
+        assert len(names) == len(set(names))
+        assert "ending-happy" in names and "ending-sad" in names
+
+
+class TestRenderer:
+
+    def test_renders_once_then_serves_from_memory(self, renderer):
+        placeholder = expression_placeholder("sad", "male", "cool")
+
+        with patch("app.services.placeholder_service.render_placeholder",
+                   wraps=render_placeholder) as render:
+            first = renderer.url(placeholder)
+            second = renderer.url(placeholder)
+
+        assert first == second == "/static/placeholders/v1/expression-sad-male-cool.png"
+        assert (renderer.directory / "expression-sad-male-cool.png").is_file()
+        render.assert_called_once()
+
+    def test_disk_cache_survives_restart(self, renderer):
+        assert renderer.prerender([ending_placeholder(True)]) == 1
+
+        restarted = PlaceholderRenderer(directory=renderer.directory, base_url=renderer.base_url)
+        with patch("app.services.placeholder_service.render_placeholder") as render:
+            assert restarted.prerender([ending_placeholder(True)]) == 0
+
+        render.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_served_with_immutable_cache_headers(self, renderer, tmp_path):
+        url = renderer.url(ending_placeholder(False))
+        app = FastAPI()
+        app.mount("/static", MediaStaticFiles(directory=str(tmp_path)), name="static")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert "immutable" in response.headers["cache-control"]
+
+
+class TestCallSites:
+
+    def test_generation_failure_uses_local_placeholder(self, renderer):
+        from app.services import gemini_service
+
+        with patch("app.services.placeholder_service.placeholder_renderer", renderer):
+            url = gemini_service._get_placeholder_url("shy", "female", "pure")
+
+        assert url == "/static/placeholders/v1/expression-shy-female-pure.png"
+        assert (renderer.directory / "expression-shy-female-pure.png").is_file()
+
+    def test_fallback_scene_uses_local_placeholder(self, renderer):
+        from app.services import gemini_service
+
+        with patch("app.services.placeholder_service.placeholder_renderer", renderer):
+            content = gemini_service._get_fallback_content("cute", 3, 50)
+
+        assert content["image_url"] == "/static/placeholders/v1/scene.png"
@@ -0,0 +1,103 @@
+"""
+Tests for server-side pre-blurred special images
+비프리미엄 사용자에게 원본 대신 생성 시 만든 작은 blur 이미지를 내려주는지 검증
+"""
+
+import io
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+from PIL import Image
+
+from app.services.image_pipeline import blurred_url, encode_variants
+
+ORIGINAL = "/static/images/characters/abc.png"
+BLURRED = "/static/images/characters/abc_blurred_256.webp"
+VARIANTS = {ORIGINAL: {"webp": {"1024": "/static/images/characters/abc_1024.webp"}, "blurred": {"256": BLURRED}}}
+
+
+def _png(size: int = 1024) -> bytes:
+    image = Image.new("RGB", (size, size), (255, 255, 255))
+    image.paste((0, 0, 0), (0, 0, size // 2, size))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _session(is_premium: bool) -> AsyncMock:
+    found = MagicMock()
+    found.scalar_one_or_none.return_value = MagicMock(user=MagicMock(is_premium=is_premium))
+    db = AsyncMock()
+    db.execute.return_value = found
+    return db
+
+
+class TestBlurredVariant:
+
+    def test_small_and_blurred(self):
+        encoded = encode_variants(_png(), (256,), ("webp",), blurred=True)
+
+        data = encoded["blurred"]["256"]
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.size == (256, 256)
+            # 흑백 경계가 blur로 번져서 중간 톤이 생김
+            assert 0 < image.convert("L").getpixel((128, 128)) < 255
+
+    def test_not_generated_by_default(self):
+        assert "blurred" not in encode_variants(_png(64), (256,), ("webp",))
+
+    def test_blurred_url(self):
+        assert blurred_url(VARIANTS[ORIGINAL]) == BLURRED
+        assert blurred_url({"webp": {"256": "/x.webp"}}) is None
+        assert blurred_url(None) is None
+
+
+class TestSpecialImageEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_non_premium_gets_preblurred_url(self):
+        from app.api import scenes
+
+        with patch.object(scenes, "get_image_variants", AsyncMock(return_value=VARIANTS)):
+            response = await scenes.get_special_image(uuid4(), ORIGINAL, db=_session(is_premium=False))
+
+        assert response.image_url == BLURRED
+        assert response.is_blurred is True
+        assert response.is_preblurred is True
+
+    @pytest.mark.asyncio
+    async def test_non_premium_without_variant_falls_back_to_original(self):
+        from app.api import scenes
+
+        with patch.object(scenes, "get_image_variants", AsyncMock(return_value={})):
+            response = await scenes.get_special_image(uuid4(), ORIGINAL, db=_session(is_premium=False))
+
+        assert response.image_url == ORIGINAL
+        assert response.is_blurred is True
+        assert response.is_preblurred is False
+
+    @pytest.mark.asyncio
+    async def test_premium_gets_original_without_lookup(self):
+        from app.api import scenes
+
+        lookup = AsyncMock(return_value=VARIANTS)
+        with patch.object(scenes, "get_image_variants", lookup):
+            response = await scenes.get_special_image(uuid4(), ORIGINAL, db=_session(is_premium=True))
+
+        assert response.image_url == ORIGINAL
+        assert response.is_blurred is False
+        lookup.assert_not_awaited()
+
+
+class TestGallery:
+
+    def test_only_special_and_ending_images_are_swapped(self):
+        from app.api.users import _gallery_image_response
+
+        special = MagicMock(id=uuid4(), image_url=ORIGINAL, image_type="special", expression_type=None)
+        expression = MagicMock(id=uuid4(), image_url=ORIGINAL, image_type="expression", expression_type="happy")
+
+        assert _gallery_image_response(special, False, VARIANTS).image_url == BLURRED
+        assert _gallery_image_response(expression, False, VARIANTS).image_url == ORIGINAL
+        assert _gallery_image_response(special, True, VARIANTS).image_url == ORIGINAL
@@ -0,0 +1,154 @@
+"""
+Tests for Gemini rate limiter
+우선순위 레인별로 Redis 토큰 버킷을 나눠 쓰고, deadline 안에 토큰이 없으면 포기하는지 검증
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.rate_limiter import (
+    GeminiRateLimiter,
+    Priority,
+    PRIORITY_RESERVE,
+    RateLimitExceeded,
+)
+
+QUOTAS = {"test-model": {"rpm": 60, "tpm": 600}}
+
+
+def _limiter(script_results) -> tuple[GeminiRateLimiter, AsyncMock]:
+    mock_redis = MagicMock()
+    script = AsyncMock(side_effect=script_results)
+    mock_redis.register_script.return_value = script
+    return GeminiRateLimiter(mock_redis, QUOTAS), script
+
+
+class TestBucketArguments:
+
+    def test_one_bucket_per_quota_dimension(self):
+        limiter, _ = _limiter([])
+
+        keys, args = limiter._bucket_args("test-model", Priority.INTERACTIVE, tokens=42)
+
+        assert keys == ["gemini:ratelimit:test-model:rpm", "gemini:ratelimit:test-model:tpm"]
+        # (capacity, refill/sec, cost, reserve) per bucket
+        assert args[:4] == [60, 1.0, 1, 0.0]
+        assert args[4:] == [600, 10.0, 42, 0.0]
+
+    def test_lower_priority_must_leave_a_reserve(self):
+        limiter, _ = _limiter([])
+
+        _, interactive = limiter._bucket_args("test-model", Priority.INTERACTIVE, tokens=0)
+        _, video = limiter._bucket_args("test-model", Priority.VIDEO, tokens=0)
+
+        assert interactive[3] == 0.0
+        assert video[3] == 60 * PRIORITY_RESERVE[Priority.VIDEO]
+        assert PRIORITY_RESERVE[Priority.SPECIAL_EVENT] < PRIORITY_RESERVE[Priority.EXPRESSION]
+
+
+class TestAcquire:
+
+    @pytest.mark.asyncio
+    async def test_acquires_immediately_when_tokens_available(self):
+        limiter, script = _limiter([b"0"])
+
+        await limiter.acquire("test-model", Priority.INTERACTIVE)
+
+        script.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill_then_acquires(self):
+        limiter, script = _limiter([b"0.01", b"0"])
+
+        await limiter.acquire("test-model", Priority.EXPRESSION)
+
+        assert script.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_at_deadline(self):
+        limiter, _ = _limiter([b"30"])
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(
+                "test-model", Priority.VIDEO, deadline=time.monotonic() + 1
+            )
+
+    @pytest.mark.asyncio
+    async def test_unlimited_model_skips_redis(self):
+        limiter, script = _limiter([])
+
+        await limiter.acquire("unknown-model", Priority.VIDEO)
+
+        script.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_fails_open(self):
+        limiter, _ = _limiter(RedisConnectionError("down"))
+
+        await limiter.acquire("test-model", Priority.INTERACTIVE)
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_waiter_goes_first(self):
+        order = []
+        results = iter([b"0.05", b"0", b"0"])
+
+        async def fake_script(keys, args):
+            return next(results)
+
+        mock_redis = MagicMock()
+        mock_redis.register_script.return_value = fake_script
+        limiter = GeminiRateLimiter(mock_redis, QUOTAS)
+
+        async def call(priority):
+            await limiter.acquire("test-model", priority)
+            order.append(priority)
+
+        interactive = asyncio.create_task(call(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        video = asyncio.create_task(call(Priority.VIDEO))
+        await asyncio.gather(interactive, video)
+
+        assert order == [Priority.INTERACTIVE, Priority.VIDEO]
+
+
+class TestHeadroom:
+
+    @staticmethod
+    def _headroom_limiter(redis_now: float, levels: list) -> GeminiRateLimiter:
+        mock_redis = MagicMock()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[(int(redis_now), int(redis_now % 1 * 1_000_000)), *levels])
+        mock_redis.pipeline.return_value = pipe
+        return GeminiRateLimiter(mock_redis, QUOTAS)
+
+    @pytest.mark.asyncio
+    async def test_reports_the_scarcest_dimension(self):
+        now = time.time()
+        limiter = self._headroom_limiter(now, [
+            [b"30", str(now).encode()],  # rpm: 30/60
+            [None, None],  # tpm: 아직 사용 안 함
+        ])
+
+        assert await limiter.headroom("test-model") == pytest.approx(0.5, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_refill_uses_redis_clock_not_worker_clock(self, monkeypatch):
+        redis_now = 1_700_000_000.0
+        # 워커 시계가 10분 앞서 있어도 리필로 가득 찬 것처럼 보이지 않음
+        monkeypatch.setattr(time, "time", lambda: redis_now + 600)
+        limiter = self._headroom_limiter(redis_now + 6, [[b"30", str(redis_now).encode()], [None, None]])
+
+        # 6초 경과 × 1 token/s
+        assert await limiter.headroom("test-model") == pytest.approx(36 / 60)
+
+    @pytest.mark.asyncio
+    async def test_unknown_when_redis_is_down(self):
+        mock_redis = MagicMock()
+        mock_redis.pipeline.return_value.execute = AsyncMock(side_effect=RedisConnectionError("down"))
+        limiter = GeminiRateLimiter(mock_redis, QUOTAS)
+
+        assert await limiter.headroom("test-model") == 0.0
@@ -0,0 +1,186 @@
+"""
+Tests for read-replica routing with read-your-writes
+읽기 전용 엔드포인트가 복제본을 쓰고, 방금 쓰인 세션/사용자는 primary에서 읽는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette.requests import Request
+
+from app.core import database
+from app.core.recent_writes import (
+    RecentWrites,
+    _collect_flushed,
+    _commit_collected,
+    _discard_collected,
+    committed_keys,
+    request_keys,
+)
+from app.models.game import GameSession, Scene
+from app.schemas.game import ChoiceSelect
+from app.services.session_state import SessionState
+
+
+def _request(path_params: dict | None = None, query: str = "") -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [],
+        "query_string": query.encode(),
+        "path_params": path_params or {},
+    })
+
+
+def _session(new=(), dirty=()) -> MagicMock:
+    session = MagicMock()
+    session.info = {}
+    session.new, session.dirty, session.deleted = list(new), list(dirty), []
+    return session
+
+
+def _redis(exists: int = 0) -> MagicMock:
+    redis = MagicMock()
+    redis.pipeline.return_value.execute = AsyncMock()
+    redis.exists = AsyncMock(return_value=exists)
+    return redis
+
+
+class TestWriteTracking:
+
+    def test_committed_rows_produce_session_and_user_keys(self):
+        game = GameSession(id=uuid4(), user_id=uuid4(), character_id=1)
+        scene = Scene(id=uuid4(), session_id=game.id, scene_number=2)
+        session = _session(new=[scene], dirty=[game])
+
+        _collect_flushed(session, None)
+        assert committed_keys(session) == set()  # 커밋 전에는 기록하지 않음
+        _commit_collected(session)
+
+        assert committed_keys(session) == {f"session:{game.id}", f"user:{game.user_id}"}
+
+    def test_rolled_back_writes_are_dropped(self):
+        game = GameSession(id=uuid4(), user_id=uuid4(), character_id=1)
+        session = _session(dirty=[game])
+
+        _collect_flushed(session, None)
+        _discard_collected(session)
+        _commit_collected(session)
+
+        assert committed_keys(session) == set()
+
+    def test_request_keys_from_path_and_query(self):
+        session_id, user_id = uuid4(), uuid4()
+
+        assert request_keys(_request({"session_id": str(session_id)})) == {f"session:{session_id}"}
+        assert request_keys(_request(query=f"user_id={user_id}")) == {f"user:{user_id}"}
+        assert request_keys(_request()) == set()
+
+
+class TestRecentWrites:
+
+    @pytest.mark.asyncio
+    async def test_local_mark_is_seen_without_redis(self):
+        redis = _redis()
+        tracker = RecentWrites(redis, ttl=5)
+
+        await tracker.mark({"session:1"})
+
+        assert await tracker.any_recent({"session:1"}) is True
+        redis.exists.assert_not_awaited()
+        redis.pipeline.return_value.set.assert_called_once_with("db:recent_write:session:1", 1, px=5000)
+
+    @pytest.mark.asyncio
+    async def test_other_worker_writes_come_from_redis(self):
+        assert await RecentWrites(_redis(exists=1), ttl=5).any_recent({"user:1"}) is True
+        assert await RecentWrites(_redis(exists=0), ttl=5).any_recent({"user:1"}) is False
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_reads_from_primary(self):
+        redis = _redis()
+        redis.exists.side_effect = RedisConnectionError("down")
+
+        assert await RecentWrites(redis, ttl=5).any_recent({"user:1"}) is True
+
+    @pytest.mark.asyncio
+    async def test_no_keys_never_recent(self):
+        redis = _redis(exists=1)
+
+        assert await RecentWrites(redis, ttl=5).any_recent(set()) is False
+        redis.exists.assert_not_awaited()
+
+
+class TestGetReadDb:
+
+    @staticmethod
+    def _maker(name: str) -> MagicMock:
+        session = AsyncMock(name=name)
+        maker = MagicMock()
+        maker.return_value.__aenter__.return_value = session
+        return maker
+
+    @pytest.fixture
+    def makers(self, monkeypatch):
+        primary, replica = self._maker("primary"), self._maker("replica")
+        monkeypatch.setattr(database, "read_engine", MagicMock())
+        monkeypatch.setattr(database, "async_session_maker", primary)
+        monkeypatch.setattr(database, "read_session_maker", replica)
+        return primary, replica
+
+    async def _session_for(self, request: Request):
+        dependency = database.get_read_db(request)
+        session = await dependency.__anext__()
+        await dependency.aclose()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, makers, monkeypatch):
+        primary, replica = makers
+        monkeypatch.setattr(database.recent_writes, "any_recent", AsyncMock(return_value=False))
+
+        session = await self._session_for(_request({"session_id": str(uuid4())}))
+
+        assert session is replica.return_value.__aenter__.return_value
+
+    @pytest.mark.asyncio
+    async def test_recent_write_reads_from_primary(self, makers, monkeypatch):
+        primary, replica = makers
+        session_id = uuid4()
+        any_recent = AsyncMock(return_value=True)
+        monkeypatch.setattr(database.recent_writes, "any_recent", any_recent)
+
+        session = await self._session_for(_request({"session_id": str(session_id)}))
+
+        assert session is primary.return_value.__aenter__.return_value
+        any_recent.assert_awaited_once_with({f"session:{session_id}"})
+
+    @pytest.mark.asyncio
+    async def test_user_games_read_after_select_choice_goes_to_primary(self, makers, monkeypatch):
+        from app.api import games
+
+        primary, replica = makers
+        state = SessionState(id=uuid4(), user_id=uuid4(), affection=50, current_scene=3, status="playing")
+        db = primary.return_value.__aenter__.return_value
+        db.info = {}
+        db.execute.return_value.first = MagicMock(
+            return_value=MagicMock(affection=55, current_scene=4, status="playing")
+        )
+        db.commit.side_effect = lambda: _commit_collected(db)
+        monkeypatch.setattr(database, "recent_writes", RecentWrites(_redis(), ttl=5))
+        monkeypatch.setattr(games.session_state, "get", AsyncMock(return_value=state))
+        monkeypatch.setattr(games.session_state, "invalidate", AsyncMock())
+        monkeypatch.setattr(games.session_state, "_publish", AsyncMock())
+        monkeypatch.setattr(games.scene_prefetcher, "resolve", AsyncMock())
+
+        # POST /games/{session_id}/select (turn + 선택지 기록 모두 bulk UPDATE)
+        write = database.get_db(_request({"session_id": str(state.id)}))
+        await games.select_choice(state.id, ChoiceSelect(affection_delta=5, choice_index=0), await write.__anext__())
+        with pytest.raises(StopAsyncIteration):
+            await write.__anext__()
+
+        # GET /games?user_id=
+        session = await self._session_for(_request(query=f"user_id={state.user_id}"))
+
+        assert session is db
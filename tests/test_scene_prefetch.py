@@ -0,0 +1,148 @@
+"""
+Tests for speculative next-scene prefetch
+선택지별 다음 씬을 미리 생성하고, 선택이 확정되면 나머지 분기를 취소하는지 검증
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import scene_prefetch
+from app.services.scene_prefetch import ScenePrefetcher, rank_choices
+
+CHOICES = [
+    {"text": "다른 곳을 본다", "delta": -5, "expression": "sad"},
+    {"text": "따뜻하게 웃어준다", "delta": 2, "expression": "happy"},
+    {"text": "고개를 끄덕인다", "delta": 0, "expression": "neutral"},
+]
+
+SETTING = SimpleNamespace(gender="female", style="cute", mbti="ENFP")
+
+
+def _mock_redis() -> MagicMock:
+    mock_redis = MagicMock()
+    mock_redis.set = AsyncMock()
+    mock_redis.getdel = AsyncMock(return_value=None)
+    mock_redis.delete = AsyncMock()
+    return mock_redis
+
+
+def _limiter(headroom: float) -> MagicMock:
+    limiter = MagicMock()
+    limiter.headroom = AsyncMock(return_value=headroom)
+    return limiter
+
+
+async def _schedule(prefetcher, session_id, affection=50):
+    return await prefetcher.schedule(
+        session_id=session_id,
+        scene_number=3,
+        character_setting=SETTING,
+        user_mbti="INFP",
+        affection=affection,
+        dialogue="안녕!",
+        choices=CHOICES,
+    )
+
+
+def test_most_likely_choice_is_the_positive_one():
+    assert rank_choices(CHOICES) == [1, 2, 0]
+
+
+class TestSchedule:
+
+    @pytest.mark.asyncio
+    async def test_only_top_choice_when_quota_is_tight(self):
+        prefetcher = ScenePrefetcher(_mock_redis())
+        request = AsyncMock(return_value={"dialogue": "d", "choices": []})
+
+        with patch.object(scene_prefetch, "rate_limiter", _limiter(0.1)), \
+                patch.object(scene_prefetch.gemini_service, "request_scene_content", request):
+            started = await _schedule(prefetcher, uuid4())
+            await asyncio.sleep(0)
+
+        assert started == [1]
+        kwargs = request.await_args.kwargs
+        assert kwargs["scene_number"] == 4
+        assert kwargs["affection"] == 52
+        assert kwargs["previous_choice"] == "따뜻하게 웃어준다"
+        assert kwargs["priority"] == scene_prefetch.Priority.PREFETCH
+
+    @pytest.mark.asyncio
+    async def test_all_choices_when_quota_allows(self):
+        prefetcher = ScenePrefetcher(_mock_redis())
+        request = AsyncMock(return_value={"dialogue": "d", "choices": []})
+
+        with patch.object(scene_prefetch, "rate_limiter", _limiter(0.9)), \
+                patch.object(scene_prefetch.gemini_service, "request_scene_content", request):
+            started = await _schedule(prefetcher, uuid4())
+            await asyncio.sleep(0)
+
+        assert sorted(started) == [0, 1, 2]
+        assert request.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_branches_that_end_the_game_are_skipped(self):
+        prefetcher = ScenePrefetcher(_mock_redis())
+
+        with patch.object(scene_prefetch, "rate_limiter", _limiter(0.9)), \
+                patch.object(scene_prefetch.gemini_service, "request_scene_content", AsyncMock()):
+            started = await _schedule(prefetcher, uuid4(), affection=5)
+
+        assert 0 not in started
+
+
+class TestTakeAndResolve:
+
+    @pytest.mark.asyncio
+    async def test_prefetched_content_is_served_once(self):
+        prefetcher = ScenePrefetcher(_mock_redis())
+        session_id = uuid4()
+        content = {"dialogue": "미리 만든 대사", "choices": CHOICES}
+
+        with patch.object(scene_prefetch, "rate_limiter", _limiter(0.1)), \
+                patch.object(scene_prefetch.gemini_service, "request_scene_content", AsyncMock(return_value=content)):
+            await _schedule(prefetcher, session_id)
+            served = await prefetcher.take(session_id, 4, 1, affection=52)
+            again = await prefetcher.take(session_id, 4, 1, affection=52)
+
+        assert served == content
+        assert again is None
+
+    @pytest.mark.asyncio
+    async def test_changed_affection_discards_prefetch(self):
+        mock_redis = _mock_redis()
+        mock_redis.getdel.return_value = json.dumps({"affection": 52, "content": {"dialogue": "x"}})
+        prefetcher = ScenePrefetcher(mock_redis)
+
+        assert await prefetcher.take(uuid4(), 4, 1, affection=64) is None
+
+    @pytest.mark.asyncio
+    async def test_resolve_cancels_losing_branches(self):
+        mock_redis = _mock_redis()
+        prefetcher = ScenePrefetcher(mock_redis)
+        session_id = uuid4()
+
+        async def slow_request(**kwargs):
+            await asyncio.sleep(5)
+
+        with patch.object(scene_prefetch, "rate_limiter", _limiter(0.9)), \
+                patch.object(scene_prefetch.gemini_service, "request_scene_content", slow_request):
+            await _schedule(prefetcher, session_id)
+            tasks = {key[2]: task for key, task in prefetcher._tasks.items()}
+
+            await prefetcher.resolve(session_id, 4, 1)
+            await asyncio.sleep(0)
+
+        assert tasks[0].cancelled() and tasks[2].cancelled()
+        assert not tasks[1].done()
+        deleted = mock_redis.delete.await_args.args
+        assert deleted == (
+            f"scene_prefetch:{session_id}:4:0",
+            f"scene_prefetch:{session_id}:4:2",
+        )
+        tasks[1].cancel()
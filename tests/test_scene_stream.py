@@ -0,0 +1,182 @@
+"""
+Tests for streaming scene generation
+Gemini 스트리밍 응답에서 대사를 도착하는 대로 꺼내고, 끝나면 선택지를 보내는지 검증
+"""
+
+import json
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.exc import OperationalError
+
+from app.services import gemini_service
+from app.services.json_stream_parser import JsonStringFieldStreamer
+
+SCENE_JSON = json.dumps({
+    "dialogue": "에, 에잇... \"갑자기\" 그런 말 하면 어떡해! 💕",
+    "choices": [
+        {"text": "a", "delta": 1, "expression": "shy"},
+        {"text": "b", "delta": 0, "expression": "neutral"},
+        {"text": "c", "delta": -5, "expression": "sad"},
+    ],
+})
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestJsonStringFieldStreamer:
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_decodes_field_regardless_of_chunk_boundaries(self, size):
+        # ensure_ascii=True → 한글/이모지가 \uXXXX (서로게이트 쌍 포함)로 잘려서 도착
+        text = json.dumps(json.loads(SCENE_JSON))
+        streamer = JsonStringFieldStreamer("dialogue")
+
+        decoded = "".join(streamer.feed(chunk) for chunk in _chunks(text, size))
+
+        assert decoded == json.loads(SCENE_JSON)["dialogue"]
+        assert streamer.done
+
+    def test_emits_text_before_field_is_complete(self):
+        streamer = JsonStringFieldStreamer("dialogue")
+
+        assert streamer.feed('{"dialo') == ""
+        assert streamer.feed('gue": "안녕') == "안녕"
+        assert streamer.feed('하세요", "choices": [') == "하세요"
+        assert streamer.feed('{"text": "x"}]}') == ""
+        assert streamer.value == "안녕하세요"
+
+
+def _fake_stream(chunks, error: Exception | None = None):
+    async def stream(**kwargs):
+        for chunk in chunks:
+            yield chunk
+        if error:
+            raise error
+    return stream
+
+
+async def _collect(**overrides):
+    kwargs = dict(character_setting=None, user_mbti="INFP", scene_number=1, affection=30)
+    kwargs.update(overrides)
+    return [event async for event in gemini_service.stream_scene_content(**kwargs)]
+
+
+class TestStreamSceneContent:
+
+    @pytest.fixture(autouse=True)
+    def healthy_model(self):
+        health = MagicMock()
+        health.is_available = AsyncMock(return_value=True)
+        with patch.object(gemini_service, "model_health", health):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_dialogue_then_choices_then_done(self):
+        with patch.object(gemini_service, "_generate_content_stream", _fake_stream(_chunks(SCENE_JSON, 5))):
+            events = await _collect()
+
+        types_ = [event["type"] for event in events]
+        assert types_[-2:] == ["choices", "done"]
+        assert set(types_[:-2]) == {"dialogue"}
+        assert len(types_) > 3
+
+        dialogue = "".join(event["text"] for event in events if event["type"] == "dialogue")
+        assert dialogue == json.loads(SCENE_JSON)["dialogue"]
+        assert events[-2]["choices"] == json.loads(SCENE_JSON)["choices"]
+        assert events[-1]["content"]["dialogue"] == dialogue
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_resets_to_fallback(self):
+        partial = _chunks(SCENE_JSON, 5)[:6]
+        with patch.object(
+            gemini_service, "_generate_content_stream", _fake_stream(partial, RuntimeError("503 UNAVAILABLE"))
+        ):
+            events = await _collect()
+
+        types_ = [event["type"] for event in events]
+        assert "reset" in types_
+        after_reset = events[types_.index("reset") + 1:]
+        assert after_reset[0]["type"] == "dialogue"
+        assert after_reset[0]["text"] == events[-1]["content"]["dialogue"]
+        assert len(events[-1]["content"]["choices"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_streaming_helper_uses_async_stream_api(self):
+        async def stream():
+            for text in ["{\"dialogue\": ", "\"hi\"}"]:
+                yield MagicMock(text=text)
+
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content_stream = AsyncMock(return_value=stream())
+        health = MagicMock()
+        health.record_success = AsyncMock()
+        health.record_failure = AsyncMock()
+        limiter = MagicMock()
+        limiter.acquire = AsyncMock()
+
+        with patch.object(gemini_service, "client", mock_client), \
+                patch.object(gemini_service, "model_health", health), \
+                patch.object(gemini_service, "rate_limiter", limiter):
+            chunks = [
+                chunk async for chunk in gemini_service._generate_content_stream(
+                    model=gemini_service.TEXT_MODEL, contents="prompt"
+                )
+            ]
+
+        assert "".join(chunks) == '{"dialogue": "hi"}'
+        health.record_success.assert_awaited_once()
+
+
+class TestSceneStreamEndpoint:
+
+    @staticmethod
+    async def _events(write_db: AsyncMock) -> tuple[list[tuple[str, dict]], AsyncMock]:
+        from app.api import scenes
+        from app.services.session_state import SessionState
+
+        session_id = uuid4()
+        session = SessionState(id=session_id, user_id=uuid4(), affection=30, current_scene=2, status="playing")
+        context = scenes.SceneContext(session=session, neutral_image_url="/n.png")
+        content = json.loads(SCENE_JSON)
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = write_db
+
+        with patch.object(scenes, "_load_scene_context", AsyncMock(return_value=context)), \
+                patch.object(scenes, "_take_prefetched_content", AsyncMock(return_value=content)), \
+                patch.object(scenes, "_schedule_prefetch", AsyncMock()) as schedule, \
+                patch.object(scenes, "async_session_maker", session_maker):
+            response = await scenes.generate_scene_stream(session_id, db=AsyncMock())
+            body = "".join([chunk async for chunk in response.body_iterator])
+
+        events = []
+        for message in body.strip().split("\n\n"):
+            event_line, data_line = message.split("\n")
+            events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+        return events, schedule
+
+    @pytest.mark.asyncio
+    async def test_saved_scene_is_the_last_event(self):
+        write_db = AsyncMock()
+        write_db.add = MagicMock()
+
+        events, schedule = await self._events(write_db)
+
+        assert [event for event, _ in events] == ["dialogue", "choices", "scene"]
+        assert events[-1][1]["scene_number"] == 2
+        schedule.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_save_failure_ends_stream_with_error_event(self):
+        write_db = AsyncMock()
+        write_db.add = MagicMock()
+        write_db.commit.side_effect = OperationalError("INSERT", {}, Exception("connection reset"))
+
+        events, schedule = await self._events(write_db)
+
+        assert [event for event, _ in events] == ["dialogue", "choices", "error"]
+        assert events[-1][1] == {"detail": "Failed to save scene"}
+        schedule.assert_not_awaited()
@@ -0,0 +1,122 @@
+"""
+Tests for the atomic select_choice turn update
+턴이 UPDATE ... RETURNING 한 번으로 적용되고(제한/엔딩 판정은 SQL), 같은 턴의 중복 클릭은 409,
+표정 URL은 캐시된 맵에서 읽는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api import games
+from app.schemas.game import ChoiceSelect
+from app.services.session_state import SessionState, SessionStateService
+
+
+def _state(**overrides) -> SessionState:
+    values = dict(id=uuid4(), user_id=uuid4(), affection=95, current_scene=3, status="playing", setting_id=uuid4())
+    values.update(overrides)
+    return SessionState(**values)
+
+
+def _db() -> AsyncMock:
+    db = AsyncMock()
+    db.info = {}
+    return db
+
+
+def _result(row) -> MagicMock:
+    result = MagicMock()
+    result.first.return_value = row
+    return result
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestAdvanceTurn:
+
+    @pytest.mark.asyncio
+    async def test_single_conditional_update_returning(self):
+        state = _state()
+        db = _db()
+        db.execute.return_value = _result(MagicMock(affection=100, current_scene=4, status="happy_ending"))
+
+        advanced = await SessionStateService(AsyncMock()).advance_turn(db, state, 10)
+
+        assert (advanced.affection, advanced.current_scene, advanced.status) == (100, 4, "happy_ending")
+        assert advanced.setting_id == state.setting_id
+        db.execute.assert_awaited_once()
+        sql = _sql(db.execute.await_args.args[0])
+        assert "greatest" in sql and "least" in sql
+        assert "CASE WHEN" in sql
+        assert "AND game_sessions.current_scene = %(current_scene_2)s RETURNING" in sql
+        assert "RETURNING game_sessions.affection, game_sessions.current_scene, game_sessions.status" in sql
+
+    @pytest.mark.asyncio
+    async def test_turn_already_advanced_returns_none(self):
+        db = _db()
+        db.execute.return_value = _result(None)
+
+        assert await SessionStateService(AsyncMock()).advance_turn(db, _state(), 5) is None
+
+
+class TestSelectChoice:
+
+    @pytest.fixture
+    def services(self, monkeypatch):
+        state = _state(affection=50)
+        mocks = MagicMock()
+        mocks.get = AsyncMock(return_value=state)
+        mocks.commit = AsyncMock()
+        mocks.invalidate = AsyncMock()
+        mocks.resolve = AsyncMock()
+        mocks.expression = AsyncMock(return_value="/static/images/characters/happy.png")
+        monkeypatch.setattr(games.session_state, "get", mocks.get)
+        monkeypatch.setattr(games.session_state, "commit", mocks.commit)
+        monkeypatch.setattr(games.session_state, "invalidate", mocks.invalidate)
+        monkeypatch.setattr(games.scene_prefetcher, "resolve", mocks.resolve)
+        monkeypatch.setattr(games.expression_urls, "get", mocks.expression)
+        return state, mocks
+
+    @pytest.mark.asyncio
+    async def test_turn_choice_and_expression_without_session_load(self, services):
+        state, mocks = services
+        db = _db()
+        db.execute.side_effect = [
+            _result(MagicMock(affection=55, current_scene=4, status="playing")),  # 턴 적용
+            _result(MagicMock(id=uuid4())),  # 선택지 기록
+        ]
+
+        response = await games.select_choice(
+            state.id, ChoiceSelect(affection_delta=5, expression_type="happy", choice_index=1), db,
+        )
+
+        assert (response.new_affection, response.next_scene, response.status) == (55, 4, "playing")
+        assert response.expression_image_url == "/static/images/characters/happy.png"
+        assert db.execute.await_count == 2
+        scene_sql = _sql(db.execute.await_args_list[1].args[0])
+        assert scene_sql.startswith("UPDATE scenes SET selected_choice_index=")
+        assert "json_array_length(scenes.choices_offered) >" in scene_sql
+        mocks.commit.assert_awaited_once()
+        mocks.resolve.assert_awaited_once_with(state.id, 4, 1)
+        mocks.expression.assert_awaited_once_with(db, state.setting_id, "happy")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_click_conflicts(self, services):
+        state, mocks = services
+        db = _db()
+        db.execute.return_value = _result(None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await games.select_choice(state.id, ChoiceSelect(affection_delta=5, choice_index=0), db)
+
+        assert exc_info.value.status_code == 409
+        db.rollback.assert_awaited_once()
+        mocks.invalidate.assert_awaited_once_with(state.id)
+        mocks.commit.assert_not_awaited()
+        mocks.resolve.assert_not_awaited()
+
@@ -0,0 +1,119 @@
+"""
+Tests for the Redis hot game-session state
+턴 요청이 Redis 복사본에서 세션 상태를 읽고, 쓰기는 Postgres 커밋 후 복사본을 교체하는지 검증
+"""
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock, call
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.dialects import postgresql
+
+from app.api.scenes import check_special_event
+from app.services.session_state import SessionState, SessionStateService
+
+
+def _state(**overrides) -> SessionState:
+    values = dict(
+        id=uuid4(), user_id=uuid4(), affection=40, current_scene=3, status="playing", setting_id=uuid4(),
+    )
+    values.update(overrides)
+    return SessionState(**values)
+
+
+def _cache(cached=None) -> AsyncMock:
+    cache = AsyncMock()
+    cache.get_session.return_value = cached
+    return cache
+
+
+class TestSessionState:
+
+    def test_round_trips_through_json_dict(self):
+        state = _state(is_stolen=True, stolen_from_session_id=uuid4())
+
+        assert SessionState.from_dict(state.to_dict()) == state
+        assert isinstance(state.to_dict()["id"], str)
+
+    @pytest.mark.asyncio
+    async def test_hot_copy_served_without_db(self):
+        state = _state()
+        db = AsyncMock()
+
+        assert await SessionStateService(_cache(state.to_dict())).get(db, state.id) == state
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_once_and_fills_without_overwriting(self):
+        state = _state()
+        row = MagicMock(**{name: getattr(state, name) for name in state.to_dict()})
+        db = AsyncMock()
+        db.execute.return_value.first = MagicMock(return_value=row)
+        cache = _cache()
+
+        assert await SessionStateService(cache).get(db, state.id) == state
+
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "LEFT OUTER JOIN character_settings" in sql
+        cache.cache_session.assert_awaited_once_with(str(state.id), state.to_dict(), only_if_absent=True)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_db(self):
+        db = AsyncMock()
+        db.execute.return_value.first = MagicMock(return_value=None)
+        cache = _cache()
+        cache.get_session.side_effect = RedisConnectionError("down")
+
+        assert await SessionStateService(cache).get(db, uuid4()) is None
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_write_through_replaces_copy_after_commit(self):
+        state = _state()
+        manager = MagicMock()
+        cache, db = _cache(), AsyncMock()
+        db.info = {}
+        manager.attach_mock(cache, "cache")
+        manager.attach_mock(db, "db")
+        service = SessionStateService(cache)
+
+        new_state = await service.save(db, state, affection=45, current_scene=4)
+        await service.commit(db, state.id, new_state)
+
+        assert (new_state.affection, new_state.current_scene) == (45, 4)
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE game_sessions SET affection=")
+        assert [c for c in manager.mock_calls if c[0] != "db.execute"] == [
+            call.cache.invalidate_session(str(state.id)),
+            call.db.commit(),
+            call.cache.cache_session(str(state.id), new_state.to_dict(), only_if_absent=False),
+        ]
+        # bulk UPDATE라 flush로 모이지 않는 키 (읽기 복제본 read-your-writes)
+        assert {f"session:{state.id}", f"user:{state.user_id}"} <= db.info["recent_write_pending_keys"]
+
+    @pytest.mark.asyncio
+    async def test_commit_without_state_only_invalidates(self):
+        cache, db = _cache(), AsyncMock()
+        session_id = uuid4()
+
+        await SessionStateService(cache).commit(db, session_id)
+
+        db.commit.assert_awaited_once()
+        assert cache.invalidate_session.await_count == 2
+        cache.cache_session.assert_not_awaited()
+
+
+class TestTurnEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_non_event_turn_skips_the_database(self, monkeypatch):
+        state = _state(current_scene=3)
+        monkeypatch.setattr("app.api.scenes.session_state.get", AsyncMock(return_value=state))
+        db = AsyncMock()
+
+        response = await check_special_event(state.id, db)
+
+        assert response.is_special_event is False
+        db.execute.assert_not_awaited()
+        db.get.assert_not_awaited()
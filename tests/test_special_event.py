@@ -5,12 +5,14 @@ TASK-012: 특별 이벤트 시스템
 
 import uuid
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.api import scenes
 from app.models.game import GameSession, CharacterSetting
+from app.services.session_state import SessionState
 
 
 class TestSpecialEventAPI:
@@ -147,3 +149,47 @@ class TestSpecialEventAPI:
 
         assert response.status_code == 400
         assert "Game already ended" in response.json()["detail"]
+
+
+class TestSpecialEventSignedUrls:
+    """special_image_url도 다른 엔드포인트처럼 presigned URL로 반환"""
+
+    @pytest.fixture
+    def turn(self, monkeypatch):
+        state = SessionState(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), affection=50, current_scene=5,
+            status="playing", setting_id=uuid.uuid4(),
+        )
+        monkeypatch.setattr(scenes.session_state, "get", AsyncMock(return_value=state))
+        monkeypatch.setattr(scenes.blob_store, "acquire", AsyncMock())
+        monkeypatch.setattr(scenes.storage, "sign_url", lambda url: f"{url}?signed")
+        db = AsyncMock()
+        db.add = MagicMock()
+        db.get.return_value = MagicMock(character_design="design", design_hash="hash", art_style="anime")
+        db.execute.return_value.fetchall = MagicMock(return_value=[])
+        return state, db
+
+    @pytest.mark.asyncio
+    async def test_catalog_image_is_signed(self, turn, monkeypatch):
+        state, db = turn
+        reuse = MagicMock(image_url="https://bucket/images/event.png", event_type="beach")
+        monkeypatch.setattr(scenes.event_catalog, "next_unseen", AsyncMock(return_value=reuse))
+
+        response = await scenes.check_special_event(state.id, db)
+
+        assert response.special_image_url == "https://bucket/images/event.png?signed"
+
+    @pytest.mark.asyncio
+    async def test_generated_image_is_signed(self, turn, monkeypatch):
+        state, db = turn
+        monkeypatch.setattr(scenes.event_catalog, "next_unseen", AsyncMock(return_value=None))
+        monkeypatch.setattr(scenes.event_catalog, "add", AsyncMock())
+        monkeypatch.setattr(scenes.expression_urls, "get", AsyncMock(return_value=None))
+        monkeypatch.setattr(
+            scenes, "generate_special_event_image",
+            AsyncMock(return_value=("https://bucket/images/new.png", "desc", "festival")),
+        )
+
+        response = await scenes.check_special_event(state.id, db)
+
+        assert response.special_image_url == "https://bucket/images/new.png?signed"
@@ -0,0 +1,144 @@
+"""
+Tests for pluggable media storage backends
+로컬/S3 백엔드가 같은 인터페이스로 저장/조회/삭제하고, 생성 미디어에 immutable 캐시 헤더를 붙이는지 검증
+"""
+
+import io
+
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.services.storage import LocalStorage, MediaStaticFiles, S3Storage
+
+
+class TestLocalStorage:
+
+    @pytest.mark.asyncio
+    async def test_put_streams_file_objects(self, tmp_path):
+        storage = LocalStorage(root=tmp_path)
+
+        url = await storage.put("videos/characters/a.mp4", io.BytesIO(b"video"), "video/mp4")
+
+        assert url == "/static/videos/characters/a.mp4"
+        assert (tmp_path / "videos" / "characters" / "a.mp4").read_bytes() == b"video"
+        assert not list((tmp_path / "videos" / "characters").glob(".*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_put_if_absent_does_not_overwrite(self, tmp_path):
+        storage = LocalStorage(root=tmp_path)
+
+        first = await storage.put_if_absent("images/x.png", b"first", "image/png")
+        second = await storage.put_if_absent("images/x.png", b"second", "image/png")
+
+        assert first == ("/static/images/x.png", True)
+        assert second == ("/static/images/x.png", False)
+        assert (tmp_path / "images" / "x.png").read_bytes() == b"first"
+
+    @pytest.mark.asyncio
+    async def test_delete_and_availability(self, tmp_path):
+        storage = LocalStorage(root=tmp_path)
+        url = await storage.put("images/x.png", b"data", "image/png")
+        assert storage.is_available(url)
+
+        await storage.delete([storage.key_for_url(url), "images/missing.png"])
+
+        assert not storage.is_available(url)
+        # 이 저장소의 URL이 아니면 확인하지 않음
+        assert storage.is_available("https://placehold.co/512x512")
+        assert storage.key_for_url("https://placehold.co/512x512") is None
+
+
+class TestS3Storage:
+
+    def _storage(self, **kwargs) -> tuple[S3Storage, MagicMock]:
+        client = MagicMock()
+        storage = S3Storage(bucket="media", endpoint_url="http://localhost:9000", client=client, **kwargs)
+        return storage, client
+
+    @pytest.mark.asyncio
+    async def test_upload_sets_immutable_cache_headers(self):
+        storage, client = self._storage()
+
+        url = await storage.put("images/characters/abc.png", b"png", "image/png")
+
+        assert url == "http://localhost:9000/media/images/characters/abc.png"
+        kwargs = client.upload_fileobj.call_args.kwargs
+        assert kwargs["Bucket"] == "media"
+        assert kwargs["Key"] == "images/characters/abc.png"
+        assert kwargs["ExtraArgs"]["ContentType"] == "image/png"
+        assert "immutable" in kwargs["ExtraArgs"]["CacheControl"]
+
+    @pytest.mark.asyncio
+    async def test_missing_object_is_not_uploaded_twice(self):
+        from botocore.exceptions import ClientError
+
+        storage, client = self._storage()
+        client.head_object.side_effect = [ClientError({"Error": {"Code": "404"}}, "HeadObject"), {}]
+
+        assert (await storage.put_if_absent("images/a.png", b"png", "image/png"))[1] is True
+        assert (await storage.put_if_absent("images/a.png", b"png", "image/png"))[1] is False
+        assert client.upload_fileobj.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_surface_as_os_errors(self):
+        from botocore.exceptions import EndpointConnectionError
+
+        storage, client = self._storage()
+        client.upload_fileobj.side_effect = EndpointConnectionError(endpoint_url="http://localhost:9000")
+
+        with pytest.raises(OSError):
+            await storage.put("images/a.png", b"png", "image/png")
+
+    def test_public_base_url_for_cdn(self):
+        storage, _ = self._storage(public_base_url="https://cdn.example.com/")
+
+        assert storage.url("images/a.png") == "https://cdn.example.com/images/a.png"
+        assert storage.key_for_url("https://cdn.example.com/images/a.png?X-Amz-Signature=1") == "images/a.png"
+
+    def test_presigned_urls_only_for_own_objects(self):
+        storage, client = self._storage(presign=True, presign_expires=600)
+        client.generate_presigned_url.return_value = "http://localhost:9000/media/images/a.png?sig"
+
+        signed = storage.sign_url("http://localhost:9000/media/images/a.png")
+
+        assert signed.endswith("?sig")
+        client.generate_presigned_url.assert_called_once_with(
+            "get_object", Params={"Bucket": "media", "Key": "images/a.png"}, ExpiresIn=600
+        )
+        assert storage.sign_url("https://placehold.co/512x512") == "https://placehold.co/512x512"
+
+    def test_presign_disabled_returns_url_unchanged(self):
+        storage, client = self._storage()
+
+        assert storage.sign_url("http://localhost:9000/media/images/a.png") == "http://localhost:9000/media/images/a.png"
+        client.generate_presigned_url.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_batches(self):
+        storage, client = self._storage()
+
+        await storage.delete([f"images/{i}.png" for i in range(1500)])
+
+        assert client.delete_objects.call_count == 2
+
+
+class TestMediaStaticFiles:
+
+    @pytest.mark.asyncio
+    async def test_generated_media_is_immutable(self, tmp_path):
+        (tmp_path / "images" / "characters").mkdir(parents=True)
+        (tmp_path / "images" / "characters" / "a.png").write_bytes(b"png")
+        (tmp_path / "videos").mkdir()
+        (tmp_path / "videos" / "placeholder_happy.mp4").write_bytes(b"mp4")
+        app = FastAPI()
+        app.mount("/static", MediaStaticFiles(directory=str(tmp_path)), name="static")
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            generated = await client.get("/static/images/characters/a.png")
+            placeholder = await client.get("/static/videos/placeholder_happy.mp4")
+
+        assert generated.status_code == 200
+        assert "immutable" in generated.headers["cache-control"]
+        assert "cache-control" not in placeholder.headers
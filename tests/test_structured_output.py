@@ -0,0 +1,119 @@
+"""
+Tests for schema-constrained Gemini JSON output
+구조화 출력 스키마를 요청에 넣고, 응답은 한 번에 파싱하며, 실패율을 메트릭으로 남기는지 검증
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.metrics import metrics
+from app.schemas.generation import DynamicEvent, SceneContent
+from app.services import gemini_service
+from app.services.json_stream_parser import parse_json_object
+
+SCENE = {
+    "dialogue": "안녕!",
+    "choices": [
+        {"text": "a", "delta": 1, "expression": "happy"},
+        {"text": "b", "delta": 0, "expression": "neutral"},
+        {"text": "c", "delta": -5, "expression": "sad"},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestParseJsonObject:
+
+    def test_code_fence_and_surrounding_prose(self):
+        text = "여기 있습니다:\n```json\n" + json.dumps(SCENE, ensure_ascii=False) + "\n```\n감사합니다."
+        assert parse_json_object(text) == SCENE
+
+    def test_raw_newline_inside_string(self):
+        assert parse_json_object('{"dialogue": "첫 줄\n둘째 줄"}') == {"dialogue": "첫 줄\n둘째 줄"}
+
+    @pytest.mark.parametrize("text", [None, "", "no json here", '{"dialogue": "unterminated'])
+    def test_invalid_input_raises_value_error(self, text):
+        with pytest.raises(ValueError):
+            parse_json_object(text)
+
+
+class TestSceneResponseParsing:
+
+    def test_valid_response(self):
+        content = gemini_service._parse_scene_response(json.dumps(SCENE), 1)
+
+        assert content["dialogue"] == "안녕!"
+        assert content["choices"] == SCENE["choices"]
+        assert metrics.get("gemini_json_parse_total", kind="scene") == 1
+        assert metrics.get("gemini_json_parse_failures", kind="scene") == 0
+
+    def test_bad_choice_is_replaced_instead_of_dropping_the_response(self):
+        broken = dict(SCENE, choices=[SCENE["choices"][0], {"text": "x", "delta": "lots"}])
+
+        content = gemini_service._parse_scene_response(json.dumps(broken), 1)
+
+        assert content["dialogue"] == "안녕!"
+        assert len(content["choices"]) == 3
+        assert content["choices"][0] == SCENE["choices"][0]
+        assert metrics.get("gemini_json_parse_salvaged", kind="scene") == 1
+
+    def test_unparseable_response_is_counted(self):
+        with pytest.raises(ValueError):
+            gemini_service._parse_scene_response("I cannot help with that.", 1)
+
+        assert metrics.ratio("gemini_json_parse_failures", "gemini_json_parse_total", kind="scene") == 1.0
+
+
+class TestStructuredOutputRequests:
+
+    @pytest.mark.asyncio
+    async def test_scene_request_uses_response_schema(self):
+        generate = AsyncMock(return_value=MagicMock(text=json.dumps(SCENE)))
+        health = MagicMock()
+        health.is_available = AsyncMock(return_value=True)
+
+        with patch.object(gemini_service, "_generate_content", generate), \
+                patch.object(gemini_service, "model_health", health):
+            await gemini_service.request_scene_content(
+                character_setting=None, user_mbti=None, scene_number=1, affection=30
+            )
+
+        config = generate.await_args.kwargs["config"]
+        assert config.response_mime_type == "application/json"
+        assert config.response_schema is SceneContent
+
+    @pytest.mark.asyncio
+    async def test_dynamic_event_uses_response_schema(self):
+        event = {
+            "name": "rainy_cafe",
+            "description": "비 오는 카페",
+            "scene": "cafe by the window",
+            "mood": "cozy",
+            "outfit": "knit sweater",
+        }
+        generate = AsyncMock(return_value=MagicMock(text=json.dumps(event, ensure_ascii=False)))
+        health = MagicMock()
+        health.is_available = AsyncMock(return_value=True)
+        cache = MagicMock()
+
+        async def no_cache(content_type, prompt, create):
+            return await create()
+
+        cache.get_or_create = no_cache
+
+        with patch.object(gemini_service, "_generate_content", generate), \
+                patch.object(gemini_service, "model_health", health), \
+                patch.object(gemini_service, "generation_cache", cache):
+            result = await gemini_service.generate_dynamic_event_scene("female", "cute")
+
+        assert result == event
+        assert generate.await_args.kwargs["config"].response_schema is DynamicEvent
+        assert metrics.get("gemini_json_parse_total", kind="event") == 1
@@ -0,0 +1,157 @@
+"""
+Tests for streamed Veo video downloads
+청크 단위로 임시 파일에 받고, 크기 제한/체크섬을 확인한 뒤 저장소로 넘기는지 검증
+"""
+
+import base64
+import hashlib
+import tempfile
+
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.storage import LocalStorage
+from app.services.video_download import VideoDownloadError, download_video
+
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + b"x" * 5000
+
+
+def _client(body: bytes = VIDEO, headers: dict | None = None, status: int = 200) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status, content=body, headers=headers or {})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestDownloadVideo:
+
+    @pytest.mark.asyncio
+    async def test_streams_to_temp_file_with_sha256(self):
+        async with _client() as client:
+            downloaded = await download_video("https://example.com/v.mp4", chunk_size=1024, client=client)
+
+        try:
+            assert downloaded.path.read_bytes() == VIDEO
+            assert downloaded.size == len(VIDEO)
+            assert downloaded.sha256 == hashlib.sha256(VIDEO).hexdigest()
+        finally:
+            downloaded.unlink()
+        assert not downloaded.path.exists()
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_content_length(self):
+        async with _client() as client:
+            with pytest.raises(VideoDownloadError, match="too large"):
+                await download_video("https://example.com/v.mp4", max_bytes=100, client=client)
+
+    @pytest.mark.asyncio
+    async def test_stops_when_stream_exceeds_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+        # Content-Length 없이 chunked로 오는 응답
+        async def chunks():
+            yield VIDEO[:3000]
+            yield VIDEO[3000:]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=chunks())
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(VideoDownloadError, match="exceeded"):
+                await download_video("https://example.com/v.mp4", max_bytes=4000, client=client)
+
+        # 실패하면 임시 파일을 남기지 않음
+        assert not list(tmp_path.iterdir())
+
+    @pytest.mark.asyncio
+    async def test_md5_mismatch_is_rejected(self):
+        wrong = base64.b64encode(hashlib.md5(b"other").digest()).decode()
+        async with _client(headers={"x-goog-hash": f"crc32c=AAAA,md5={wrong}"}) as client:
+            with pytest.raises(VideoDownloadError, match="checksum"):
+                await download_video("https://example.com/v.mp4", client=client)
+
+    @pytest.mark.asyncio
+    async def test_matching_md5_is_accepted(self):
+        md5 = base64.b64encode(hashlib.md5(VIDEO).digest()).decode()
+        async with _client(headers={"x-goog-hash": f"crc32c=AAAA,md5={md5}"}) as client:
+            downloaded = await download_video("https://example.com/v.mp4", client=client)
+
+        downloaded.unlink()
+        assert downloaded.size == len(VIDEO)
+
+    @pytest.mark.asyncio
+    async def test_http_errors_propagate(self):
+        async with _client(status=404) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_video("https://example.com/v.mp4", client=client)
+
+
+class TestRedirects:
+
+    @pytest.mark.asyncio
+    async def test_api_key_is_not_forwarded_to_redirect_host(self, monkeypatch):
+        monkeypatch.setattr("app.services.video_download.settings.GEMINI_API_KEY", "secret")
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.url.host, request.headers.get("x-goog-api-key")))
+            if request.url.host == "generativelanguage.googleapis.com":
+                return httpx.Response(302, headers={"location": "https://storage.example.com/v.mp4?sig=1"})
+            return httpx.Response(200, content=VIDEO)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True) as client:
+            downloaded = await download_video(
+                "https://generativelanguage.googleapis.com/v1beta/files/abc:download?alt=media", client=client,
+            )
+
+        downloaded.unlink()
+        assert downloaded.size == len(VIDEO)
+        assert seen == [
+            ("generativelanguage.googleapis.com", "secret"),
+            ("storage.example.com", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_redirect_loop_is_rejected(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(302, headers={"location": "/again"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(VideoDownloadError, match="redirects"):
+                await download_video("https://example.com/v.mp4", client=client)
+
+
+class TestSaveGeneratedVideo:
+
+    @pytest.mark.asyncio
+    async def test_streamed_video_is_stored_by_hash(self, tmp_path):
+        from app.services import gemini_service
+
+        async def _download(url):
+            async with _client() as client:
+                return await download_video(url, client=client)
+
+        generated = MagicMock()
+        generated.video.uri = "https://generativelanguage.googleapis.com/v1beta/files/abc:download?alt=media"
+        digest = hashlib.sha256(VIDEO).hexdigest()
+
+        with patch.object(gemini_service, "download_video", _download), \
+                patch.object(gemini_service, "storage", LocalStorage(root=tmp_path)):
+            url = await gemini_service.save_generated_video(generated)
+
+        assert url == f"/static/videos/characters/{digest}.mp4"
+        assert (tmp_path / "videos" / "characters" / f"{digest}.mp4").read_bytes() == VIDEO
+
+    @pytest.mark.asyncio
+    async def test_inline_bytes_without_uri(self, tmp_path):
+        from app.services import gemini_service
+
+        generated = MagicMock()
+        generated.video.uri = None
+        generated.video.video_bytes = VIDEO
+
+        with patch.object(gemini_service, "storage", LocalStorage(root=tmp_path)):
+            url = await gemini_service.save_generated_video(generated)
+
+        assert url.endswith(f"{hashlib.sha256(VIDEO).hexdigest()}.mp4")
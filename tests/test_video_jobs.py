@@ -0,0 +1,181 @@
+"""
+Tests for background Veo video jobs
+비디오 생성이 요청을 붙잡지 않고 백그라운드 폴러에서 진행되는지 검증
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.game import VideoJob
+from app.services import gemini_service
+from app.services.video_job_service import (
+    POLL_BACKOFF_MAX_SECONDS,
+    POLL_BACKOFF_MIN_SECONDS,
+    VideoJobPoller,
+    next_poll_delay,
+)
+
+
+def _job(**overrides) -> VideoJob:
+    values = dict(
+        id=uuid.uuid4(),
+        expression_id=uuid.uuid4(),
+        status="queued",
+        prompt="animated character",
+        model_name=gemini_service.VIDEO_MODELS[0],
+        operation_name=None,
+        attempts=0,
+        next_poll_at=datetime.utcnow(),
+        created_at=datetime.utcnow(),
+    )
+    values.update(overrides)
+    return VideoJob(**values)
+
+
+class TestPollBackoff:
+
+    def test_backoff_starts_at_minimum(self):
+        assert next_poll_delay(0) == POLL_BACKOFF_MIN_SECONDS
+
+    def test_backoff_grows_and_is_capped(self):
+        assert next_poll_delay(2) > next_poll_delay(1)
+        assert next_poll_delay(50) == POLL_BACKOFF_MAX_SECONDS
+
+
+class TestVideoJobPoller:
+
+    @pytest.mark.asyncio
+    async def test_queued_job_starts_operation_and_records_name(self):
+        job = _job()
+        operation = MagicMock()
+        operation.name = "operations/abc"
+
+        with patch.object(gemini_service, "start_video_generation", AsyncMock(return_value=operation)):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "running"
+        assert job.operation_name == "operations/abc"
+        assert job.next_poll_at > datetime.utcnow()
+
+    @pytest.mark.asyncio
+    async def test_running_job_backs_off_while_not_done(self):
+        job = _job(status="running", operation_name="operations/abc", attempts=1)
+        operation = MagicMock(done=False)
+
+        with patch.object(gemini_service, "get_video_operation", AsyncMock(return_value=operation)):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "running"
+        assert job.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_job_stores_video_url(self):
+        job = _job(status="running", operation_name="operations/abc")
+        operation = MagicMock(done=True)
+        operation.response.generated_videos = [MagicMock()]
+
+        with patch.object(gemini_service, "get_video_operation", AsyncMock(return_value=operation)), \
+                patch.object(gemini_service, "save_generated_video", AsyncMock(return_value="/static/videos/characters/a.mp4")):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "succeeded"
+        assert job.video_url == "/static/videos/characters/a.mp4"
+
+    @pytest.mark.asyncio
+    async def test_failed_model_moves_to_next_model(self):
+        job = _job()
+
+        with patch.object(gemini_service, "start_video_generation", AsyncMock(side_effect=RuntimeError("429"))):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "queued"
+        assert job.model_name == gemini_service.VIDEO_MODELS[1]
+
+    @pytest.mark.asyncio
+    async def test_last_model_failure_marks_job_failed(self):
+        job = _job(model_name=gemini_service.VIDEO_MODELS[-1])
+
+        with patch.object(gemini_service, "start_video_generation", AsyncMock(side_effect=RuntimeError("500"))):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "failed"
+        assert "500" in job.error
+
+    @pytest.mark.asyncio
+    async def test_expired_job_is_failed_without_calling_veo(self):
+        job = _job(created_at=datetime.utcnow() - timedelta(hours=2))
+        start = AsyncMock()
+
+        with patch.object(gemini_service, "start_video_generation", start):
+            await VideoJobPoller()._advance(job)
+
+        assert job.status == "failed"
+        start.assert_not_awaited()
+
+
+class TestPollOnceTransactions:
+
+    @pytest.mark.asyncio
+    async def test_network_work_runs_with_no_session_open(self, monkeypatch):
+        job = _job(status="running", operation_name="operations/abc")
+        expression = MagicMock(setting_id=uuid.uuid4())
+        open_sessions = []
+        sessions = []
+
+        def session_maker():
+            db = AsyncMock()
+            claimed = MagicMock()
+            claimed.scalars.return_value.all.return_value = [job]
+            db.execute.return_value = claimed
+            db.get.return_value = expression
+            sessions.append(db)
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(side_effect=lambda: open_sessions.append(db) or db)
+            context.__aexit__ = AsyncMock(side_effect=lambda *exc: open_sessions.remove(db))
+            return context
+
+        async def advance(job):
+            assert open_sessions == []  # Veo 폴링/다운로드 중에는 연결/트랜잭션 없음
+            job.status = "succeeded"
+            job.video_url = "/static/videos/characters/a.mp4"
+
+        poller = VideoJobPoller(session_maker=session_maker)
+        monkeypatch.setattr(poller, "_advance", advance)
+        invalidate = AsyncMock()
+        monkeypatch.setattr("app.services.video_job_service.expression_urls.invalidate", invalidate)
+
+        assert await poller.poll_once() == 1
+
+        claim, apply = sessions
+        claim.commit.assert_awaited_once()
+        apply.commit.assert_awaited_once()
+        assert str(apply.execute.await_args.args[0]).startswith("UPDATE video_jobs SET")
+        assert expression.video_url == "/static/videos/characters/a.mp4"
+        invalidate.assert_awaited_once_with(expression.setting_id)
+
+
+class TestGenerateCharacterVideoPolling:
+
+    @pytest.mark.asyncio
+    async def test_waits_with_asyncio_sleep(self):
+        pending = MagicMock(done=False)
+        pending.name = "operations/abc"
+        finished = MagicMock(done=True)
+        finished.response.generated_videos = [MagicMock()]
+
+        with patch.object(gemini_service, "start_video_generation", AsyncMock(return_value=pending)), \
+                patch.object(gemini_service, "get_video_operation", AsyncMock(return_value=finished)), \
+                patch.object(gemini_service, "save_generated_video", AsyncMock(return_value="/static/videos/characters/b.mp4")), \
+                patch.object(gemini_service.asyncio, "sleep", AsyncMock()) as sleep:
+            url = await gemini_service.generate_character_video(
+                gender="female",
+                style="cute",
+                art_style="anime",
+                expression="happy",
+            )
+
+        assert url == "/static/videos/characters/b.mp4"
+        sleep.assert_awaited_once_with(gemini_service.VIDEO_POLL_INTERVAL)